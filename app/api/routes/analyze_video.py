@@ -1,5 +1,6 @@
-from fastapi import APIRouter, UploadFile, File
+from fastapi import APIRouter, UploadFile, File, HTTPException
 from app.pipeline.run_pipeline import run_full_pipeline
+from app.services.input_handler.detect_input_type import UploadRejectedError
 
 router = APIRouter()
 
@@ -8,5 +9,8 @@ async def analyze_video(
     video_url: str = None,
     file: UploadFile = None
 ):
-    result = await run_full_pipeline(video_url, file)
+    try:
+        result = await run_full_pipeline(video_url, file)
+    except UploadRejectedError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     return result
@@ -1,7 +1,57 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.pipeline.artifact_store import get_artifact_store
+from app.pipeline.result_cache import get_result_cache
+from app.services.nlp.hf_client import get_hf_client
+from app.services.nlp.inference_cache import get_inference_cache
+from app.services.ocr.ocr_reader import get_ocr_cache
+from app.services.transcript.whisper_transcript import get_asr_scheduler
+from app.services.transcript.youtube_transcript import get_transcript_provider
+from app.services.utils.executors import executor_stats
+from app.services.utils.model_registry import registry
 
 router = APIRouter()
 
+# async on purpose: answered straight from the event loop, so it never
+# waits behind busy threadpool workers while pipelines are running
 @router.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
+
+
+# Readiness: 503 until every warm-up model has loaded (liveness stays /health)
+@router.get("/health/ready")
+async def health_ready():
+    models = registry.status()
+    if registry.ready():
+        status = "ready"
+    elif any(m["state"] == "failed" for m in models.values()):
+        status = "failed"
+    else:
+        status = "loading"
+
+    return JSONResponse(
+        status_code=200 if status == "ready" else 503,
+        content={"status": status, "models": models}
+    )
+
+
+@router.get("/health/stats")
+def health_stats():
+    ocr_cache = get_ocr_cache()
+    result_cache = get_result_cache()
+    artifacts = get_artifact_store()
+    asr_scheduler = get_asr_scheduler(create=False)
+    hf_client = get_hf_client(create=False)
+    inference_cache = get_inference_cache()
+    return {
+        "executors": executor_stats(),
+        "ocr_cache": ocr_cache.stats() if ocr_cache else None,
+        "result_cache": result_cache.stats() if result_cache else None,
+        "artifacts": artifacts.stats() if artifacts else None,
+        "transcripts": get_transcript_provider().stats(),
+        "hf_client": hf_client.stats() if hf_client else None,
+        "inference_cache": inference_cache.stats() if inference_cache else None,
+        "asr_scheduler": asr_scheduler.stats() if asr_scheduler else None
+    }
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, UploadFile, HTTPException
+
+from app.models.response_models import JobSubmitResponse, JobStatusResponse
+from app.pipeline.job_queue import job_manager, QueueFullError
+from app.services.input_handler.detect_input_type import detect_input_type, UploadRejectedError
+from app.services.utils.workspace import Workspace
+
+router = APIRouter()
+
+@router.post("/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_job(
+    video_url: str = None,
+    file: UploadFile = None
+):
+    if not video_url and not file:
+        raise HTTPException(status_code=400, detail="No video URL or file provided.")
+
+    # Uploads must be persisted before the request ends
+    workspace = Workspace()
+    try:
+        input_info = await detect_input_type(None, file, workspace) if file else None
+    except UploadRejectedError as e:
+        workspace.cleanup()
+        raise HTTPException(status_code=413, detail=str(e))
+
+    try:
+        job = job_manager.submit(
+            video_url=video_url,
+            input_info=input_info,
+            workspace=workspace
+        )
+    except QueueFullError as e:
+        workspace.cleanup()
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "queue_depth": job_manager.queue_depth()
+    }
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -1,12 +1,38 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.api.routes.analyze_video import router as analyze_router
 from app.api.routes.health import router as health_router
+from app.api.routes.jobs import router as jobs_router
+from app.pipeline.job_queue import job_manager
+from app.services.nlp.hf_client import close_hf_client
+from app.services.nlp.inference_cache import close_inference_cache
+from app.services.utils.constants import MODEL_WARMUP
+from app.services.utils.executors import shutdown_executors
+from app.services.utils.model_registry import registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await job_manager.start()
+    # Models load in the background; /health/ready turns 200 once done
+    if MODEL_WARMUP:
+        registry.warm_up()
+    yield
+    await job_manager.stop()
+    shutdown_executors()
+    close_hf_client()
+    # After the executors: their last results are still being queued
+    close_inference_cache()
+
 
 app = FastAPI(
     title="Video Bias Detection API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Register routes
 app.include_router(health_router)
 app.include_router(analyze_router)
+app.include_router(jobs_router)
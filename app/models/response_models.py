@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 class BiasReport(BaseModel):
     emotional_tone: str
@@ -10,9 +10,30 @@ class BiasReport(BaseModel):
 
 class AnalysisResponse(BaseModel):
     transcript: str
+    transcript_segments: List[dict] = []   # [{start, end, text}] when available
     ocr_text: str
     clean_text: str
     bias_report: dict
     misinformation: list
     misinformation_score: int
     final_reliability_score: int
+    timings: Optional[dict] = None   # total_seconds, per-stage timings, critical_path
+    ocr_stats: Optional[dict] = None # frames, skip rate, OCR cost per frame
+    download_stats: Optional[dict] = None  # bytes downloaded, formats fetched
+    cache_status: Optional[str] = None     # computed / cache / coalesced / disabled
+    artifacts: Optional[dict] = None       # stage -> hit / miss in the artifact store
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+    queue_depth: int
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str                      # queued / running / completed / failed
+    stages: Dict[str, str]           # stage -> pending / running / done / cached
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
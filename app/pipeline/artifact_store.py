@@ -0,0 +1,208 @@
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import time
+
+from app.services.utils import constants
+from app.services.utils.constants import (
+    ARTIFACT_STORE_ENABLED,
+    ARTIFACT_STORE_PATH,
+    ARTIFACT_STORE_MAX_ENTRIES,
+    MANIFEST_PATH
+)
+from app.services.utils.logger import get_logger
+from app.services.utils.sqlite_cache import SqliteCache
+
+logger = get_logger(__name__)
+
+# =====================================================
+# STAGE ARTIFACT STORE (content-addressed)
+# =====================================================
+# Each stage output is stored under sha256(stage, stage version, inputs).
+# - transcript / ocr: inputs are the source identity and input type
+# - later stages: inputs are the outputs of their dependencies
+#
+# A stage version hashes the source files of the code that produces it
+# plus the constants it reads. After a threshold or label change only the
+# affected stage misses; when its output comes out the same, everything
+# downstream still hits. When transcript and OCR both hit, nothing is
+# downloaded at all.
+
+STAGE_CODE = {
+    "transcript": (
+        "app.services.transcript.whisper_transcript",
+        "app.services.transcript.youtube_transcript",
+        "app.services.input_handler.extract_audio",
+        "app.services.input_handler.download_video",
+    ),
+    "ocr": (
+        "app.services.input_handler.download_video",
+        "app.services.ocr.ocr_reader",
+        "app.services.ocr.frame_extractor",
+        "app.services.ocr.frame_sampler",
+        "app.services.ocr.perceptual_hash",
+        "app.services.ocr.text_gate",
+        "app.services.ocr.region_tracker",
+    ),
+    "preprocess": (
+        "app.services.nlp.merge_text",
+        "app.services.nlp.text_processing",
+    ),
+    "bias": (
+        "app.services.nlp.bias_detection",
+        "app.services.nlp.inference_backend",
+        "app.services.nlp.triage",
+    ),
+    "misinformation": ("app.services.nlp.misinformation_detection", "app.services.nlp.inference_backend"),
+}
+
+# Constants each stage's output depends on, by exact name: queue sizes,
+# pool sizes and timeouts never invalidate stored artifacts
+STAGE_CONFIG = {
+    "transcript": (
+        "DOWNLOAD_AUDIO_MAX_ABR", "TRANSCRIPT_LANGUAGES",
+        "WHISPER_MODE", "WHISPER_MODEL", "WHISPER_LANGUAGE", "ASR_CHUNK_SEC",
+        "VAD_ENERGY_MARGIN_DB", "VAD_NOISE_FLOOR_CAP_DB", "VAD_MIN_SPEECH_SEC",
+        "VAD_MAX_GAP_SEC", "VAD_PAD_SEC"
+    ),
+    "ocr": (
+        "DOWNLOAD_MAX_HEIGHT", "FRAME_SAMPLER", "ADAPTIVE_ANALYSIS_FPS",
+        "SCENE_CHANGE_THRESHOLD", "ADAPTIVE_MAX_GAP", "PHASH_ALGORITHM",
+        "PHASH_HAMMING_THRESHOLD", "TEXT_GATE_MIN_DENSITY", "REGION_CHANGE_THRESHOLD",
+        "OCR_BATCH_SIZE"   # frames of a batch are masked against the same tracker state
+    ),
+    "preprocess": (),
+    "bias": (
+        "EMOTION_CONFIDENCE_THRESHOLD", "EMOTIONAL_TONE_THRESHOLD", "POLITICAL_BIAS_THRESHOLD",
+        "SUBJECTIVITY_THRESHOLD", "BIAS_MAX_SCORE", "INFERENCE_BACKEND",
+        "INFERENCE_ONNX_DIR", "INFERENCE_ONNX_QUANTIZE", "TRIAGE_ENABLED",
+        "TRIAGE_MODEL_PATH", "TRIAGE_BUDGET", "TRIAGE_MIN_WORDS"
+    ),
+    "misinformation": (
+        "MISINFO_PENALTY", "UNCERTAIN_PENALTY", "INFERENCE_BACKEND",
+        "INFERENCE_ONNX_DIR", "INFERENCE_ONNX_QUANTIZE"
+    ),
+}
+
+# Data files (e.g. trained models) whose contents a stage depends on
+STAGE_DATA = {
+    "bias": (constants.TRIAGE_MODEL_PATH,),
+}
+
+MEDIA_STAGES = ("transcript", "ocr")
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def stage_version(stage: str) -> str:
+    digest = hashlib.sha256()
+
+    for module in STAGE_CODE[stage]:
+        # Read the file instead of importing it (keeps models lazy)
+        with open(importlib.util.find_spec(module).origin, "rb") as f:
+            digest.update(f.read())
+
+    for path in STAGE_DATA.get(stage, ()):
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+
+    config = {name: getattr(constants, name) for name in STAGE_CONFIG[stage]}
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+
+    return digest.hexdigest()[:12]
+
+
+class ArtifactStore:
+    """
+    - store: SqliteCache for stage outputs (size-bounded LRU)
+    - manifest: SqliteCache of analysed sources, read by the re-score command
+    """
+
+    def __init__(self, store: SqliteCache, manifest: SqliteCache):
+        self.store = store
+        self.manifest = manifest
+        self.versions = {stage: stage_version(stage) for stage in STAGE_CODE}
+
+        self._lock = threading.Lock()
+        self._counts = {stage: {"hits": 0, "misses": 0} for stage in STAGE_CODE}
+
+    def key(self, stage: str, inputs) -> str:
+        return _digest([stage, self.versions[stage], inputs])
+
+    def media_key(self, stage: str, source: str, input_type: str) -> str:
+        return self.key(stage, [source, input_type])
+
+    def get(self, key):
+        entry = self.store.get(key)
+        return None if entry is None else entry["value"]
+
+    def memoize(self, stage: str, key: str, compute, report: dict = None):
+        """
+        Stored output for `key`, or compute() and store it.
+        `report` (optional) gets stage -> "hit" / "miss".
+        """
+        entry = self.store.get(key)
+        hit = entry is not None
+
+        with self._lock:
+            self._counts[stage]["hits" if hit else "misses"] += 1
+        if report is not None:
+            report[stage] = "hit" if hit else "miss"
+
+        if hit:
+            return entry["value"]
+
+        value = compute()
+        # Wrapped so a stored None/empty output still counts as a hit
+        try:
+            self.store.put(key, {"value": value})
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Artifact not storable ({stage}): {e}")
+        return value
+
+    def record_source(self, source: str, video_url, input_info: dict):
+        """
+        Remember an analysed source so it can be re-scored later.
+        """
+        self.manifest.put(source, {
+            "video_url": video_url,
+            "input_info": {
+                k: input_info.get(k)
+                for k in ("type", "url", "video_id", "content_hash")
+                if input_info.get(k) is not None
+            },
+            "analyzed_at": time.time()
+        })
+
+    def sources(self) -> list:
+        return self.manifest.keys()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {stage: dict(c) for stage, c in self._counts.items()}
+        return {
+            "entries": self.store.stats()["entries"],
+            "sources": self.manifest.stats()["entries"],
+            "stages": counts,
+            "versions": dict(self.versions)
+        }
+
+
+_artifact_store = None
+
+
+def get_artifact_store():
+    global _artifact_store
+    if ARTIFACT_STORE_ENABLED and _artifact_store is None:
+        _artifact_store = ArtifactStore(
+            SqliteCache(ARTIFACT_STORE_PATH, ARTIFACT_STORE_MAX_ENTRIES, namespace="artifacts"),
+            SqliteCache(MANIFEST_PATH, max_entries=10 ** 9, namespace="manifest")
+        )
+    return _artifact_store
@@ -0,0 +1,148 @@
+import asyncio
+import time
+import uuid
+
+from app.pipeline.run_pipeline import run_full_pipeline, PIPELINE_STAGES
+from app.services.utils.constants import (
+    JOB_WORKER_COUNT,
+    JOB_QUEUE_MAX_SIZE,
+    JOB_RESULT_TTL
+)
+from app.services.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class QueueFullError(Exception):
+    """
+    Raised when the job queue is at JOB_QUEUE_MAX_SIZE.
+    """
+
+
+# =====================================================
+# JOB MANAGER
+# =====================================================
+
+class JobManager:
+    """
+    Bounded queue + fixed worker pool for pipeline jobs.
+
+    - worker_count: pipelines running at the same time
+    - max_queue_size: pending jobs accepted before rejecting
+    - result_ttl: seconds a finished job stays queryable
+    """
+
+    def __init__(
+        self,
+        worker_count: int = JOB_WORKER_COUNT,
+        max_queue_size: int = JOB_QUEUE_MAX_SIZE,
+        result_ttl: int = JOB_RESULT_TTL
+    ):
+        self.worker_count = worker_count
+        self.max_queue_size = max_queue_size
+        self.result_ttl = result_ttl
+
+        self.jobs = {}
+        self._queue = None
+        self._workers = []
+
+    # ---------- lifecycle ----------
+
+    async def start(self):
+        if self._workers:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(i))
+            for i in range(self.worker_count)
+        ]
+        logger.info(
+            f"Job workers started: {self.worker_count} "
+            f"(queue size {self.max_queue_size})"
+        )
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # ---------- public API ----------
+
+    def submit(self, video_url=None, input_info=None, workspace=None) -> dict:
+        if self._queue is None:
+            raise RuntimeError("JobManager not started")
+
+        self._purge_expired()
+
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": "queued",
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "stages": {stage: "pending" for stage in PIPELINE_STAGES},
+            "result": None,
+            "error": None
+        }
+
+        try:
+            self._queue.put_nowait((job_id, video_url, input_info, workspace))
+        except asyncio.QueueFull:
+            raise QueueFullError(
+                f"Job queue is full ({self.max_queue_size} pending)"
+            )
+
+        self.jobs[job_id] = job
+        return job
+
+    def get(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    # ---------- internals ----------
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job_id, video_url, input_info, workspace = await self._queue.get()
+            job = self.jobs[job_id]
+
+            job["status"] = "running"
+            job["started_at"] = time.time()
+
+            def on_stage(stage, status):
+                job["stages"][stage] = status
+
+            try:
+                job["result"] = await run_full_pipeline(
+                    video_url=video_url,
+                    input_info=input_info,
+                    on_stage=on_stage,
+                    workspace=workspace
+                )
+                job["status"] = "completed"
+
+            except Exception as e:
+                logger.warning(f"Job {job_id} failed: {e}")
+                job["status"] = "failed"
+                job["error"] = str(e)
+
+            finally:
+                job["finished_at"] = time.time()
+                self._queue.task_done()
+
+    def _purge_expired(self):
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job["finished_at"] and now - job["finished_at"] > self.result_ttl
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+
+job_manager = JobManager()
@@ -0,0 +1,111 @@
+"""
+Re-score the back catalogue after a threshold / label / code change.
+
+Every analysed source is listed in the artifact store manifest. Each one
+is run through the pipeline again with the result cache bypassed; stage
+artifacts whose version did not change are reused, so usually nothing is
+downloaded or transcribed and only the changed stages (and what depends
+on them) run.
+
+Usage:
+    python -m app.pipeline.rescore [--source KEY ...] [--limit N]
+                                   [--concurrency 2] [--output rescored.jsonl]
+"""
+
+import argparse
+import asyncio
+import json
+
+from app.pipeline.artifact_store import get_artifact_store, MEDIA_STAGES
+from app.pipeline.run_pipeline import run_full_pipeline
+from app.services.utils.executors import run_blocking, shutdown_executors
+
+
+def _media_stored(artifacts, source, input_info) -> bool:
+    return all(
+        artifacts.get(artifacts.media_key(stage, source, input_info["type"])) is not None
+        for stage in MEDIA_STAGES
+    )
+
+
+async def rescore_source(artifacts, source: str) -> dict:
+    entry = await run_blocking("io", artifacts.manifest.get, source)
+    if entry is None:
+        return {"source": source, "status": "unknown"}
+
+    input_info = entry["input_info"]
+
+    # The uploaded file is gone; only stored transcript/OCR can be re-scored
+    if input_info["type"] == "file_upload":
+        stored = await run_blocking("io", _media_stored, artifacts, source, input_info)
+        if not stored:
+            return {"source": source, "status": "skipped", "reason": "upload media not stored"}
+
+    try:
+        result = await run_full_pipeline(
+            video_url=entry["video_url"],
+            input_info=dict(input_info),
+            refresh=True
+        )
+    except Exception as e:
+        return {"source": source, "status": "failed", "error": str(e)}
+
+    return {
+        "source": source,
+        "status": "rescored",
+        "artifacts": result["artifacts"],
+        "misinformation_score": result["misinformation_score"],
+        "final_reliability_score": result["final_reliability_score"],
+        "bias_report": result["bias_report"]
+    }
+
+
+async def rescore(sources=None, limit=None, concurrency=2, output=None):
+    artifacts = get_artifact_store()
+    if artifacts is None:
+        raise RuntimeError("Artifact store is disabled (ARTIFACT_STORE_ENABLED=0)")
+
+    sources = sources or artifacts.sources()
+    if limit:
+        sources = sources[:limit]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    counts = {}
+
+    async def run(source):
+        async with semaphore:
+            outcome = await rescore_source(artifacts, source)
+
+        counts[outcome["status"]] = counts.get(outcome["status"], 0) + 1
+        recomputed = [s for s, v in (outcome.get("artifacts") or {}).items() if v == "miss"]
+        print(f"{outcome['status']:<9} {source}  recomputed: {', '.join(recomputed) or '-'}")
+
+        if output:
+            output.write(json.dumps(outcome) + "\n")
+            output.flush()
+
+    await asyncio.gather(*(run(source) for source in sources))
+
+    print(f"\n{len(sources)} sources: " + ", ".join(f"{n} {s}" for s, n in sorted(counts.items())))
+    print(f"stage hits/misses: {json.dumps(artifacts.stats()['stages'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", action="append", help="manifest key (repeatable); default: all")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--output", help="write one JSON line per source")
+    args = parser.parse_args()
+
+    output = open(args.output, "w") if args.output else None
+    try:
+        asyncio.run(rescore(args.source, args.limit, args.concurrency, output))
+    finally:
+        if output:
+            output.close()
+        shutdown_executors()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from app.pipeline.artifact_store import STAGE_CODE, stage_version
+from app.services.input_handler.detect_input_type import extract_youtube_id, YOUTUBE_REGEX
+from app.services.ocr.ocr_reader import OCR_CONFIG_FINGERPRINT
+from app.services.utils.constants import (
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_PATH,
+    RESULT_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_TTL
+)
+from app.services.utils.executors import run_blocking
+from app.services.utils.logger import get_logger
+from app.services.utils.sqlite_cache import SqliteCache
+
+logger = get_logger(__name__)
+
+# =====================================================
+# WHOLE-ANALYSIS RESULT CACHE
+# =====================================================
+# The same viral video gets submitted over and over. Finished analyses
+# are stored per source identity (YouTube ID / normalized URL / upload
+# SHA-256) plus a fingerprint of everything that shapes the result (stage
+# code, thresholds, models), so such a change starts a fresh cache while
+# pool sizes, timeouts or cache paths do not. Identical requests that
+# arrive while one is running wait for it instead of starting their own run.
+
+# Bump when run_pipeline changes how the response is assembled
+# (stage code and settings are covered by the stage versions)
+PIPELINE_VERSION = "1"
+
+# Query parameters that never change which video is served
+TRACKING_PARAMS = {"fbclid", "gclid", "si", "feature", "ref"}
+
+
+class _LeaderCancelled(Exception):
+    """
+    Set on an in-flight future when the request computing it is cancelled;
+    one waiter takes over the computation.
+    """
+
+
+def pipeline_fingerprint() -> str:
+    versions = {stage: stage_version(stage) for stage in STAGE_CODE}
+    payload = json.dumps(versions, sort_keys=True) + PIPELINE_VERSION + OCR_CONFIG_FINGERPRINT
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+def normalize_url(url: str) -> str:
+    """
+    Lower-case scheme/host, drop default ports, fragments, tracking
+    parameters and trailing slashes; sort the remaining query.
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+
+    return urlunsplit((scheme, host, parts.path.rstrip("/") or "/", urlencode(query), ""))
+
+
+def source_key(video_url=None, input_info=None):
+    """
+    Canonical identity of the analysed media, or None if unknown.
+    """
+    if input_info and input_info.get("content_hash"):
+        return f"upload:{input_info['content_hash']}"
+
+    if not video_url:
+        return None
+
+    if re.match(YOUTUBE_REGEX, video_url):
+        try:
+            return f"youtube:{extract_youtube_id(video_url)}"
+        except Exception:
+            pass   # e.g. /shorts/ links: fall back to the URL
+
+    return f"url:{normalize_url(video_url)}"
+
+
+class ResultCache:
+    """
+    - store: SqliteCache holding {"stored_at", "result"} (size-bounded LRU)
+    - ttl: seconds a stored result is served
+    """
+
+    def __init__(self, store: SqliteCache, ttl: int = RESULT_CACHE_TTL):
+        self.store = store
+        self.ttl = ttl
+        self.fingerprint = pipeline_fingerprint()
+
+        self._inflight = {}
+        self._lock = threading.Lock()   # _get runs on the io executor
+        self._counts = {"hits": 0, "misses": 0, "expired": 0, "coalesced": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _key(self, source: str) -> str:
+        return f"{source}:{self.fingerprint}"
+
+    def _get(self, key):
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry["stored_at"] > self.ttl:
+            self._count("expired")
+            return None
+        return entry["result"]
+
+    def _put(self, key, result):
+        try:
+            self.store.put(key, {"stored_at": time.time(), "result": result})
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Result not cacheable ({key}): {e}")
+
+    async def get_or_compute(self, source: str, compute, refresh: bool = False):
+        """
+        Returns (result, status) with status "cache", "coalesced" or
+        "computed". `compute` is a zero-arg coroutine function.
+        refresh skips the stored result (it is overwritten).
+
+        If the request computing a result is cancelled (client gone), one
+        of the requests waiting on it computes it instead.
+        """
+        key = self._key(source)
+
+        if key not in self._inflight and not refresh:
+            cached = await run_blocking("io", self._get, key)
+            if cached is not None:
+                self._count("hits")
+                return cached, "cache"
+
+        # Checked again: another request may have started while we looked
+        while (inflight := self._inflight.get(key)) is not None:
+            try:
+                result = await asyncio.shield(inflight)
+            except _LeaderCancelled:
+                continue
+            self._count("coalesced")
+            return result, "coalesced"
+
+        self._count("misses")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            result = await compute()
+        except BaseException as e:
+            future.set_exception(_LeaderCancelled() if isinstance(e, asyncio.CancelledError) else e)
+            future.exception()   # followers may not exist; mark retrieved
+            raise
+        else:
+            future.set_result(result)
+            await run_blocking("io", self._put, key, result)
+        finally:
+            self._inflight.pop(key, None)
+
+        return result, "computed"
+
+    def stats(self) -> dict:
+        stored = self.store.stats()
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            **counts,
+            "entries": stored["entries"],
+            "max_entries": stored["max_entries"],
+            "in_flight": len(self._inflight),
+            "ttl": self.ttl,
+            "fingerprint": self.fingerprint
+        }
+
+
+_result_cache = None
+
+
+def get_result_cache():
+    global _result_cache
+    if RESULT_CACHE_ENABLED and _result_cache is None:
+        _result_cache = ResultCache(
+            SqliteCache(RESULT_CACHE_PATH, RESULT_CACHE_MAX_ENTRIES, namespace="results")
+        )
+    return _result_cache
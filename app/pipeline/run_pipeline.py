@@ -1,11 +1,12 @@
+import time
+
 from app.services.input_handler.detect_input_type import detect_input_type
 from app.services.input_handler.download_video import download_video
-from app.services.input_handler.extract_audio import extract_audio
 
 from app.services.transcript.youtube_transcript import get_youtube_transcript
 from app.services.transcript.whisper_transcript import generate_whisper_transcript
 
-from app.services.ocr.frame_extractor import extract_frames
+from app.services.ocr.frame_extractor import stream_frames
 from app.services.ocr.ocr_reader import read_text_from_frames
 
 from app.services.nlp.merge_text import merge_text
@@ -14,79 +15,256 @@ from app.services.nlp.bias_detection import analyze_bias
 from app.services.nlp.misinformation_detection import detect_misinformation  # NEW
 
 from app.services.utils.file_utils import cleanup_temp_files
+from app.services.utils.workspace import Workspace
 
+from app.pipeline.artifact_store import get_artifact_store, MEDIA_STAGES
+from app.pipeline.result_cache import get_result_cache, source_key
+from app.pipeline.stage_graph import StageGraph
+from app.services.utils.executors import run_blocking
 
-async def run_full_pipeline(video_url=None, file=None):
 
-    # ------------------------------------
-    # 1. Detect input type
-    # ------------------------------------
-    input_info = await detect_input_type(video_url, file)
+# Stage names reported through `on_stage` (used by the job API for progress)
+PIPELINE_STAGES = (
+    "detect_input",
+    "transcript",
+    "download",
+    "ocr",
+    "preprocess",
+    "bias",
+    "misinformation",
+    "cleanup",
+)
 
-    transcript_text = ""
-    video_path = None
 
-    # ------------------------------------
-    # 2. YouTube link with auto captions
-    # ------------------------------------
-    if input_info["type"] == "youtube_with_transcript":
-        transcript_text = get_youtube_transcript(input_info["video_id"])
+def _report(on_stage, stage, status):
+    if on_stage:
+        on_stage(stage, status)
 
-        # Still need the video file for OCR
-        video_path = await download_video(input_info)
 
-    else:
-        # ------------------------------------
-        # 3. Download video directly
-        # ------------------------------------
-        video_path = await download_video(input_info)
+async def run_full_pipeline(
+    video_url=None,
+    file=None,
+    input_info=None,
+    on_stage=None,
+    workspace=None,
+    refresh=False
+):
+    """
+    Runs the full analysis.
 
-        # ------------------------------------
-        # 4. Extract audio from video
-        # ------------------------------------
-        audio_path = await extract_audio(video_path)
+    - input_info: already-detected input (skips detection, e.g. for queued uploads)
+    - on_stage: optional callback(stage, status) with status "running" / "done"
+      ("cached" for every stage when the result cache answered)
+    - workspace: request workspace (created here if not given); always cleaned up
+    - refresh: recompute (stage artifacts still apply) and overwrite the cached result
+
+    Results are served from the result cache when the same source was
+    analysed recently; identical concurrent requests share one run.
+    """
 
+    if workspace is None:
+        workspace = Workspace()
+
+    try:
+        # Uploads are identified by content hash, so save (and hash) first
+        if input_info is None and file is not None:
+            input_info = await detect_input_type(None, file, workspace)
+
+        cache = get_result_cache()
+        source = source_key(video_url, input_info) if cache else None
+
+        if source is None:
+            result = await _run_stages(video_url, file, input_info, on_stage, workspace)
+            return dict(result, cache_status="disabled")
+
+        result, status = await cache.get_or_compute(
+            source,
+            lambda: _run_stages(video_url, file, input_info, on_stage, workspace),
+            refresh=refresh
+        )
+        if status != "computed":
+            for stage in PIPELINE_STAGES[:-1]:
+                _report(on_stage, stage, "cached")
+
+        return dict(result, cache_status=status)
+
+    finally:
         # ------------------------------------
-        # 5. Speech-to-text using Whisper
+        # Cleanup this request's temporary files
         # ------------------------------------
-        transcript_text = generate_whisper_transcript(audio_path)
+        _report(on_stage, "cleanup", "running")
+        await run_blocking("io", cleanup_temp_files, workspace)
+        _report(on_stage, "cleanup", "done")
 
-    # ------------------------------------
-    # 6. OCR — Extract frames + read text
-    # ------------------------------------
-    frame_paths = extract_frames(video_path)
-    ocr_text = read_text_from_frames(frame_paths)
 
-    # ------------------------------------
-    # 7. Merge transcript + OCR text
-    # ------------------------------------
-    merged_text = merge_text(transcript_text, ocr_text)
+async def _run_stages(video_url, file, input_info, on_stage, workspace):
 
-    # ------------------------------------
-    # 8. Preprocess text (clean + tokenize)
-    # ------------------------------------
-    clean_text, sentences = preprocess_text(merged_text)
+    pipeline_start = time.perf_counter()
 
     # ------------------------------------
-    # 9. Bias Detection
+    # 1. Detect input type (decides the graph shape)
     # ------------------------------------
-    bias_report = analyze_bias(sentences)
+    _report(on_stage, "detect_input", "running")
+    if input_info is None:
+        input_info = await detect_input_type(video_url, file, workspace)
+    _report(on_stage, "detect_input", "done")
 
-    # ------------------------------------
-    # 10. Misinformation Detection (NEW)
-    # ------------------------------------
-    misinfo_report = detect_misinformation(clean_text, sentences)
+    detect_seconds = time.perf_counter() - pipeline_start
 
     # ------------------------------------
-    # 11. Cleanup temporary files
+    # 2. Build the stage graph
+    #
+    #   download ──► transcript ─┐
+    #       └──────► ocr ────────┴─► preprocess ─► bias
+    #                                         └──► misinformation
+    #
+    #   (YouTube captions: transcript has no deps and runs alongside download)
+    #
+    # Stage outputs are memoized in the artifact store; when transcript and
+    # OCR are both stored, download is skipped and they are served directly.
     # ------------------------------------
-    cleanup_temp_files()
+    graph = StageGraph(on_stage=on_stage)
+    ocr_stats = {}
+    artifact_report = {}
+
+    source = source_key(video_url, input_info)
+    artifacts = get_artifact_store() if source else None
+
+    def memo(stage, fn, key_fn):
+        if artifacts is None:
+            return fn
+        return lambda r: artifacts.memoize(stage, key_fn(r), lambda: fn(r), artifact_report)
+
+    def media_key(stage):
+        return artifacts.media_key(stage, source, input_info["type"])
+
+    stored_media = {}
+    if artifacts is not None:
+        for stage in MEDIA_STAGES:
+            value = await run_blocking("io", artifacts.get, media_key(stage))
+            if value is not None:
+                stored_media[stage] = value
+
+    if len(stored_media) == len(MEDIA_STAGES):
+        _report(on_stage, "download", "cached")
+        for stage, value in stored_media.items():
+            artifact_report[stage] = "hit"
+            graph.add(stage, lambda r, value=value: value, executor="io")
+
+    else:
+        if input_info["type"] == "file_upload":
+            path = input_info["video_path"]
+            graph.add(
+                "download",
+                lambda r: {"video_path": path, "audio_path": path, "bytes_downloaded": 0, "streams": {}},
+                executor="io"
+            )
+        else:
+            # Captions replace Whisper, so only frames are fetched
+            need_audio = input_info["type"] != "youtube_with_transcript"
+            graph.add(
+                "download",
+                lambda r: download_video(input_info, workspace, need_audio=need_audio),
+                executor="download"
+            )
+
+        if input_info["type"] == "youtube_with_transcript":
+            graph.add(
+                "transcript",
+                memo(
+                    "transcript",
+                    lambda r: get_youtube_transcript(input_info["video_id"]),
+                    lambda r: media_key("transcript")
+                ),
+                executor="http"
+            )
+        else:
+            graph.add(
+                "transcript",
+                memo(
+                    "transcript",
+                    lambda r: generate_whisper_transcript(r["download"]["audio_path"]),
+                    lambda r: media_key("transcript")
+                ),
+                deps=["download"],
+                executor="whisper"
+            )
+
+        graph.add(
+            "ocr",
+            memo(
+                "ocr",
+                lambda r: read_text_from_frames(stream_frames(r["download"]["video_path"]), stats=ocr_stats),
+                lambda r: media_key("ocr")
+            ),
+            deps=["download"],
+            executor="ocr"
+        )
+
+    graph.add(
+        "preprocess",
+        memo(
+            "preprocess",
+            lambda r: preprocess_text(merge_text(r["transcript"]["text"], r["ocr"])),
+            lambda r: artifacts.key("preprocess", [r["transcript"]["text"], r["ocr"]])
+        ),
+        deps=["transcript", "ocr"],
+        executor="nlp"
+    )
+    graph.add(
+        "bias",
+        memo(
+            "bias",
+            lambda r: analyze_bias(r["preprocess"][1]),
+            lambda r: artifacts.key("bias", r["preprocess"][1])
+        ),
+        deps=["preprocess"],
+        executor="http"
+    )
+    graph.add(
+        "misinformation",
+        memo(
+            "misinformation",
+            lambda r: detect_misinformation(*r["preprocess"]),
+            lambda r: artifacts.key("misinformation", list(r["preprocess"]))
+        ),
+        deps=["preprocess"],
+        executor="http"
+    )
+
+    results = await graph.run()
+
+    download = results.get("download") or {"bytes_downloaded": 0, "streams": {}}
+    if artifacts is not None:
+        await run_blocking("io", artifacts.record_source, source, video_url, input_info)
+
+    transcript_text = results["transcript"]["text"]
+    transcript_segments = results["transcript"]["segments"]
+    ocr_text = results["ocr"]
+    clean_text, _ = results["preprocess"]
+    bias_report = results["bias"]
+    misinfo_report = results["misinformation"]
+
+    stage_timings = {"detect_input": {"started_at": 0.0, "seconds": round(detect_seconds, 3)}}
+    stage_timings.update(graph.report(pipeline_start))
+
+    timings = {
+        "total_seconds": round(time.perf_counter() - pipeline_start, 3),
+        "stages": stage_timings,
+        "critical_path": ["detect_input"] + graph.critical_path()
+    }
+
+    print(
+        f"⏱️ Pipeline done in {timings['total_seconds']}s "
+        f"(critical path: {' → '.join(timings['critical_path'])})"
+    )
 
     # ------------------------------------
-    # 12. Final combined response
+    # 3. Final combined response
     # ------------------------------------
     return {
         "transcript": transcript_text,
+        "transcript_segments": transcript_segments,
         "ocr_text": ocr_text,
         "clean_text": clean_text,
 
@@ -94,5 +272,14 @@ async def run_full_pipeline(video_url=None, file=None):
 
         "misinformation": misinfo_report["misinformation"],
         "misinformation_score": misinfo_report["misinformation_score"],
-        "final_reliability_score": misinfo_report["final_reliability_score"]
+        "final_reliability_score": misinfo_report["final_reliability_score"],
+
+        "timings": timings,
+        "ocr_stats": ocr_stats,
+        "download_stats": {
+            "bytes_downloaded": download["bytes_downloaded"],
+            "streams": download["streams"],
+            "skipped": "download" not in results
+        },
+        "artifacts": artifact_report
     }
@@ -0,0 +1,111 @@
+import asyncio
+import inspect
+import time
+
+from app.services.utils.executors import run_blocking
+
+
+class StageGraph:
+    """
+    Small DAG of pipeline stages.
+
+    Each stage is fn(results) -> value, where `results` holds the outputs
+    of finished stages by name. Stages start as soon as all their deps are
+    done, so independent branches run in parallel. Sync functions run on
+    their named executor (see utils/executors.py), async functions on the loop.
+    """
+
+    def __init__(self, on_stage=None):
+        self.on_stage = on_stage
+        self.stages = {}
+        self.results = {}
+        self.timings = {}
+
+    def add(self, name: str, fn, deps=(), executor: str = None):
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+
+        if executor is None and not inspect.iscoroutinefunction(fn):
+            raise ValueError(f"Sync stage '{name}' needs an executor")
+
+        self.stages[name] = {"fn": fn, "deps": tuple(deps), "executor": executor}
+        return self
+
+    async def run(self) -> dict:
+        tasks = {}
+
+        for name in self.stages:
+            tasks[name] = asyncio.create_task(self._run_stage(name, tasks))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except Exception:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return self.results
+
+    async def _run_stage(self, name, tasks):
+        stage = self.stages[name]
+
+        if stage["deps"]:
+            await asyncio.gather(*(tasks[dep] for dep in stage["deps"]))
+
+        if self.on_stage:
+            self.on_stage(name, "running")
+
+        start = time.perf_counter()
+
+        if inspect.iscoroutinefunction(stage["fn"]):
+            result = await stage["fn"](self.results)
+        else:
+            result = await run_blocking(stage["executor"], stage["fn"], self.results)
+
+        end = time.perf_counter()
+
+        self.results[name] = result
+        self.timings[name] = {"start": start, "end": end}
+
+        if self.on_stage:
+            self.on_stage(name, "done")
+
+        return result
+
+    # =====================================================
+    # TIMING REPORT
+    # =====================================================
+
+    def critical_path(self) -> list:
+        """
+        Walk back from the last stage to finish, always following the
+        dependency that finished last.
+        """
+        if not self.timings:
+            return []
+
+        current = max(self.timings, key=lambda n: self.timings[n]["end"])
+        path = [current]
+
+        while self.stages[current]["deps"]:
+            current = max(
+                self.stages[current]["deps"],
+                key=lambda n: self.timings[n]["end"]
+            )
+            path.append(current)
+
+        return list(reversed(path))
+
+    def report(self, origin: float) -> dict:
+        """
+        Per-stage timings (seconds, relative to `origin` perf_counter).
+        """
+        return {
+            name: {
+                "started_at": round(t["start"] - origin, 3),
+                "seconds": round(t["end"] - t["start"], 3)
+            }
+            for name, t in self.timings.items()
+        }
@@ -1,31 +1,45 @@
+import hashlib
 import re
 import os
-from youtube_transcript_api import YouTubeTranscriptApi
+
+import ffmpeg
+
+from app.services.ocr.frame_sampler import video_duration
+from app.services.transcript.youtube_transcript import has_youtube_transcript
+from app.services.utils.executors import run_blocking
+from app.services.utils.constants import (
+    UPLOAD_CHUNK_SIZE,
+    UPLOAD_MAX_BYTES,
+    UPLOAD_MAX_DURATION_SEC
+)
 
 YOUTUBE_REGEX = r"(https?://)?(www\.)?(youtube\.com|youtu\.be)/.+"
 
 
-async def detect_input_type(video_url=None, file=None):
+class UploadRejectedError(Exception):
+    """
+    Upload exceeds the size or duration limit, or its duration cannot be
+    read (routes answer 413).
+    """
+
+
+async def detect_input_type(video_url=None, file=None, workspace=None):
     """
     Detect if input is:
     1. YouTube link with transcript
     2. YouTube link without transcript
     3. Direct video URL
     4. Uploaded video file
+
+    Uploads are saved inside the request workspace.
     """
 
     # CASE 1: Uploaded file (highest priority)
     if file:
-        os.makedirs("temp_files", exist_ok=True)
+        if workspace is None:
+            raise Exception("A workspace is required to store uploaded files.")
 
-        file_path = f"temp_files/{file.filename}"
-        with open(file_path, "wb") as f:
-            f.write(await file.read())
-
-        return {
-            "type": "file_upload",
-            "video_path": file_path
-        }
+        return await save_upload(file, workspace)
 
     # CASE 2: No input
     if not video_url:
@@ -35,19 +49,19 @@ async def detect_input_type(video_url=None, file=None):
     if re.match(YOUTUBE_REGEX, video_url):
         video_id = extract_youtube_id(video_url)
 
-        try:
-            YouTubeTranscriptApi.get_transcript(video_id)
+        # Fetches (and caches) the captions the transcript stage will use
+        if await run_blocking("http", has_youtube_transcript, video_id):
             return {
                 "type": "youtube_with_transcript",
                 "video_id": video_id,
                 "url": video_url   # ✅ STANDARDIZED
             }
-        except:
-            return {
-                "type": "youtube_no_transcript",
-                "video_id": video_id,
-                "url": video_url   # ✅ STANDARDIZED
-            }
+
+        return {
+            "type": "youtube_no_transcript",
+            "video_id": video_id,
+            "url": video_url   # ✅ STANDARDIZED
+        }
 
     # CASE 4: Direct video URL
     return {
@@ -56,6 +70,102 @@ async def detect_input_type(video_url=None, file=None):
     }
 
 
+async def save_upload(
+    file,
+    workspace,
+    max_bytes: int = UPLOAD_MAX_BYTES,
+    max_duration: float = UPLOAD_MAX_DURATION_SEC
+) -> dict:
+    """
+    Copy an UploadFile into the workspace in UPLOAD_CHUNK_SIZE pieces,
+    hashing (SHA-256) in the same pass, so memory stays flat whatever the
+    file size. The client filename is never used as a path, only its
+    extension (when it looks like one).
+
+    Starlette has already spooled the request body to a temporary file
+    by the time this runs, so the hash is computed from that spooled
+    copy rather than from request.stream(). The copy is needed anyway:
+    the spool is deleted when the request ends, while jobs read the
+    upload from the workspace afterwards. Hashing only adds CPU to it,
+    not another read.
+
+    Raises UploadRejectedError above `max_bytes` or `max_duration`, or
+    when the duration cannot be read (not a video, truncated).
+    """
+
+    # Starlette knows the size once the body is spooled: reject early
+    if file.size is not None and file.size > max_bytes:
+        raise UploadRejectedError(f"Upload exceeds {max_bytes} bytes.")
+
+    file_path = workspace.file(f"upload{_safe_extension(file.filename)}")
+    size, content_hash = await run_blocking(
+        "io", _copy_upload, file.file, file_path, max_bytes
+    )
+
+    duration = await run_blocking("io", _upload_duration, file_path)
+    if duration <= 0:
+        os.remove(file_path)
+        raise UploadRejectedError("Upload is not a readable video (unknown duration).")
+    if duration > max_duration:
+        os.remove(file_path)
+        raise UploadRejectedError(
+            f"Upload is {duration:.0f}s long; the limit is {max_duration:.0f}s."
+        )
+
+    return {
+        "type": "file_upload",
+        "video_path": file_path,
+        "content_hash": content_hash,
+        "size_bytes": size
+    }
+
+
+def _safe_extension(filename) -> str:
+    ext = os.path.splitext(os.path.basename(filename or ""))[1].lower()
+    return ext if re.fullmatch(r"\.[a-z0-9]{1,5}", ext) else ".mp4"
+
+
+def _upload_duration(path) -> float:
+    """
+    Container header via OpenCV, then ffprobe (some containers report no
+    frame count to OpenCV). 0.0 when neither can read it.
+    """
+    duration = video_duration(path)
+    if duration > 0:
+        return duration
+
+    try:
+        return float(ffmpeg.probe(path)["format"]["duration"])
+    except (ffmpeg.Error, OSError, KeyError, ValueError):
+        return 0.0
+
+
+def _copy_upload(src, path, max_bytes):
+    """
+    Returns (size, sha256 hex). The partial file is removed on overflow.
+    """
+    digest = hashlib.sha256()
+    size = 0
+
+    src.seek(0)
+    with open(path, "wb") as dst:
+        while True:
+            chunk = src.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+
+            size += len(chunk)
+            if size > max_bytes:
+                dst.close()
+                os.remove(path)
+                raise UploadRejectedError(f"Upload exceeds {max_bytes} bytes.")
+
+            digest.update(chunk)
+            dst.write(chunk)
+
+    return size, digest.hexdigest()
+
+
 def extract_youtube_id(url: str) -> str:
     """
     Extract YouTube video ID from different formats.
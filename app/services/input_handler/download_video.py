@@ -1,27 +1,147 @@
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import threading
+
 import yt_dlp
-import os
 
-from app.services.utils.constants import TEMP_DIR
+from app.services.utils.constants import DOWNLOAD_MAX_HEIGHT, DOWNLOAD_AUDIO_MAX_ABR
+
+# =====================================================
+# FORMAT SELECTION (fetch only what the pipeline needs)
+# =====================================================
+# Whisper needs audio, OCR needs frames at ≤480p. Where the site offers
+# separate streams (YouTube, Vimeo, ...) a low-bitrate audio-only stream
+# and a capped video-only stream are fetched in parallel and never muxed;
+# otherwise one capped combined file serves both. `<=?` lets formats with
+# unknown height/bitrate (direct file links) through.
+
+
+def _video_format(max_height: int) -> str:
+    # H.264 first: OpenCV decodes it everywhere (AV1 support varies)
+    return (
+        f"bestvideo[height<=?{max_height}][vcodec^=avc1]"
+        f"/bestvideo[height<=?{max_height}]"
+        f"/best[height<=?{max_height}]/worst"
+    )
+
+
+def _audio_format(max_abr: int) -> str:
+    return f"bestaudio[abr<=?{max_abr}]/worstaudio"
+
+
+def _combined_format(max_height: int) -> str:
+    return f"best[height<=?{max_height}]/worst"
+
 
+def _has_separate_audio(info: dict) -> bool:
+    return any(
+        f.get("vcodec") == "none" and f.get("acodec") not in (None, "none")
+        for f in info.get("formats") or []
+    )
 
-async def download_video(input_info):
+
+def _base_opts() -> dict:
+    return {
+        "quiet": True,
+        "no_warnings": True,
+        "noprogress": True,
+        "noplaylist": True,
+        # No ffmpeg remux pass after download: ffmpeg/OpenCV read the raw
+        # DASH streams fine
+        "fixup": "never"
+    }
+
+
+def _fetch(info: dict, fmt: str, output_template: str) -> dict:
     """
-    Downloads video using yt-dlp.
-    Works for YouTube, short links, playlists, etc.
+    Download one format of an already-extracted video (no second metadata
+    request). Returns {"path", "format_id", "height", "bytes"}.
     """
+    downloaded = {"bytes": 0}
 
-    os.makedirs(TEMP_DIR, exist_ok=True)
+    def on_progress(d):
+        if d["status"] == "finished":
+            downloaded["bytes"] += d.get("total_bytes") or d.get("downloaded_bytes") or 0
 
-    output_path = os.path.join(TEMP_DIR, "video.mp4")
+    opts = _base_opts()
+    opts.update({
+        "format": fmt,
+        "outtmpl": output_template,
+        "progress_hooks": [on_progress]
+    })
 
-    ydl_opts = {
-        "outtmpl": output_path,
-        "format": "best[ext=mp4]/best",
-        "quiet": True,
-        "noplaylist": True
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        result = ydl.process_ie_result(copy.deepcopy(info), download=True)
+
+    requested = (result.get("requested_downloads") or [result])[0]
+    return {
+        "path": requested.get("filepath") or requested.get("_filename"),
+        "format_id": requested.get("format_id"),
+        "height": requested.get("height"),
+        "bytes": downloaded["bytes"]
     }
 
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        ydl.download([input_info["url"]])
 
-    return output_path
+def download_video(
+    input_info,
+    workspace,
+    need_audio: bool = True,
+    max_height: int = DOWNLOAD_MAX_HEIGHT
+) -> dict:
+    """
+    Downloads media with yt-dlp into the request workspace.
+    Works for YouTube, short links, playlists, etc.
+
+    - need_audio: False when captions replace Whisper (frames only)
+    - max_height: cap for the stream used by OCR
+
+    Returns {"video_path", "audio_path", "bytes_downloaded", "streams"}.
+    audio_path is None when not needed; it equals video_path when the
+    site only offers combined files.
+    """
+
+    with yt_dlp.YoutubeDL(_base_opts()) as ydl:
+        # Unprocessed: each stream runs its own format selection on it
+        info = ydl.extract_info(input_info["url"], download=False, process=False)
+
+    video_tmpl = workspace.file("video.%(ext)s")
+    audio_tmpl = workspace.file("audio.%(ext)s")
+
+    streams = {}
+    if not need_audio:
+        streams["video"] = _fetch(info, _video_format(max_height), video_tmpl)
+
+    elif _has_separate_audio(info):
+        lock = threading.Lock()
+
+        def fetch(kind, fmt, tmpl):
+            stream = _fetch(info, fmt, tmpl)
+            with lock:
+                streams[kind] = stream
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [
+                pool.submit(fetch, "audio", _audio_format(DOWNLOAD_AUDIO_MAX_ABR), audio_tmpl),
+                pool.submit(fetch, "video", _video_format(max_height), video_tmpl)
+            ]
+            for future in futures:
+                future.result()
+
+    else:
+        streams["video"] = _fetch(info, _combined_format(max_height), video_tmpl)
+
+    video_path = streams["video"]["path"]
+    audio_path = streams.get("audio", streams["video"])["path"] if need_audio else None
+    total = sum(s["bytes"] for s in streams.values())
+
+    print(f"⬇️ Downloaded {total / 1e6:.1f} MB ({', '.join(sorted(streams))})")
+
+    return {
+        "video_path": video_path,
+        "audio_path": audio_path,
+        "bytes_downloaded": total,
+        "streams": {
+            kind: {k: v for k, v in s.items() if k != "path"}
+            for kind, s in streams.items()
+        }
+    }
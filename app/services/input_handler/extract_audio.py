@@ -1,27 +1,49 @@
 import ffmpeg
-import os
+import numpy as np
 
-async def extract_audio(video_path):
+SAMPLE_RATE = 16000   # Whisper's input rate
+
+
+def stream_audio(media_path, block_sec: float = 300.0):
     """
-    Extracts audio from the downloaded video using FFmpeg.
-    Saves audio as WAV for Whisper processing.
+    Decodes audio with a single FFmpeg process and yields it as float32
+    numpy blocks (16 kHz mono, `block_sec` long; the last may be shorter).
+
+    PCM is piped straight from FFmpeg into memory — no WAV file is written
+    and nothing is decoded twice. Only one block is held at a time, so
+    memory stays flat no matter how long the video is.
     """
 
-    audio_path = "temp_files/audio.wav"
+    process = (
+        ffmpeg
+        .input(media_path)
+        .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=str(SAMPLE_RATE))  # mono audio, 16k sample rate
+        .global_args("-nostdin", "-loglevel", "error")
+        .run_async(pipe_stdout=True)
+    )
 
-    # Remove old audio file if exists
-    if os.path.exists(audio_path):
-        os.remove(audio_path)
+    block_bytes = int(block_sec * SAMPLE_RATE) * 2
+    got_audio = False
 
     try:
-        (
-            ffmpeg
-            .input(video_path)
-            .output(audio_path, format='wav', ac=1, ar='16000')  # mono audio, 16k sample rate
-            .overwrite_output()
-            .run(quiet=True)
-        )
-    except Exception as e:
-        raise Exception(f"Audio extraction failed: {str(e)}")
-
-    return audio_path
+        while True:
+            buf = bytearray(block_bytes)
+            n = process.stdout.readinto(buf)
+            if not n:
+                break
+
+            got_audio = True
+            pcm = np.frombuffer(buf, np.int16, count=n // 2)
+            yield pcm.astype(np.float32) / 32768.0
+
+            if n < block_bytes:
+                break
+
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        returncode = process.wait()
+
+    if not got_audio and returncode != 0:
+        raise Exception(f"Audio extraction failed: ffmpeg exited with {returncode}")
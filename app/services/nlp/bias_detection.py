@@ -1,81 +1,27 @@
-import os
-import requests
 from collections import Counter
-from typing import List, Tuple, Any
-
-# =====================================================
-# CONFIG
-# =====================================================
-
-HF_API_TOKEN = os.getenv("HF_API_TOKEN")
-
-if not HF_API_TOKEN:
-    raise RuntimeError("HF_API_TOKEN not set in environment variables")
-
-HEADERS = {
-    "Authorization": f"Bearer {HF_API_TOKEN}",
-    "Content-Type": "application/json"
-}
-
-HF_ROUTER_URL = "https://router.huggingface.co/hf-inference/models"
-
-# =====================================================
-# HF API CALL
-# =====================================================
-
-def hf_inference(model_name: str, payload: dict) -> Any:
-    url = f"{HF_ROUTER_URL}/{model_name}"
-
-    response = requests.post(
-        url,
-        headers=HEADERS,
-        json=payload,
-        timeout=60
-    )
-
-    if response.status_code != 200:
-        raise Exception(
-            f"HF API error ({model_name}): {response.status_code} {response.text}"
-        )
-
-    return response.json()
-
-
-# =====================================================
-# HF OUTPUT NORMALIZER (VERY IMPORTANT)
-# =====================================================
-
-def get_top_label(result):
-    """
-    Handles ALL HF formats:
-    - list[{label, score}]
-    - list[list[{label, score}]]
-    - {labels:[], scores:[]}
-    """
-
-    if isinstance(result, dict):
-        return result["labels"][0], float(result["scores"][0])
-
-    if isinstance(result, list):
-        while isinstance(result, list) and len(result) > 0 and isinstance(result[0], list):
-            result = result[0]
-
-        if isinstance(result, list) and isinstance(result[0], dict):
-            top = max(result, key=lambda x: x.get("score", 0))
-            return top.get("label", "unknown"), float(top.get("score", 0))
-
-    raise ValueError(f"Unexpected HF response format: {result}")
-
+from typing import List, Tuple
+
+from app.services.nlp.inference_backend import (
+    EMOTION_MODEL,
+    MNLI_MODEL,
+    get_inference_backend,
+    get_top_label  # noqa: F401 (kept importable here)
+)
+from app.services.nlp.triage import IMPORTANT_KEYWORDS, select_sentences
+from app.services.utils.constants import (
+    BIAS_MAX_SCORE,
+    EMOTION_CONFIDENCE_THRESHOLD,
+    EMOTIONAL_TONE_THRESHOLD,
+    HF_BATCH_SIZE,
+    POLITICAL_BIAS_THRESHOLD,
+    SUBJECTIVITY_THRESHOLD,
+    TRIAGE_ENABLED
+)
 
 # =====================================================
 # RULE-BASED PREFILTER (SPEED BOOST 🚀)
 # =====================================================
-
-IMPORTANT_KEYWORDS = {
-    "should", "must", "never", "always", "truth", "lie", "fake",
-    "government", "media", "people", "danger", "fear", "hate",
-    "agenda", "propaganda", "corrupt", "exposed"
-}
+# Used when TRIAGE_ENABLED=0; otherwise triage.py picks the sentences
 
 def is_candidate_sentence(sentence: str) -> bool:
     words = set(sentence.split())
@@ -88,6 +34,16 @@ def is_candidate_sentence(sentence: str) -> bool:
 # OPTIMIZED DETECTION FUNCTIONS
 # =====================================================
 
+BIAS_MODEL = MNLI_MODEL
+
+BIAS_LABELS = [
+    "left-leaning political opinion",
+    "right-leaning political opinion",
+    "neutral factual statement",
+    "subjective opinion"
+]
+
+
 def detect_emotion_and_manipulation(sentence: str) -> Tuple[str, float]:
     """
     Single model replaces:
@@ -95,11 +51,7 @@ def detect_emotion_and_manipulation(sentence: str) -> Tuple[str, float]:
     - emotion
     - partial toxicity
     """
-    result = hf_inference(
-        "j-hartmann/emotion-english-distilroberta-base",
-        {"inputs": sentence}
-    )
-    return get_top_label(result)
+    return get_inference_backend().classify(EMOTION_MODEL, [sentence]).result()[0]
 
 
 def detect_bias_and_subjectivity(sentence: str) -> Tuple[str, float]:
@@ -108,21 +60,58 @@ def detect_bias_and_subjectivity(sentence: str) -> Tuple[str, float]:
     - political bias
     - subjectivity
     """
-    result = hf_inference(
-        "facebook/bart-large-mnli",
-        {
-            "inputs": sentence,
-            "parameters": {
-                "candidate_labels": [
-                    "left-leaning political opinion",
-                    "right-leaning political opinion",
-                    "neutral factual statement",
-                    "subjective opinion"
-                ]
-            }
-        }
-    )
-    return get_top_label(result)
+    return get_inference_backend().zero_shot(BIAS_MODEL, [sentence], BIAS_LABELS).result()[0]
+
+
+def classify_sentences(sentences: List[str], batch_size: int = HF_BATCH_SIZE) -> list:
+    """
+    Emotion + bias labels for every sentence, in batches. All emotion and
+    bias batches are submitted to the inference backend at once, so
+    latency follows the number of batches, not sentences (the backend
+    caps how many run at a time).
+
+    Returns one ((emotion_label, score), (bias_label, score)) per
+    sentence, or None where its batch failed.
+    """
+    if not sentences:
+        return []
+
+    backend = get_inference_backend()
+    batches = [sentences[i:i + batch_size] for i in range(0, len(sentences), batch_size)]
+
+    pending = [
+        (
+            batch,
+            backend.classify(EMOTION_MODEL, batch),
+            backend.zero_shot(BIAS_MODEL, batch, BIAS_LABELS)
+        )
+        for batch in batches
+    ]
+
+    results = []
+    for batch, emotion_future, bias_future in pending:
+        try:
+            results.extend(zip(emotion_future.result(), bias_future.result()))
+        except Exception as e:
+            print(f"[WARN] Bias batch skipped ({len(batch)} sentences): {e}")
+            results.extend([None] * len(batch))
+
+    return results
+
+
+def sentence_flags(labels) -> dict:
+    """
+    What one sentence's ((emotion, score), (bias, score)) contributes to
+    the report. A sentence with any flag set is a triage positive.
+    """
+    (emotion_label, emotion_score), (bias_label, bias_score) = labels
+
+    return {
+        "manipulative": emotion_label in {"anger", "fear", "disgust"} and emotion_score > EMOTION_CONFIDENCE_THRESHOLD,
+        "emotional": emotion_score > EMOTIONAL_TONE_THRESHOLD,
+        "political": ("left-leaning" in bias_label or "right-leaning" in bias_label) and bias_score > POLITICAL_BIAS_THRESHOLD,
+        "opinion": "subjective" in bias_label and bias_score > SUBJECTIVITY_THRESHOLD
+    }
 
 
 # =====================================================
@@ -136,34 +125,39 @@ def analyze_bias(sentences: List[str]) -> dict:
     political_biases = []
     opinion_sentences = []
 
-    for sentence in sentences:
+    # ---------- LOCAL TRIAGE (or FAST RULE FILTER) ----------
+    if TRIAGE_ENABLED:
+        selected, triage_stats = select_sentences(sentences)
+        candidates = [sentences[i] for i in selected]
+    else:
+        candidates = [s for s in sentences if is_candidate_sentence(s)]
+        triage_stats = {
+            "sentences": len(sentences),
+            "selected": len(candidates),
+            "over_budget": 0,
+            "model": "keywords"
+        }
 
-        # ---------- FAST RULE FILTER ----------
-        if not is_candidate_sentence(sentence):
-            continue
+    for sentence, labels in zip(candidates, classify_sentences(candidates)):
 
-        try:
-            # ---------- EMOTION + MANIPULATION ----------
-            emotion_label, emotion_score = detect_emotion_and_manipulation(sentence)
-
-            if emotion_label in {"anger", "fear", "disgust"} and emotion_score > 0.75:
-                manipulative_sentences.append(sentence)
+        if labels is None:
+            continue
 
-            if emotion_score > 0.85:
-                emotional_flags += 1
+        flags = sentence_flags(labels)
 
-            # ---------- BIAS + SUBJECTIVITY ----------
-            bias_label, bias_score = detect_bias_and_subjectivity(sentence)
+        # ---------- EMOTION + MANIPULATION ----------
+        if flags["manipulative"]:
+            manipulative_sentences.append(sentence)
 
-            if "left-leaning" in bias_label or "right-leaning" in bias_label:
-                if bias_score > 0.75:
-                    political_biases.append(bias_label)
+        if flags["emotional"]:
+            emotional_flags += 1
 
-            if "subjective" in bias_label and bias_score > 0.75:
-                opinion_sentences.append(sentence)
+        # ---------- BIAS + SUBJECTIVITY ----------
+        if flags["political"]:
+            political_biases.append(labels[1][0])
 
-        except Exception as e:
-            print(f"[WARN] Bias skipped: {e}")
+        if flags["opinion"]:
+            opinion_sentences.append(sentence)
 
     # =================================================
     # FINAL AGGREGATION
@@ -183,7 +177,8 @@ def analyze_bias(sentences: List[str]) -> dict:
         "manipulative_language": len(manipulative_sentences) > 0,
         "political_bias": political_bias or "neutral",
         "opinion_disguised_as_fact": opinion_sentences[:5],
-        "bias_score": bias_score
+        "bias_score": bias_score,
+        "triage": triage_stats
     }
 
 
@@ -208,4 +203,4 @@ def calculate_bias_score(
     score += manipulative * 10
     score += political * 10
     score += opinions * 5
-    return min(score, 100)
+    return min(score, BIAS_MAX_SCORE)
@@ -0,0 +1,318 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from app.services.utils.constants import (
+    HF_ROUTER_URL,
+    HF_TIMEOUT,
+    HF_POOL_SIZE,
+    HF_MAX_CONCURRENCY,
+    HF_MODEL_CONCURRENCY,
+    HF_MAX_RETRIES,
+    HF_BACKOFF_BASE,
+    HF_BACKOFF_MAX,
+    HF_BREAKER_THRESHOLD,
+    HF_BREAKER_COOLDOWN
+)
+from app.services.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# =====================================================
+# SHARED HUGGING FACE INFERENCE CLIENT
+# =====================================================
+# One pooled keep-alive httpx.AsyncClient for every HF call in the
+# process, running on its own event loop thread (like the ASR scheduler),
+# so sync stage code on the "http" executor and async callers share the
+# same connections and limits:
+# - a global and a per-model cap on requests in flight
+# - retries on 429 / 5xx / connection errors with exponential backoff
+#   and jitter, honoring Retry-After
+# - a per-model circuit breaker: after HF_BREAKER_THRESHOLD failed calls
+#   the model fails fast for HF_BREAKER_COOLDOWN seconds, then one trial
+#   call decides whether it closes again
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HFError(Exception):
+    """
+    Inference call failed (status is None for connection errors).
+    """
+
+    def __init__(self, message: str, status: int = None):
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitOpenError(HFError):
+    """
+    The model's circuit is open; the call was not sent.
+    """
+
+
+class CircuitBreaker:
+    """
+    closed → open after `threshold` consecutive failures; open →
+    half_open after `cooldown` seconds (one trial call); the trial's
+    outcome closes or re-opens it, and a trial that ends without one
+    (cancelled, unexpected error) re-opens it. Only touched from the
+    client loop.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = "half_open"
+            return True
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def record_abandoned(self):
+        if self.state == "half_open":
+            self.record_failure()
+
+
+def retry_after_seconds(value):
+    """
+    Retry-After as seconds (delta-seconds or HTTP date), None if unusable.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HFInferenceClient:
+    """
+    - base_url: models endpoint; requests go to {base_url}/{model}
+    - token: bearer token (HF_API_TOKEN by default, checked per call)
+    - transport: optional httpx transport (tests)
+    """
+
+    def __init__(
+        self,
+        base_url: str = HF_ROUTER_URL,
+        token: str = None,
+        max_concurrency: int = HF_MAX_CONCURRENCY,
+        model_concurrency: int = HF_MODEL_CONCURRENCY,
+        max_retries: int = HF_MAX_RETRIES,
+        backoff_base: float = HF_BACKOFF_BASE,
+        backoff_max: float = HF_BACKOFF_MAX,
+        breaker_threshold: int = HF_BREAKER_THRESHOLD,
+        breaker_cooldown: float = HF_BREAKER_COOLDOWN,
+        timeout: float = HF_TIMEOUT,
+        pool_size: int = HF_POOL_SIZE,
+        transport=None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.model_concurrency = model_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+
+        self._http = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=pool_size
+            ),
+            transport=transport
+        )
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._models = {}   # model -> {"semaphore", "breaker"}
+        self._counts = {"requests": 0, "retries": 0, "failures": 0, "rejected": 0}
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="hf-client", daemon=True
+        )
+        self._thread.start()
+
+    # ---------- public interface ----------
+
+    def submit(self, model: str, payload):
+        """
+        Schedule a call; returns a concurrent.futures.Future with the JSON.
+        """
+        return asyncio.run_coroutine_threadsafe(self._infer(model, payload), self._loop)
+
+    def infer_sync(self, model: str, payload):
+        return self.submit(model, payload).result()
+
+    async def infer(self, model: str, payload):
+        return await asyncio.wrap_future(self.submit(model, payload))
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self._http.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def stats(self) -> dict:
+        """
+        Snapshot taken on the client loop, which owns the counters and
+        breakers (callers run on other threads).
+        """
+        if self._loop.is_closed():
+            return self._snapshot()
+        return asyncio.run_coroutine_threadsafe(self._stats(), self._loop).result()
+
+    # ---------- internals (client loop only) ----------
+
+    async def _stats(self) -> dict:
+        return self._snapshot()
+
+    def _snapshot(self) -> dict:
+        return {
+            **self._counts,
+            "models": {
+                model: {
+                    "circuit": m["breaker"].state,
+                    "consecutive_failures": m["breaker"].failures
+                }
+                for model, m in self._models.items()
+            }
+        }
+
+    def _headers(self) -> dict:
+        # Checked per call, not at import, so the app starts (and tests
+        # import) without a token
+        token = self.token or os.getenv("HF_API_TOKEN")
+        if not token:
+            raise RuntimeError("HF_API_TOKEN not set in environment variables")
+        return {"Authorization": f"Bearer {token}"}
+
+    def _model(self, model: str) -> dict:
+        if model not in self._models:
+            self._models[model] = {
+                "semaphore": asyncio.Semaphore(self.model_concurrency),
+                "breaker": CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+            }
+        return self._models[model]
+
+    def _backoff(self, attempt: int, retry_after=None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay * random.uniform(0.5, 1.0), self.backoff_max)
+
+    async def _post(self, model: str, payload, headers, semaphore):
+        async with self._global, semaphore:
+            self._counts["requests"] += 1
+            return await self._http.post(
+                f"{self.base_url}/{model}", headers=headers, json=payload
+            )
+
+    async def _infer(self, model: str, payload):
+        headers = self._headers()
+        entry = self._model(model)
+        breaker = entry["breaker"]
+
+        if not breaker.allow():
+            self._counts["rejected"] += 1
+            raise CircuitOpenError(f"HF circuit open for {model}")
+
+        try:
+            return await self._attempts(model, payload, headers, entry)
+        except HFError:
+            raise   # outcome already recorded
+        except BaseException:
+            breaker.record_abandoned()
+            raise
+
+    async def _attempts(self, model: str, payload, headers, entry):
+        breaker = entry["breaker"]
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._counts["retries"] += 1
+
+            retry_after = None
+            try:
+                response = await self._post(model, payload, headers, entry["semaphore"])
+            except httpx.TransportError as e:
+                error = HFError(f"HF connection error ({model}): {e}")
+            else:
+                if response.status_code == 200:
+                    breaker.record_success()
+                    return response.json()
+
+                error = HFError(
+                    f"HF API error ({model}): {response.status_code} {response.text[:300]}",
+                    status=response.status_code
+                )
+                if response.status_code not in RETRY_STATUSES:
+                    # Our request is wrong; the model itself is fine
+                    breaker.record_success()
+                    raise error
+                retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        self._counts["failures"] += 1
+        breaker.record_failure()
+        logger.warning(f"{error} (after {self.max_retries} retries)")
+        raise error
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_hf_client(create: bool = True):
+    global _client
+    with _client_lock:
+        if _client is None and create:
+            _client = HFInferenceClient()
+    return _client
+
+
+def close_hf_client():
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def hf_inference(model_name: str, payload):
+    """
+    Blocking call through the shared client (for stage code running on
+    the "http" executor).
+    """
+    return get_hf_client().infer_sync(model_name, payload)
@@ -0,0 +1,469 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from app.services.nlp.inference_cache import get_inference_cache
+from app.services.utils.constants import (
+    INFERENCE_BACKEND,
+    INFERENCE_ONNX_DIR,
+    INFERENCE_ONNX_QUANTIZE,
+    INFERENCE_THREADS
+)
+from app.services.utils.logger import get_logger
+from app.services.utils.model_registry import registry
+
+logger = get_logger(__name__)
+
+# =====================================================
+# INFERENCE BACKENDS (emotion + MNLI)
+# =====================================================
+# Sentence and claim classification go through one interface, chosen per
+# deployment with INFERENCE_BACKEND:
+# - remote: Hugging Face router through the shared HF client
+# - onnx:   in-process ONNX Runtime on a thread pool (optional int8)
+# - stub:   deterministic scores from the text hash, no model, no network
+#
+# Every task takes a batch and returns a concurrent Future resolving to
+# one (label, score) per input, so callers can keep several batches in
+# flight whatever the backend. Repeated inputs are answered from the
+# inference cache (see inference_cache.py) before reaching the backend.
+
+EMOTION_MODEL = "j-hartmann/emotion-english-distilroberta-base"
+MNLI_MODEL = "facebook/bart-large-mnli"
+
+NLI_LABELS = ["CONTRADICTION", "NEUTRAL", "ENTAILMENT"]
+ZERO_SHOT_TEMPLATE = "This example is {}."
+
+
+# =====================================================
+# HF OUTPUT NORMALIZER (VERY IMPORTANT)
+# =====================================================
+
+def get_top_label(result, count: int = None):
+    """
+    Handles ALL HF formats:
+    - list[{label, score}]
+    - list[list[{label, score}]]
+    - {labels:[], scores:[]}
+
+    With `count` (number of inputs of a batched request) the result is
+    split per input and a list of (label, score) is returned in input order:
+    - list[list[{label, score}]]   (text classification)
+    - list[{labels:[], scores:[]}] (zero-shot)
+    """
+
+    if count is not None:
+        if isinstance(result, dict):
+            result = [result]
+        elif count == 1 and result and isinstance(result[0], dict) and "label" in result[0]:
+            result = [result]
+
+        if not isinstance(result, list) or len(result) != count:
+            raise ValueError(f"Expected {count} batched HF results, got: {result}")
+
+        return [get_top_label(item) for item in result]
+
+    if isinstance(result, dict):
+        return result["labels"][0], float(result["scores"][0])
+
+    if isinstance(result, list):
+        while isinstance(result, list) and len(result) > 0 and isinstance(result[0], list):
+            result = result[0]
+
+        if isinstance(result, list) and isinstance(result[0], dict):
+            top = max(result, key=lambda x: x.get("score", 0))
+            return top.get("label", "unknown"), float(top.get("score", 0))
+
+    raise ValueError(f"Unexpected HF response format: {result}")
+
+
+def _then(future: Future, fn) -> Future:
+    """
+    Future of fn(result of `future`).
+    """
+    mapped = Future()
+
+    def done(f):
+        try:
+            mapped.set_result(fn(f.result()))
+        except Exception as e:
+            mapped.set_exception(e)
+
+    future.add_done_callback(done)
+    return mapped
+
+
+def _gather(futures) -> Future:
+    """
+    Future of the list of results (first exception wins).
+    """
+    gathered = Future()
+    futures = list(futures)
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    if not futures:
+        gathered.set_result([])
+        return gathered
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] or gathered.done():
+                return
+        try:
+            gathered.set_result([f.result() for f in futures])
+        except Exception as e:
+            gathered.set_exception(e)
+
+    for f in futures:
+        f.add_done_callback(done)
+    return gathered
+
+
+class InferenceBackend:
+    """
+    Interface; every method returns a Future of [(label, score), ...].
+    NLI labels are ENTAILMENT / NEUTRAL / CONTRADICTION.
+    """
+
+    name = "base"
+
+    def classify(self, model: str, texts: list) -> Future:
+        raise NotImplementedError
+
+    def zero_shot(self, model: str, texts: list, candidate_labels: list) -> Future:
+        raise NotImplementedError
+
+    def entailment(self, model: str, pairs: list) -> Future:
+        """
+        pairs: [(premise, hypothesis), ...]
+        """
+        raise NotImplementedError
+
+
+# =====================================================
+# REMOTE (HF router)
+# =====================================================
+
+class RemoteBackend(InferenceBackend):
+
+    name = "remote"
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            # Imported here so the onnx / stub backends load without httpx
+            from app.services.nlp.hf_client import get_hf_client
+            return get_hf_client()
+        return self._client
+
+    def classify(self, model, texts):
+        texts = list(texts)
+        return _then(
+            self.client.submit(model, {"inputs": texts}),
+            lambda result: get_top_label(result, len(texts))
+        )
+
+    def zero_shot(self, model, texts, candidate_labels):
+        texts = list(texts)
+        payload = {"inputs": texts, "parameters": {"candidate_labels": list(candidate_labels)}}
+        return _then(
+            self.client.submit(model, payload),
+            lambda result: get_top_label(result, len(texts))
+        )
+
+    def entailment(self, model, pairs):
+        # The router takes one premise/hypothesis pair per request
+        def normalize(result):
+            label, score = get_top_label(result)
+            return label.upper(), score
+
+        return _gather(
+            _then(
+                self.client.submit(model, {"inputs": {"premise": p, "hypothesis": h}}),
+                normalize
+            )
+            for p, h in pairs
+        )
+
+
+# =====================================================
+# IN-PROCESS (ONNX Runtime)
+# =====================================================
+# Models are exported ahead of time, e.g.
+#   optimum-cli export onnx --model facebook/bart-large-mnli \
+#       $INFERENCE_ONNX_DIR/facebook__bart-large-mnli
+# Each directory holds model.onnx, config.json and the tokenizer files.
+# With INFERENCE_ONNX_QUANTIZE=1 a dynamic int8 copy (model.int8.onnx)
+# is written next to it on first load and used instead.
+
+def _softmax(x, axis=-1):
+    import numpy as np
+
+    e = np.exp(x - x.max(axis=axis, keepdims=True))
+    return e / e.sum(axis=axis, keepdims=True)
+
+
+class OnnxModel:
+    """
+    - session: onnxruntime.InferenceSession (or anything with run/get_inputs)
+    - tokenizer: callable like a transformers tokenizer (numpy tensors)
+    - id2label: {index: label} from the model config
+    """
+
+    def __init__(self, session, tokenizer, id2label: dict):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.id2label = {int(i): label for i, label in id2label.items()}
+        self.input_names = {i.name for i in session.get_inputs()}
+
+    def logits(self, texts, text_pairs=None):
+        encoded = self.tokenizer(
+            texts, text_pairs, padding=True, truncation=True, return_tensors="np"
+        )
+        feed = {k: v for k, v in encoded.items() if k in self.input_names}
+        return self.session.run(None, feed)[0]
+
+    def label_index(self, name: str) -> int:
+        for i, label in self.id2label.items():
+            if label.upper() == name:
+                return i
+        raise KeyError(f"Model has no '{name}' label")
+
+
+def _model_dir(model: str) -> str:
+    return os.path.join(INFERENCE_ONNX_DIR, model.replace("/", "__"))
+
+
+def load_onnx_model(model: str, quantize: bool = INFERENCE_ONNX_QUANTIZE) -> OnnxModel:
+    try:
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+    except ImportError as e:
+        raise RuntimeError(f"INFERENCE_BACKEND=onnx needs onnxruntime and transformers: {e}")
+
+    directory = _model_dir(model)
+    path = os.path.join(directory, "model.onnx")
+
+    if quantize:
+        quantized = os.path.join(directory, "model.int8.onnx")
+        if not os.path.exists(quantized):
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            quantize_dynamic(path, quantized, weight_type=QuantType.QInt8)
+        path = quantized
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = 1   # parallelism comes from the thread pool
+    session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+    with open(os.path.join(directory, "config.json")) as f:
+        id2label = json.load(f)["id2label"]
+
+    return OnnxModel(session, AutoTokenizer.from_pretrained(directory), id2label)
+
+
+for _model in (EMOTION_MODEL, MNLI_MODEL):
+    registry.register(
+        f"onnx:{_model}",
+        lambda model=_model: load_onnx_model(model),
+        warm=INFERENCE_BACKEND == "onnx"
+    )
+
+
+class OnnxBackend(InferenceBackend):
+    """
+    - models: {model name: OnnxModel}; loaded from INFERENCE_ONNX_DIR
+      through the model registry when not given
+    """
+
+    name = "onnx"
+
+    def __init__(self, models: dict = None, threads: int = INFERENCE_THREADS):
+        self.models = models
+        if INFERENCE_ONNX_QUANTIZE:
+            self.name = "onnx-int8"   # different scores: separate cache entries
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="onnx")
+
+    def _model(self, model: str) -> OnnxModel:
+        if self.models is not None:
+            return self.models[model]
+        return registry.get(f"onnx:{model}")
+
+    def classify(self, model, texts):
+        def run():
+            m = self._model(model)
+            probs = _softmax(m.logits(list(texts)))
+            return [(m.id2label[int(row.argmax())], float(row.max())) for row in probs]
+
+        return self._pool.submit(run)
+
+    def zero_shot(self, model, texts, candidate_labels):
+        # Same as the transformers zero-shot pipeline (single label): one
+        # NLI pass per (text, label), softmax over the entailment logits
+        def run():
+            m = self._model(model)
+            texts_ = list(texts)
+            labels = list(candidate_labels)
+            if not texts_:
+                return []
+
+            premises = [t for t in texts_ for _ in labels]
+            hypotheses = [ZERO_SHOT_TEMPLATE.format(l) for _ in texts_ for l in labels]
+            logits = m.logits(premises, hypotheses)
+
+            entail = logits[:, m.label_index("ENTAILMENT")].reshape(len(texts_), len(labels))
+            probs = _softmax(entail, axis=1)
+            return [(labels[int(row.argmax())], float(row.max())) for row in probs]
+
+        return self._pool.submit(run)
+
+    def entailment(self, model, pairs):
+        def run():
+            m = self._model(model)
+            pairs_ = list(pairs)
+            if not pairs_:
+                return []
+
+            probs = _softmax(m.logits([p for p, _ in pairs_], [h for _, h in pairs_]))
+            return [
+                (m.id2label[int(row.argmax())].upper(), float(row.max()))
+                for row in probs
+            ]
+
+        return self._pool.submit(run)
+
+
+# =====================================================
+# STUB (offline development / tests)
+# =====================================================
+
+EMOTION_LABELS = ["anger", "disgust", "fear", "joy", "neutral", "sadness", "surprise"]
+
+
+def _stub_top(labels, text):
+    digest = hashlib.sha256(text.encode()).digest()
+    weights = [digest[i] + 1 for i in range(len(labels))]
+    best = max(range(len(labels)), key=lambda i: weights[i])
+    return labels[best], weights[best] / sum(weights)
+
+
+class StubBackend(InferenceBackend):
+    """
+    Deterministic labels from the text hash (same input, same answer).
+    """
+
+    name = "stub"
+
+    def _done(self, value) -> Future:
+        future = Future()
+        future.set_result(value)
+        return future
+
+    def classify(self, model, texts):
+        return self._done([_stub_top(EMOTION_LABELS, t) for t in texts])
+
+    def zero_shot(self, model, texts, candidate_labels):
+        return self._done([_stub_top(list(candidate_labels), t) for t in texts])
+
+    def entailment(self, model, pairs):
+        return self._done([_stub_top(NLI_LABELS, p + "\x00" + h) for p, h in pairs])
+
+
+# =====================================================
+# RESULT CACHE WRAPPER
+# =====================================================
+
+class CachedBackend(InferenceBackend):
+    """
+    Serves repeated inputs from an InferenceCache; only the misses of a
+    batch (deduplicated) reach the wrapped backend.
+    """
+
+    def __init__(self, inner: InferenceBackend, cache):
+        self.inner = inner
+        self.cache = cache
+        self.name = inner.name
+
+    def _cached(self, model, keys, compute) -> Future:
+        """
+        compute(indexes) -> Future of results for those inputs.
+        """
+        values = [self.cache.get(model, key) for key in keys]
+
+        first = {}
+        for i, value in enumerate(values):
+            if value is None:
+                first.setdefault(keys[i], i)
+
+        if not first:
+            done = Future()
+            done.set_result(values)
+            return done
+
+        indexes = list(first.values())
+
+        def merge(computed):
+            by_key = {}
+            for i, value in zip(indexes, computed):
+                by_key[keys[i]] = tuple(value)
+                self.cache.put(model, keys[i], value)
+            return [value if value is not None else by_key[key] for key, value in zip(keys, values)]
+
+        return _then(compute(indexes), merge)
+
+    def classify(self, model, texts):
+        texts = list(texts)
+        keys = [self.cache.key(self.name, model, "classify", t) for t in texts]
+        return self._cached(
+            model, keys, lambda idx: self.inner.classify(model, [texts[i] for i in idx])
+        )
+
+    def zero_shot(self, model, texts, candidate_labels):
+        texts = list(texts)
+        labels = list(candidate_labels)
+        keys = [self.cache.key(self.name, model, "zero_shot", t, labels) for t in texts]
+        return self._cached(
+            model, keys, lambda idx: self.inner.zero_shot(model, [texts[i] for i in idx], labels)
+        )
+
+    def entailment(self, model, pairs):
+        pairs = list(pairs)
+        keys = [self.cache.key(self.name, model, "entailment", h, p) for p, h in pairs]
+        return self._cached(
+            model, keys, lambda idx: self.inner.entailment(model, [pairs[i] for i in idx])
+        )
+
+
+BACKENDS = {
+    "remote": RemoteBackend,
+    "onnx": OnnxBackend,
+    "stub": StubBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_inference_backend() -> InferenceBackend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if INFERENCE_BACKEND not in BACKENDS:
+                raise ValueError(
+                    f"Unknown INFERENCE_BACKEND '{INFERENCE_BACKEND}' "
+                    f"(choose from {', '.join(BACKENDS)})"
+                )
+            _backend = BACKENDS[INFERENCE_BACKEND]()
+
+            cache = get_inference_cache()
+            if cache is not None:
+                _backend = CachedBackend(_backend, cache)
+
+            logger.info(f"Inference backend: {_backend.name} (cache {'on' if cache else 'off'})")
+    return _backend
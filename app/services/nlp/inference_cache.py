@@ -0,0 +1,185 @@
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.utils.constants import (
+    INFERENCE_CACHE_ENABLED,
+    INFERENCE_CACHE_PATH,
+    INFERENCE_CACHE_MAX_ENTRIES,
+    INFERENCE_CACHE_MEMORY_ENTRIES,
+    INFERENCE_CACHE_TTL
+)
+from app.services.utils.logger import get_logger
+from app.services.utils.sqlite_cache import SqliteCache
+
+logger = get_logger(__name__)
+
+# =====================================================
+# SENTENCE / CLAIM INFERENCE CACHE (two tiers)
+# =====================================================
+# Slogans, channel intros, repeated OCR captions and re-analyses send
+# the same sentences to the same models again and again. Each
+# (label, score) is stored under sha256(backend, model, task, normalized
+# text, candidate labels / premise hash):
+# - tier 1: in-process LRU (INFERENCE_CACHE_MEMORY_ENTRIES)
+# - tier 2: SqliteCache shared by every worker on the node
+#   (INFERENCE_CACHE_MAX_ENTRIES, LRU eviction)
+# Both honor INFERENCE_CACHE_TTL. Disk writes go through one writer
+# thread so callers (e.g. the HF client loop) never wait on SQLite.
+
+
+def normalize_text(text: str) -> str:
+    """
+    NFKC + collapsed whitespace. Case is kept (the models are cased).
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def _sha(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+class InferenceCache:
+    """
+    - store: SqliteCache (persistent tier) or None for memory only
+    - memory_entries: size of the in-process LRU
+    - ttl: seconds an answer is served
+    """
+
+    def __init__(
+        self,
+        store: SqliteCache = None,
+        memory_entries: int = INFERENCE_CACHE_MEMORY_ENTRIES,
+        ttl: int = INFERENCE_CACHE_TTL
+    ):
+        self.store = store
+        self.memory_entries = memory_entries
+        self.ttl = ttl
+
+        self._memory = OrderedDict()   # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self._counts = {}              # model -> {"memory_hits", "disk_hits", "misses"}
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference-cache")
+
+    @staticmethod
+    def key(backend: str, model: str, task: str, text: str, context=None) -> str:
+        """
+        context: candidate labels (zero-shot) or the premise (entailment)
+        """
+        if isinstance(context, str):
+            context = _sha(normalize_text(context))
+        return _sha(json.dumps([backend, model, task, normalize_text(text), context]))
+
+    def _count(self, model, name):
+        with self._lock:
+            counts = self._counts.setdefault(model, {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+            counts[name] += 1
+
+    def _remember(self, key, stored_at, value):
+        with self._lock:
+            self._memory[key] = (stored_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, model: str, key: str):
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl:
+                    self._memory.move_to_end(key)
+                else:
+                    del self._memory[key]
+                    entry = None
+
+        if entry is not None:
+            self._count(model, "memory_hits")
+            return entry[1]
+
+        stored = self.store.get(key) if self.store is not None else None
+        if stored is not None and now - stored["stored_at"] <= self.ttl:
+            value = tuple(stored["value"])
+            self._remember(key, stored["stored_at"], value)
+            self._count(model, "disk_hits")
+            return value
+
+        self._count(model, "misses")
+        return None
+
+    def put(self, model: str, key: str, value):
+        stored_at = time.time()
+        value = tuple(value)
+        self._remember(key, stored_at, value)
+
+        if self.store is not None:
+            entry = {"stored_at": stored_at, "value": list(value)}
+            try:
+                self._writer.submit(self._write, key, entry)
+            except RuntimeError:
+                self._write(key, entry)   # writer already closed (shutdown)
+
+    def _write(self, key, entry):
+        try:
+            self.store.put(key, entry)
+        except Exception as e:
+            logger.warning(f"Inference cache write failed: {e}")
+
+    def flush(self):
+        """
+        Wait for queued disk writes (tests / shutdown).
+        """
+        self._writer.submit(lambda: None).result()
+
+    def close(self):
+        """
+        Drain queued disk writes and stop the writer thread (shutdown).
+        """
+        self._writer.shutdown(wait=True)
+        if self.store is not None:
+            self.store.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            models = {model: dict(c) for model, c in self._counts.items()}
+            memory = len(self._memory)
+
+        for counts in models.values():
+            total = counts["memory_hits"] + counts["disk_hits"] + counts["misses"]
+            hits = counts["memory_hits"] + counts["disk_hits"]
+            counts["hit_rate"] = round(hits / total, 3) if total else None
+
+        return {
+            "memory_entries": memory,
+            "disk_entries": self.store.stats()["entries"] if self.store is not None else 0,
+            "ttl": self.ttl,
+            "models": models
+        }
+
+
+_inference_cache = None
+_inference_cache_lock = threading.Lock()
+
+
+def get_inference_cache():
+    global _inference_cache
+    with _inference_cache_lock:
+        if INFERENCE_CACHE_ENABLED and _inference_cache is None:
+            _inference_cache = InferenceCache(
+                SqliteCache(INFERENCE_CACHE_PATH, INFERENCE_CACHE_MAX_ENTRIES, namespace="inference")
+            )
+    return _inference_cache
+
+
+def close_inference_cache():
+    global _inference_cache
+    with _inference_cache_lock:
+        if _inference_cache is not None:
+            _inference_cache.close()
+            _inference_cache = None
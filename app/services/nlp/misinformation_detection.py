@@ -1,71 +1,9 @@
 import re
-import os
 import requests
-import time
 from functools import lru_cache
 
-# =====================================================
-# Hugging Face API setup
-# =====================================================
-
-HF_API_TOKEN = os.getenv("HF_API_TOKEN")
-
-if not HF_API_TOKEN:
-    raise RuntimeError("HF_API_TOKEN not set in environment variables")
-
-HEADERS = {
-    "Authorization": f"Bearer {HF_API_TOKEN}",
-    "Content-Type": "application/json"
-}
-
-HF_URL = "https://router.huggingface.co/hf-inference/models"
-
-
-# =====================================================
-# HF API CALL (retry + safety)
-# =====================================================
-
-def hf_inference(model_name, payload, retries=3):
-    url = f"{HF_URL}/{model_name}"
-
-    for attempt in range(retries):
-        response = requests.post(
-            url,
-            headers=HEADERS,
-            json=payload,
-            timeout=60
-        )
-
-        if response.status_code == 200:
-            return response.json()
-
-        if response.status_code in (429, 503):
-            time.sleep(3)
-            continue
-
-        raise Exception(f"HF API error ({model_name}): {response.text}")
-
-    raise Exception(f"HF API failed after {retries} retries for {model_name}")
-
-
-# =====================================================
-# HF OUTPUT NORMALIZER (MNLI SAFE)
-# =====================================================
-
-def get_mnli_result(result):
-    """
-    Handles:
-    - [{label, score}]
-    - [[{label, score}]]
-    """
-    if isinstance(result, list):
-        while isinstance(result[0], list):
-            result = result[0]
-        top = max(result, key=lambda x: x.get("score", 0))
-        return top["label"], float(top["score"])
-
-    raise ValueError("Unexpected MNLI response format")
-
+from app.services.nlp.inference_backend import MNLI_MODEL, get_inference_backend
+from app.services.utils.constants import MISINFO_PENALTY, UNCERTAIN_PENALTY
 
 # =====================================================
 # STEP 1 — SMART CLAIM EXTRACTION
@@ -140,17 +78,7 @@ def classify_claim(claim, evidence):
     if not evidence:
         return "uncertain", 0.0
 
-    result = hf_inference(
-        "facebook/bart-large-mnli",
-        {
-            "inputs": {
-                "premise": evidence,
-                "hypothesis": claim
-            }
-        }
-    )
-
-    label, score = get_mnli_result(result)
+    label, score = get_inference_backend().entailment(MNLI_MODEL, [(evidence, claim)]).result()[0]
 
     if label == "ENTAILMENT":
         return "supported", score
@@ -181,9 +109,9 @@ def detect_misinformation(clean_text, sentences):
             verdict, confidence = classify_claim(claim, evidence)
 
             if verdict == "misinformation":
-                misinformation_score += 20
+                misinformation_score += MISINFO_PENALTY
             elif verdict == "uncertain":
-                misinformation_score += 5
+                misinformation_score += UNCERTAIN_PENALTY
 
             misinformation_results.append({
                 "claim": claim,
@@ -1,8 +1,15 @@
-import spacy
 import re
 
-# Load spaCy model once
-nlp = spacy.load("en_core_web_sm")
+from app.services.utils.model_registry import registry
+
+
+def _load_spacy():
+    import spacy
+    return spacy.load("en_core_web_sm")
+
+
+# Loaded on first use (or by the startup warm-up)
+registry.register("spacy", _load_spacy)
 
 def preprocess_text(text: str):
     """
@@ -24,6 +31,7 @@ def preprocess_text(text: str):
     text = text.lower()
 
     # 3. spaCy NLP processing
+    nlp = registry.get("spacy")
     doc = nlp(text)
 
     sentences = []
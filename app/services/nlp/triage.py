@@ -0,0 +1,206 @@
+import math
+import os
+import re
+import zlib
+
+import numpy as np
+
+from app.services.utils.constants import (
+    TRIAGE_ENABLED,
+    TRIAGE_MODEL_PATH,
+    TRIAGE_RECALL_TARGET,
+    TRIAGE_BUDGET,
+    TRIAGE_MIN_WORDS
+)
+from app.services.utils.logger import get_logger
+from app.services.utils.model_registry import registry
+
+logger = get_logger(__name__)
+
+# =====================================================
+# LOCAL SENTENCE TRIAGE
+# =====================================================
+# Decides which sentences are worth the two remote models. A hashed
+# n-gram linear model (unigrams, bigrams, a length bucket) scores every
+# sentence of a video in one vectorized pass:
+#
+#   score = bias + sum(weights[hash(feature) % n_features])
+#
+# Sentences at or above the model's threshold are sent, the highest
+# scoring first when there are more than TRIAGE_BUDGET. The threshold is
+# calibrated on labelled data to keep TRIAGE_RECALL_TARGET of the
+# sentences that affect the bias report (benchmarks/eval_triage.py
+# labels, trains and evaluates). Without a trained model file a seed
+# model reproduces the old keyword rule.
+
+N_FEATURES = 2 ** 18
+
+IMPORTANT_KEYWORDS = {
+    "should", "must", "never", "always", "truth", "lie", "fake",
+    "government", "media", "people", "danger", "fear", "hate",
+    "agenda", "propaganda", "corrupt", "exposed"
+}
+
+
+def tokenize(sentence: str) -> list:
+    return re.findall(r"[a-z0-9]+", sentence.lower())
+
+
+def _features(tokens: list) -> list:
+    features = list(tokens)
+    features += [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    features.append(f"__len_{min(len(tokens), 30) // 3}")
+    return features
+
+
+def hashed_features(sentences: list, n_features: int = N_FEATURES):
+    """
+    Sparse design matrix as two aligned arrays: (row, column) per feature.
+    """
+    rows, cols = [], []
+    for row, sentence in enumerate(sentences):
+        for feature in _features(tokenize(sentence)):
+            rows.append(row)
+            cols.append(zlib.crc32(feature.encode()) % n_features)
+
+    return np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)
+
+
+class TriageModel:
+    """
+    - weights: float32 array of n_features
+    - bias: intercept
+    - threshold: score at or above which a sentence is sent
+    """
+
+    def __init__(self, weights: np.ndarray, bias: float, threshold: float, name: str = "trained"):
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = float(bias)
+        self.threshold = float(threshold)
+        self.name = name
+
+    @property
+    def n_features(self) -> int:
+        return len(self.weights)
+
+    def scores(self, sentences: list) -> np.ndarray:
+        rows, cols = hashed_features(sentences, self.n_features)
+        return np.bincount(rows, weights=self.weights[cols], minlength=len(sentences)) + self.bias
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(path, weights=self.weights, bias=self.bias, threshold=self.threshold)
+
+    @classmethod
+    def load(cls, path: str) -> "TriageModel":
+        data = np.load(path)
+        return cls(data["weights"], data["bias"], data["threshold"], name=os.path.basename(path))
+
+    @classmethod
+    def seed(cls, n_features: int = N_FEATURES) -> "TriageModel":
+        """
+        Keyword rule as a linear model: any keyword scores above 0.
+        """
+        weights = np.zeros(n_features, dtype=np.float32)
+        for keyword in IMPORTANT_KEYWORDS:
+            weights[zlib.crc32(keyword.encode()) % n_features] = 1.0
+        return cls(weights, bias=-0.5, threshold=0.0, name="seed")
+
+
+# =====================================================
+# TRAINING / CALIBRATION
+# =====================================================
+
+def threshold_for_recall(scores: np.ndarray, labels: np.ndarray, target: float) -> float:
+    """
+    Highest threshold keeping at least `target` of the positives.
+    """
+    positives = np.sort(scores[labels == 1])[::-1]
+    if len(positives) == 0:
+        return float("inf")
+    keep = max(1, math.ceil(target * len(positives)))
+    return float(positives[keep - 1])
+
+
+def train(
+    sentences: list,
+    labels,
+    recall_target: float = TRIAGE_RECALL_TARGET,
+    n_features: int = N_FEATURES,
+    epochs: int = 300,
+    learning_rate: float = 0.5,
+    l2: float = 1e-4,
+    calibration=None
+) -> TriageModel:
+    """
+    Class-balanced logistic regression by full-batch gradient descent on
+    the hashed features. The threshold is set for `recall_target` on
+    `calibration` = (sentences, labels) when given, else on the training data.
+    """
+    labels = np.asarray(labels, dtype=np.float64)
+    rows, cols = hashed_features(sentences, n_features)
+    n = len(sentences)
+
+    positives = max(labels.sum(), 1.0)
+    negatives = max(n - labels.sum(), 1.0)
+    sample_weight = np.where(labels == 1, n / (2 * positives), n / (2 * negatives))
+
+    weights = np.zeros(n_features)
+    bias = 0.0
+
+    for _ in range(epochs):
+        z = np.bincount(rows, weights=weights[cols], minlength=n) + bias
+        error = (1.0 / (1.0 + np.exp(-z)) - labels) * sample_weight / n
+
+        weights -= learning_rate * (np.bincount(cols, weights=error[rows], minlength=n_features) + l2 * weights)
+        bias -= learning_rate * error.sum()
+
+    model = TriageModel(weights, bias, threshold=0.0)
+
+    cal_sentences, cal_labels = calibration or (sentences, labels)
+    model.threshold = threshold_for_recall(
+        model.scores(cal_sentences), np.asarray(cal_labels), recall_target
+    )
+    return model
+
+
+# =====================================================
+# RUNTIME SELECTION
+# =====================================================
+
+def _load_triage():
+    if os.path.exists(TRIAGE_MODEL_PATH):
+        return TriageModel.load(TRIAGE_MODEL_PATH)
+    logger.info(f"No triage model at {TRIAGE_MODEL_PATH}; using the keyword seed model")
+    return TriageModel.seed()
+
+
+registry.register("triage", _load_triage, warm=TRIAGE_ENABLED)
+
+
+def select_sentences(sentences: list, model: TriageModel = None, budget: int = TRIAGE_BUDGET):
+    """
+    Indexes (in input order) of the sentences to send to the remote
+    models, plus stats {"sentences", "selected", "over_budget", "model"}.
+    """
+    model = model or registry.get("triage")
+
+    if not sentences:
+        return [], {"sentences": 0, "selected": 0, "over_budget": 0, "model": model.name}
+
+    scores = model.scores(sentences)
+    long_enough = np.array([len(tokenize(s)) >= TRIAGE_MIN_WORDS for s in sentences])
+    keep = np.flatnonzero((scores >= model.threshold) & long_enough)
+
+    over_budget = max(0, len(keep) - budget)
+    if over_budget:
+        keep = np.sort(keep[np.argsort(-scores[keep], kind="stable")[:budget]])
+
+    return keep.tolist(), {
+        "sentences": len(sentences),
+        "selected": len(keep),
+        "over_budget": over_budget,
+        "model": model.name
+    }
@@ -1,86 +1,123 @@
-import cv2
-import os
-import hashlib
-
-def _frame_hash(frame, size=16):
-    """
-    Lightweight perceptual hash for duplicate detection
-    """
-    small = cv2.resize(frame, (size, size))
-    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
-    return hashlib.md5(gray.tobytes()).hexdigest()
-
-
-def extract_frames(
+import queue
+import threading
+
+from app.services.ocr.frame_sampler import sample_frames
+from app.services.ocr.hash_index import BKTree
+from app.services.ocr.perceptual_hash import frame_hash
+from app.services.ocr.text_gate import has_text
+from app.services.utils.constants import (
+    FRAME_QUEUE_SIZE,
+    FRAME_SAMPLER,
+    PHASH_ALGORITHM,
+    PHASH_HAMMING_THRESHOLD,
+    TEXT_GATE_MIN_DENSITY
+)
+
+
+def iter_frames(
     video_path: str,
     frame_rate: int = 3,        # 1 frame every 3 seconds (OCR-friendly)
     max_frames: int = 120,
-    resize_width: int = 960     # resize for faster OCR
+    resize_width: int = 960,    # resize for faster OCR
+    sampler: str = FRAME_SAMPLER
 ):
     """
     Optimized frame extraction for OCR.
+    Yields (timestamp_sec, frame) with frame as a decoded BGR numpy array —
+    nothing is written to disk.
 
-    - frame_rate: seconds between frames
-    - max_frames: hard safety limit
+    - frame_rate: seconds between frames (fixed-interval samplers)
+    - max_frames: frame budget, spread over the whole video
     - resize_width: downscale frames for OCR speed
+    - sampler: "adaptive" / "ffmpeg" / "sequential" / "keyframes" (see frame_sampler.py)
+
+    Frames with text are never dropped as near-duplicates: a new ticker
+    line, lower-third or caption barely moves the whole-frame hash. The
+    OCR RegionTracker skips their unchanged text boxes instead.
     """
 
-    frames_dir = "temp_files/frames"
-    os.makedirs(frames_dir, exist_ok=True)
+    seen_hashes = BKTree()
+    saved = 0
+    skipped = 0
+    text_frames = 0
 
-    # Clear old frames
-    for file in os.listdir(frames_dir):
-        os.remove(os.path.join(frames_dir, file))
+    frames = sample_frames(video_path, frame_rate, resize_width, sampler, max_frames)
 
-    cap = cv2.VideoCapture(video_path)
+    try:
+        for timestamp, frame in frames:
+            if saved >= max_frames:
+                break
 
-    if not cap.isOpened():
-        raise RuntimeError("Failed to open video for frame extraction")
+            # Skip near-duplicate frames without text (same shot, compression noise, ...)
+            if has_text(frame, TEXT_GATE_MIN_DENSITY):
+                text_frames += 1
+            elif not seen_hashes.add_if_new(frame_hash(frame, PHASH_ALGORITHM), PHASH_HAMMING_THRESHOLD):
+                skipped += 1
+                continue
 
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    if fps <= 0:
-        fps = 25
+            saved += 1
 
-    frame_step = int(fps * frame_rate)
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            yield timestamp, frame
 
-    frame_paths = []
-    seen_hashes = set()
-    saved = 0
-    current_frame = 0
+    finally:
+        frames.close()
 
-    while current_frame < total_frames and saved < max_frames:
-        cap.set(cv2.CAP_PROP_POS_FRAMES, current_frame)
-        success, frame = cap.read()
-        if not success:
-            break
-
-        # Resize (keep aspect ratio)
-        h, w = frame.shape[:2]
-        if w > resize_width:
-            scale = resize_width / w
-            frame = cv2.resize(frame, (resize_width, int(h * scale)))
+    print(
+        f"🎞️ Frames extracted: {saved} ({text_frames} with text), {skipped} near-duplicates dropped "
+        f"(max {max_frames}, {sampler} sampler)"
+    )
 
-        # Skip duplicate frames
-        hsh = _frame_hash(frame)
-        if hsh in seen_hashes:
-            current_frame += frame_step
-            continue
 
-        seen_hashes.add(hsh)
+# =====================================================
+# BOUNDED PRODUCER / CONSUMER STREAM
+# =====================================================
 
-        frame_file = f"{frames_dir}/frame_{saved}.jpg"
-        cv2.imwrite(frame_file, frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+_END = object()
 
-        frame_paths.append(frame_file)
-        saved += 1
-        current_frame += frame_step
 
-    cap.release()
+def stream_frames(video_path: str, queue_size: int = FRAME_QUEUE_SIZE, **kwargs):
+    """
+    Decode frames on a background thread and hand them over through a
+    bounded queue, so OCR starts on the first frame while decoding
+    continues. At most `queue_size` decoded frames are held in memory.
 
-    print(
-        f"🎞️ Frames extracted: {len(frame_paths)} "
-        f"(every {frame_rate}s, max {max_frames})"
-    )
+    kwargs are passed to iter_frames().
+    """
 
-    return frame_paths
+    frames = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                frames.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iter_frames(video_path, **kwargs):
+                if not put(item):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            put(_END)
+
+    producer = threading.Thread(target=produce, name="frame-decoder", daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item = frames.get()
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Consumer finished or bailed out: unblock and stop the producer
+        stop.set()
+        producer.join(timeout=5)
@@ -0,0 +1,314 @@
+import re
+import queue
+import threading
+
+import cv2
+import ffmpeg
+import numpy as np
+
+from app.services.utils.constants import (
+    ADAPTIVE_ANALYSIS_FPS,
+    ADAPTIVE_MAX_GAP,
+    SCENE_CHANGE_THRESHOLD
+)
+
+# =====================================================
+# DECODE-ONCE FRAME SAMPLERS
+# =====================================================
+# All samplers yield (timestamp_sec, BGR frame) and never seek. Seeking
+# with CAP_PROP_POS_FRAMES makes H.264 jump back to the previous keyframe
+# and re-decode the whole GOP for every sample.
+#
+# - sequential: OpenCV grab() every frame, retrieve() only sampled ones
+# - ffmpeg:     ffmpeg fps + scale filters, raw BGR frames over a pipe
+# - keyframes:  ffmpeg decodes keyframes only (fastest, coarsest)
+# - adaptive:   emits frames at scene / text changes, spread over the video
+
+SAMPLERS = ("sequential", "ffmpeg", "keyframes", "adaptive")
+
+_PTS_TIME = re.compile(rb"pts_time:\s*([0-9.]+)")
+
+
+def video_duration(video_path: str) -> float:
+    """
+    Duration in seconds from the container header (0.0 if unknown).
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        return frames / fps if fps > 0 and frames > 0 else 0.0
+    finally:
+        cap.release()
+
+
+def _target_size(width: int, height: int, resize_width: int):
+    if width > resize_width:
+        scale = resize_width / width
+        return resize_width, int(height * scale)
+    return width, height
+
+
+def sample_sequential(video_path: str, interval: float, resize_width: int):
+    """
+    Decode sequentially; only sampled frames are converted and resized.
+    """
+
+    cap = cv2.VideoCapture(video_path)
+
+    if not cap.isOpened():
+        raise RuntimeError("Failed to open video for frame extraction")
+
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if fps <= 0:
+        fps = 25
+
+    frame_step = max(1, int(round(fps * interval)))
+    frame_idx = 0
+
+    try:
+        while cap.grab():
+            if frame_idx % frame_step == 0:
+                success, frame = cap.retrieve()
+                if not success:
+                    break
+
+                h, w = frame.shape[:2]
+                size = _target_size(w, h, resize_width)
+                if size != (w, h):
+                    frame = cv2.resize(frame, size)
+
+                yield frame_idx / fps, frame
+
+            frame_idx += 1
+
+    finally:
+        cap.release()
+
+
+def sample_ffmpeg(
+    video_path: str,
+    interval: float,
+    resize_width: int,
+    keyframes_only: bool = False
+):
+    """
+    Let ffmpeg do sampling + downscaling in one decode pass and read raw
+    frames from stdout. Timestamps come from the showinfo filter on stderr.
+    """
+
+    # Container header read only (no decode) to size the raw frames
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError("Failed to open video for frame extraction")
+    width, height = _target_size(
+        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        resize_width
+    )
+    cap.release()
+
+    if keyframes_only:
+        video = ffmpeg.input(video_path, skip_frame="nokey").video
+        output_args = {"fps_mode": "vfr"}
+    else:
+        video = ffmpeg.input(video_path).video.filter("fps", fps=f"1/{interval}")
+        output_args = {}
+
+    process = (
+        video
+        .filter("scale", width, height)
+        .filter("showinfo")
+        .output("pipe:", format="rawvideo", pix_fmt="bgr24", **output_args)
+        .global_args("-nostdin", "-loglevel", "info")
+        .run_async(pipe_stdout=True, pipe_stderr=True)
+    )
+
+    # stderr must be drained continuously or ffmpeg blocks on a full pipe
+    timestamps = queue.Queue()
+
+    def read_stderr():
+        for line in process.stderr:
+            match = _PTS_TIME.search(line)
+            if match:
+                timestamps.put(float(match.group(1)))
+
+    stderr_reader = threading.Thread(target=read_stderr, daemon=True)
+    stderr_reader.start()
+
+    frame_bytes = width * height * 3
+    count = 0
+    last_timestamp = None
+
+    try:
+        while True:
+            buf = bytearray(frame_bytes)
+            if process.stdout.readinto(buf) < frame_bytes:
+                break
+
+            try:
+                timestamp = timestamps.get(timeout=5)
+            except queue.Empty:
+                timestamp = count * interval
+
+            count += 1
+
+            # Keyframes still honour the interval (intra-only codecs would
+            # otherwise turn every frame into a sample)
+            if keyframes_only and last_timestamp is not None:
+                if timestamp - last_timestamp < interval:
+                    continue
+            last_timestamp = timestamp
+
+            frame = np.frombuffer(buf, np.uint8).reshape(height, width, 3)
+
+            yield timestamp, frame
+
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        stderr_reader.join(timeout=5)
+
+
+# =====================================================
+# ADAPTIVE (SCENE-CHANGE) SAMPLING
+# =====================================================
+
+def change_score(prev_thumb, thumb, pixel_delta: int = 25) -> float:
+    """
+    Fraction of thumbnail pixels that changed noticeably (0..1).
+    Cheap enough to run on every analysed frame; a new text line or a
+    cut shows up even when mean brightness barely moves.
+    """
+    if prev_thumb is None:
+        return 1.0
+    diff = cv2.absdiff(prev_thumb, thumb)
+    return float(np.count_nonzero(diff > pixel_delta)) / diff.size
+
+
+def _thumbnail(frame):
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, (96, 54), interpolation=cv2.INTER_AREA)
+
+
+def sample_adaptive(
+    video_path: str,
+    resize_width: int,
+    max_frames: int,
+    analysis_fps: float = 2.0,
+    change_threshold: float = 0.005,
+    max_gap: float = 10.0
+):
+    """
+    Decode at `analysis_fps` and emit frames only where the picture changes.
+
+    Time-uniform budget: the video is split into `max_frames` equal buckets
+    and each bucket emits at most one frame — the first one whose change
+    score passes `change_threshold`. If a bucket ends with nothing emitted
+    and `max_gap` seconds passed since the last emitted frame, its most
+    changed frame is emitted anyway, so the whole video is covered instead
+    of stopping after the first `max_frames` samples.
+
+    When the duration is unknown (no frame count in the header), buckets
+    start at `max_gap` seconds and grow 4x each time half of the remaining
+    budget is spent, so the samples still reach the end of long videos.
+    """
+
+    duration = video_duration(video_path)
+    bucket_len = duration / max_frames if duration > 0 else max_gap
+    grow_at = None if duration > 0 else max(1, max_frames // 2)
+    bucket_end = bucket_len
+
+    last_thumb = None
+    last_emitted_at = None
+    emitted = 0
+
+    bucket_spent = False
+    candidate = None   # (score, timestamp, frame, thumb) best so far in bucket
+
+    def flush_bucket():
+        # Coverage fallback when a bucket had no clear change
+        if bucket_spent or candidate is None:
+            return None
+        if last_emitted_at is not None and candidate[1] - last_emitted_at < max_gap:
+            return None
+        return candidate
+
+    for timestamp, frame in sample_ffmpeg(video_path, 1 / analysis_fps, resize_width):
+        if timestamp >= bucket_end:
+            fallback = flush_bucket()
+            if fallback is not None:
+                _, ts, fr, thumb = fallback
+                last_thumb, last_emitted_at = thumb, ts
+                emitted += 1
+                yield ts, fr
+
+            if grow_at is not None and emitted >= grow_at:
+                bucket_len *= 4
+                grow_at = emitted + max(1, (max_frames - emitted) // 2)
+
+            bucket_end = (timestamp // bucket_len + 1) * bucket_len
+            bucket_spent = False
+            candidate = None
+
+        if bucket_spent:
+            continue
+
+        thumb = _thumbnail(frame)
+        score = change_score(last_thumb, thumb)
+
+        if score >= change_threshold:
+            last_thumb, last_emitted_at = thumb, timestamp
+            bucket_spent = True
+            emitted += 1
+            yield timestamp, frame
+            continue
+
+        if candidate is None or score > candidate[0]:
+            candidate = (score, timestamp, frame, thumb)
+
+    fallback = flush_bucket()
+    if fallback is not None:
+        yield fallback[1], fallback[2]
+
+
+def sample_frames(
+    video_path: str,
+    interval: float,
+    resize_width: int,
+    sampler: str = "adaptive",
+    max_frames: int = 120
+):
+    """
+    Dispatch to the configured sampler.
+
+    Fixed-interval samplers stretch `interval` so that `max_frames`
+    samples span the whole video rather than only its beginning.
+    """
+
+    if sampler == "adaptive":
+        return sample_adaptive(
+            video_path,
+            resize_width,
+            max_frames,
+            analysis_fps=ADAPTIVE_ANALYSIS_FPS,
+            change_threshold=SCENE_CHANGE_THRESHOLD,
+            max_gap=ADAPTIVE_MAX_GAP
+        )
+
+    duration = video_duration(video_path)
+    if duration > 0:
+        interval = max(interval, duration / max_frames)
+
+    if sampler == "sequential":
+        return sample_sequential(video_path, interval, resize_width)
+
+    if sampler == "ffmpeg":
+        return sample_ffmpeg(video_path, interval, resize_width)
+
+    if sampler == "keyframes":
+        return sample_ffmpeg(video_path, interval, resize_width, keyframes_only=True)
+
+    raise ValueError(f"Unknown frame sampler '{sampler}' (expected one of {SAMPLERS})")
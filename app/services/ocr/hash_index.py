@@ -0,0 +1,81 @@
+# =====================================================
+# BK-TREE OVER HAMMING DISTANCE
+# =====================================================
+# Near-duplicate lookup for perceptual hashes. A query with radius r only
+# visits children whose edge distance d satisfies |d - dist| <= r
+# (triangle inequality), so lookups stay far below a linear scan.
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class BKTree:
+    """
+    BK-tree of integer hashes keyed by Hamming distance.
+    """
+
+    def __init__(self):
+        self._root = None   # [hash, {distance: child_node}]
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, value: int):
+        if self._root is None:
+            self._root = [value, {}]
+            self._size = 1
+            return
+
+        node = self._root
+        while True:
+            dist = hamming(value, node[0])
+            if dist == 0:
+                return   # already present
+
+            child = node[1].get(dist)
+            if child is None:
+                node[1][dist] = [value, {}]
+                self._size += 1
+                return
+            node = child
+
+    def find(self, value: int, radius: int) -> list:
+        """
+        All (distance, hash) pairs within `radius` of value.
+        """
+        if self._root is None:
+            return []
+
+        matches = []
+        stack = [self._root]
+
+        while stack:
+            node = stack.pop()
+            dist = hamming(value, node[0])
+
+            if dist <= radius:
+                matches.append((dist, node[0]))
+
+            for edge, child in node[1].items():
+                if dist - radius <= edge <= dist + radius:
+                    stack.append(child)
+
+        return matches
+
+    def nearest(self, value: int, radius: int):
+        """
+        Closest (distance, hash) within `radius`, or None.
+        """
+        matches = self.find(value, radius)
+        return min(matches) if matches else None
+
+    def add_if_new(self, value: int, radius: int) -> bool:
+        """
+        Insert value unless a hash within `radius` exists. Returns True if inserted.
+        """
+        if self.nearest(value, radius) is not None:
+            return False
+        self.add(value)
+        return True
@@ -1,46 +1,262 @@
-from paddleocr import PaddleOCR
-import time
+from importlib import metadata
 import hashlib
+import json
+import time
+
+from app.services.ocr.perceptual_hash import content_digest, phash
+from app.services.ocr.region_tracker import RegionTracker
+from app.services.ocr.text_gate import has_text
+from app.services.utils.model_registry import registry
+from app.services.utils.sqlite_cache import SqliteCache
+from app.services.utils.constants import (
+    OCR_BATCH_SIZE,
+    TEXT_GATE_MIN_DENSITY,
+    REGION_CHANGE_THRESHOLD,
+    OCR_CACHE_ENABLED,
+    OCR_CACHE_PATH,
+    OCR_CACHE_MAX_ENTRIES
+)
+
+OCR_CONFIG = {"use_angle_cls": True, "lang": "en"}
+
+
+def _load_ocr():
+    # Imported here: paddle alone takes seconds to import
+    from paddleocr import PaddleOCR
+    # Angle classifier enabled here
+    return PaddleOCR(**OCR_CONFIG)
+
+
+registry.register("paddleocr", _load_ocr)
+
+
+# =====================================================
+# PERSISTENT OCR CACHE (shared across videos + workers)
+# =====================================================
+# Intros, end cards, sponsor slides and watermarks repeat across a
+# channel's videos. Results are keyed by the perceptual hash of the exact
+# image sent to OCR, an exact digest of a downscaled grayscale copy (two
+# slides with the same layout but different words share a pHash) and a
+# fingerprint of the OCR config/version, so a config change never serves
+# stale text.
+
+def _paddleocr_version() -> str:
+    # Read from package metadata so the fingerprint never imports paddle
+    try:
+        return metadata.version("paddleocr")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+OCR_CONFIG_FINGERPRINT = hashlib.sha1(
+    (json.dumps(OCR_CONFIG, sort_keys=True) + _paddleocr_version()).encode()
+).hexdigest()[:12]
+
+_ocr_cache = None
+
+
+def get_ocr_cache():
+    global _ocr_cache
+    if OCR_CACHE_ENABLED and _ocr_cache is None:
+        _ocr_cache = SqliteCache(OCR_CACHE_PATH, OCR_CACHE_MAX_ENTRIES, namespace="ocr")
+    return _ocr_cache
+
+
+def _cache_key(frame) -> str:
+    return f"{phash(frame):016x}:{content_digest(frame)}:{OCR_CONFIG_FINGERPRINT}"
+
+
+# =====================================================
+# PADDLEOCR OUTPUT NORMALIZER
+# =====================================================
+
+def _bounds(points):
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _result_items(result):
+    """
+    Returns [(box, text), ...] with box = (x1, y1, x2, y2).
+    Handles both PaddleOCR formats:
+    - 3.x predict(): OCRResult with "rec_texts" + "rec_boxes" / "rec_polys"
+    - 2.x ocr():     [[points, (text, score)], ...]
+    """
+    if not result:
+        return []
+
+    if hasattr(result, "get") and result.get("rec_texts") is not None:
+        boxes = result.get("rec_boxes")
+        if boxes is None:
+            boxes = [_bounds(poly) for poly in result.get("rec_polys", [])]
+        return [
+            (tuple(box), text)
+            for box, text in zip(boxes, result["rec_texts"])
+            if text
+        ]
 
-# Initialize once (angle classifier enabled here)
-ocr = PaddleOCR(use_angle_cls=True, lang='en')
+    items = []
+    for line in result:
+        for word in line or []:
+            items.append((_bounds(word[0]), word[1][0]))
+    return items
 
-def frame_hash(path):
-    with open(path, "rb") as f:
-        return hashlib.md5(f.read()).hexdigest()
 
-def read_text_from_frames(frame_paths, skip_every=3):
+def _ocr_batch(frames):
+    """
+    One PaddleOCR call for the whole batch when supported (3.x predict),
+    otherwise frame by frame.
+    """
+    ocr = registry.get("paddleocr")
+    if hasattr(ocr, "predict"):
+        return [_result_items(r) for r in ocr.predict(frames)]
+
+    return [_result_items(ocr.ocr(frame)) for frame in frames]
+
+
+def _ocr_batch_cached(frames, counts):
+    """
+    Serve what we can from the OCR cache, OCR the rest in one batch.
+    """
+    cache = get_ocr_cache()
+    if cache is None:
+        return _ocr_batch(frames)
+
+    keys = [_cache_key(frame) for frame in frames]
+    results = [cache.get(key) for key in keys]
+
+    missing = [i for i, items in enumerate(results) if items is None]
+    counts["cache_hits"] += len(frames) - len(missing)
+    counts["cache_misses"] += len(missing)
+
+    if missing:
+        fresh = _ocr_batch([frames[i] for i in missing])
+        for i, items in zip(missing, fresh):
+            items = [([int(v) for v in box], text) for box, text in items]
+            cache.put(keys[i], items)
+            results[i] = items
+
+    return results
+
+
+# =====================================================
+# MAIN OCR LOOP
+# =====================================================
+
+def read_text_from_frames(frames, stats=None, batch_size=OCR_BATCH_SIZE):
+    """
+    Runs OCR over a stream of (timestamp, frame) pairs.
+
+    `frames` can be any iterable (e.g. stream_frames()), so OCR starts on
+    the first decoded frame; frames arrive as numpy arrays and go straight
+    into PaddleOCR without a JPEG round-trip. Near-duplicates are already
+    dropped by the frame extractor.
+
+    Frames without visible text are skipped by a cheap edge-density check;
+    the rest are OCR'd in batches of `batch_size`. Text regions that have
+    not changed since they were last read (tickers, logos, lower-thirds)
+    are masked out and their cached text is not emitted again. If `stats`
+    is a dict it is filled with frame counts, skip rates and OCR cost.
+    """
 
     ocr_results = []
-    seen_hashes = set()
+    pending = []
+    tracker = RegionTracker(change_threshold=REGION_CHANGE_THRESHOLD)
 
-    frames = frame_paths[::skip_every]
+    counts = {
+        "frames": 0,
+        "skipped_no_text": 0,
+        "skipped_static_text": 0,
+        "ocr_frames": 0,
+        "ocr_failed": 0,
+        "batches": 0,
+        "cache_hits": 0,
+        "cache_misses": 0
+    }
+    ocr_seconds = 0.0
 
-    print(f"\n🔍 OCR STARTED (PaddleOCR)")
-    print(f"📉 Frames reduced: {len(frame_paths)} → {len(frames)}\n")
+    print(f"\n🔍 OCR STARTED (PaddleOCR, batch size {batch_size})")
 
     start = time.time()
 
-    for idx, frame in enumerate(frames, start=1):
+    def run_ocr(batch):
+        nonlocal ocr_seconds
+        if not batch:
+            return
+
+        batch_start = time.time()
         try:
-            h = frame_hash(frame)
-            if h in seen_hashes:
+            results = _ocr_batch_cached([masked for _, _, masked in batch], counts)
+        except Exception as e:
+            # Not counted as OCR'd: keeps ms/frame and the skip rate honest
+            print(f"OCR error on batch at {batch[0][0]:.1f}s: {e}")
+            counts["ocr_failed"] += len(batch)
+            return
+        ocr_seconds += time.time() - batch_start
+
+        for (_, frame, _), items in zip(batch, results):
+            new_texts = tracker.update(frame, items)
+            if new_texts:
+                ocr_results.append(" ".join(new_texts))
+
+        counts["ocr_frames"] += len(batch)
+        counts["batches"] += 1
+
+    def flush():
+        # Masking needs the boxes of earlier frames: until the tracker
+        # holds any, the first frame left after masking is read alone and
+        # the rest are masked against its boxes; afterwards the whole
+        # batch is masked against the tracked regions and read at once
+        batch = []
+        lead_read = bool(tracker.regions)
+        for timestamp, frame in pending:
+            # Only static, already-read text left on screen → nothing to OCR
+            masked, unchanged = tracker.mask_unchanged(frame)
+            if unchanged and not has_text(masked, TEXT_GATE_MIN_DENSITY):
+                counts["skipped_static_text"] += 1
                 continue
-            seen_hashes.add(h)
 
-            result = ocr.ocr(frame)
+            batch.append((timestamp, frame, masked))
+            if not lead_read:
+                run_ocr(batch)
+                batch = []
+                lead_read = True
 
-            if result:
-                for line in result:
-                    text = " ".join([word[1][0] for word in line])
-                    ocr_results.append(text)
+        run_ocr(batch)
+        pending.clear()
 
-        except Exception as e:
-            print(f"OCR error on frame {idx}: {e}")
+        if counts["batches"] % 5 == 0:
+            print(f"📸 OCR progress: {counts['ocr_frames']} frames")
+
+    for timestamp, frame in frames:
+        counts["frames"] += 1
+
+        if not has_text(frame, TEXT_GATE_MIN_DENSITY):
+            counts["skipped_no_text"] += 1
+            continue
+
+        pending.append((timestamp, frame))
+        if len(pending) >= batch_size:
+            flush()
+
+    flush()
+
+    summary = dict(counts)
+    summary["skip_rate"] = round(counts["skipped_no_text"] / counts["frames"], 3) if counts["frames"] else 0.0
+    summary["static_regions_reused"] = tracker.reused
+    summary["ocr_ms_per_frame"] = round(1000 * ocr_seconds / counts["ocr_frames"], 1) if counts["ocr_frames"] else 0.0
+    summary["total_seconds"] = round(time.time() - start, 2)
 
-        if idx % 10 == 0:
-            print(f"📸 OCR progress: {idx}/{len(frames)}")
+    if stats is not None:
+        stats.update(summary)
 
-    print(f"\n✅ OCR DONE in {round(time.time() - start, 2)} sec\n")
+    print(
+        f"📉 OCR frames: {counts['ocr_frames']}/{counts['frames']} "
+        f"(skipped {counts['skipped_no_text']} without text, "
+        f"{counts['skipped_static_text']} with only static text, "
+        f"{summary['ocr_ms_per_frame']} ms/frame)"
+    )
+    print(f"\n✅ OCR DONE in {summary['total_seconds']} sec\n")
 
     return "\n".join(ocr_results)
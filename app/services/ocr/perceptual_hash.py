@@ -0,0 +1,66 @@
+import hashlib
+
+import cv2
+import numpy as np
+
+# =====================================================
+# PERCEPTUAL FRAME HASHES (64-bit ints)
+# =====================================================
+# Unlike MD5 over pixels / JPEG bytes, visually similar frames (same slide
+# with compression noise, slight brightness change) get hashes that differ
+# in only a few bits, so near-duplicates are found by Hamming distance.
+
+HASH_BITS = 64
+
+
+def _gray(frame):
+    if frame.ndim == 3:
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return frame
+
+
+def _bits_to_int(bits) -> int:
+    return int.from_bytes(np.packbits(bits.flatten()).tobytes(), "big")
+
+
+def dhash(frame, size: int = 8) -> int:
+    """
+    Difference hash: sign of horizontal gradients on a (size+1)x(size) thumbnail.
+    """
+    small = cv2.resize(_gray(frame), (size + 1, size), interpolation=cv2.INTER_AREA)
+    return _bits_to_int(small[:, 1:] > small[:, :-1])
+
+
+def phash(frame, size: int = 8) -> int:
+    """
+    DCT hash: low-frequency DCT coefficients of a 32x32 thumbnail vs their median.
+    """
+    small = cv2.resize(_gray(frame), (32, 32), interpolation=cv2.INTER_AREA)
+    dct = cv2.dct(np.float32(small))[:size, :size]
+    coeffs = dct.flatten()[1:]   # drop the DC term (overall brightness)
+    bits = np.append(dct.flatten()[0] > np.median(coeffs), coeffs > np.median(coeffs))
+    return _bits_to_int(bits)
+
+
+def content_digest(frame, width: int = 256) -> str:
+    """
+    Exact digest of a `width`-wide grayscale thumbnail quantized to 16
+    gray levels. Unlike the 64-bit hashes above, a different word on the
+    same layout gives a different digest.
+    """
+    gray = _gray(frame)
+    height = max(1, round(gray.shape[0] * width / gray.shape[1]))
+    small = cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA)
+    return hashlib.sha1((small >> 4).tobytes()).hexdigest()[:16]
+
+
+HASHERS = {
+    "dhash": dhash,
+    "phash": phash,
+}
+
+
+def frame_hash(frame, algorithm: str = "dhash") -> int:
+    if algorithm not in HASHERS:
+        raise ValueError(f"Unknown perceptual hash '{algorithm}' (expected one of {tuple(HASHERS)})")
+    return HASHERS[algorithm](frame)
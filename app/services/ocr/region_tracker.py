@@ -0,0 +1,133 @@
+import cv2
+import numpy as np
+
+# =====================================================
+# STATIC TEXT REGION TRACKING
+# =====================================================
+# Lower-thirds, tickers, logos and burned-in captions sit in the same place
+# for minutes. Once a text box has been OCR'd, its pixels are remembered;
+# on later frames an unchanged box is masked out before OCR and its cached
+# text is reused, so only new or changed text is detected and recognised.
+
+
+def _box_iou(a, b) -> float:
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    if inter == 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / float(area_a + area_b - inter)
+
+
+def _region_thumb(frame, box):
+    x1, y1, x2, y2 = box
+    crop = frame[y1:y2, x1:x2]
+    if crop.size == 0:
+        return None
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+    return cv2.resize(gray, (64, 16), interpolation=cv2.INTER_AREA)
+
+
+def _changed_fraction(a, b, pixel_delta: int = 30) -> float:
+    return float(np.count_nonzero(cv2.absdiff(a, b) > pixel_delta)) / a.size
+
+
+class RegionTracker:
+    """
+    Remembers OCR'd text boxes and detects whether they changed.
+
+    - change_threshold: fraction of region pixels that must change before
+      the region is OCR'd again
+    - max_misses: frames a region may stay changed/absent before it is dropped
+    - max_regions: cap on tracked regions
+    """
+
+    def __init__(
+        self,
+        change_threshold: float = 0.05,
+        max_misses: int = 3,
+        max_regions: int = 64
+    ):
+        self.change_threshold = change_threshold
+        self.max_misses = max_misses
+        self.max_regions = max_regions
+
+        self.regions = []   # {"box", "thumb", "text", "misses", "reused"}
+        self.reused = 0
+
+    def mask_unchanged(self, frame):
+        """
+        Returns (frame_for_ocr, unchanged_count). Unchanged regions are
+        painted with their median colour so OCR detection skips them.
+        """
+        unchanged = []
+
+        for region in self.regions:
+            thumb = _region_thumb(frame, region["box"])
+            if thumb is not None and _changed_fraction(region["thumb"], thumb) < self.change_threshold:
+                region["misses"] = 0
+                region["reused"] += 1
+                unchanged.append(region)
+            else:
+                region["misses"] += 1
+
+        self.regions = [r for r in self.regions if r["misses"] <= self.max_misses]
+        self.reused += len(unchanged)
+
+        if not unchanged:
+            return frame, 0
+
+        masked = frame.copy()
+        for region in unchanged:
+            x1, y1, x2, y2 = region["box"]
+            patch = masked[y1:y2, x1:x2]
+            masked[y1:y2, x1:x2] = np.median(patch.reshape(-1, patch.shape[-1]), axis=0)
+
+        return masked, len(unchanged)
+
+    def update(self, frame, items) -> list:
+        """
+        Record OCR output [(box, text), ...] for `frame`.
+        Returns the texts that are new (not a re-read of the same region).
+        """
+        new_texts = []
+        h, w = frame.shape[:2]
+
+        for box, text in items:
+            box = (
+                max(0, int(box[0])), max(0, int(box[1])),
+                min(w, int(box[2])), min(h, int(box[3]))
+            )
+            thumb = _region_thumb(frame, box)
+            if thumb is None:
+                continue
+
+            match = max(
+                self.regions,
+                key=lambda r: _box_iou(r["box"], box),
+                default=None
+            )
+
+            if match is not None and _box_iou(match["box"], box) > 0.5:
+                if match["text"] != text:
+                    new_texts.append(text)
+                match.update(box=box, thumb=thumb, text=text, misses=0)
+                continue
+
+            new_texts.append(text)
+            self.regions.append({
+                "box": box,
+                "thumb": thumb,
+                "text": text,
+                "misses": 0,
+                "reused": 0
+            })
+
+        if len(self.regions) > self.max_regions:
+            # keep the regions that paid off most
+            self.regions.sort(key=lambda r: r["reused"], reverse=True)
+            self.regions = self.regions[:self.max_regions]
+
+        return new_texts
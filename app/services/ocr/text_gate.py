@@ -0,0 +1,31 @@
+import cv2
+import numpy as np
+
+# =====================================================
+# CHEAP TEXT-PRESENCE CHECK
+# =====================================================
+# Text shows up as dense, short, high-contrast strokes. Counting strong
+# gradient pixels on a small grayscale copy costs well under a millisecond
+# and lets frames with no text at all (talking heads on blank walls, fades,
+# black frames) skip the full PaddleOCR detection + recognition pass.
+
+
+def edge_density(frame, width: int = 320, gradient_threshold: int = 80) -> float:
+    """
+    Fraction of pixels (0..1) with a strong horizontal or vertical gradient.
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+
+    h, w = gray.shape[:2]
+    if w > width:
+        gray = cv2.resize(gray, (width, max(1, int(h * width / w))), interpolation=cv2.INTER_AREA)
+
+    gx = cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=3)
+    gy = cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=3)
+    magnitude = np.abs(gx).astype(np.int32) + np.abs(gy)
+
+    return float(np.count_nonzero(magnitude > gradient_threshold)) / magnitude.size
+
+
+def has_text(frame, min_density: float) -> bool:
+    return edge_density(frame) >= min_density
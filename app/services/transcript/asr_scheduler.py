@@ -0,0 +1,160 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import torch
+import whisper
+
+# =====================================================
+# CROSS-REQUEST MICRO-BATCHING FOR WHISPER
+# =====================================================
+# Every request turns its speech chunks into 30 s log-mel segments (on its
+# own thread) and submits them here. A single scheduler thread groups
+# segments from all requests into one batched whisper.decode() call on the
+# shared model: a batch is sent once it holds `max_batch_size` segments or
+# the oldest segment has waited `max_wait_ms`. Bigger batches mean better
+# throughput, a shorter wait means lower latency.
+#
+# With language=None Whisper detects the language of every segment in the
+# batch, so requests in different languages can share a batch. Timestamp
+# tokens are kept and split into segments as model.transcribe() does.
+
+TIME_PRECISION = 0.02   # seconds per timestamp token
+
+
+class ASRScheduler:
+
+    def __init__(
+        self,
+        model,
+        max_batch_size: int = 8,
+        max_wait_ms: int = 50,
+        language: str = None
+    ):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.options = whisper.DecodingOptions(
+            language=language,
+            without_timestamps=False,
+            fp16=model.device.type == "cuda"
+        )
+        # Timestamp token ids do not depend on the language
+        self.tokenizer = whisper.tokenizer.get_tokenizer(
+            model.is_multilingual, num_languages=model.num_languages
+        )
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+
+        self._segments = 0
+        self._batches = 0
+        self._busy_seconds = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="asr-scheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, audio_chunk: np.ndarray, offset: float) -> Future:
+        """
+        Queue one chunk (≤ 30 s). The future resolves to a segment list
+        [{"start", "end", "text"}] like the per-chunk transcriber.
+        """
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(audio_chunk),
+            n_mels=self.model.dims.n_mels
+        )
+        future = Future()
+        duration = len(audio_chunk) / whisper.audio.SAMPLE_RATE
+        self._queue.put((mel, offset, duration, future))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            start = time.time()
+
+            try:
+                mel_batch = torch.stack([mel for mel, _, _, _ in batch]).to(self.model.device)
+                results = whisper.decode(self.model, mel_batch, self.options)
+
+                for (_, offset, duration, future), result in zip(batch, results):
+                    segments = []
+                    if result.text.strip() and result.no_speech_prob < 0.6:
+                        segments = self._segments_from_tokens(result.tokens, offset, duration)
+                    future.set_result(segments)
+
+            except Exception as e:
+                for _, _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+            with self._lock:
+                self._segments += len(batch)
+                self._batches += 1
+                self._busy_seconds += time.time() - start
+
+    def _segments_from_tokens(self, tokens, offset: float, duration: float) -> list:
+        """
+        <|0.00|> text <|2.40|><|2.40|> text <|5.00|> → one segment per
+        timestamp pair; text without a closing timestamp ends at `duration`.
+        """
+        timestamp_begin = self.tokenizer.timestamp_begin
+        segments = []
+        start = 0.0
+        text_tokens = []
+
+        def close(end):
+            text = self.tokenizer.decode(text_tokens).strip()
+            if text:
+                segments.append({
+                    "start": round(offset + start, 2),
+                    "end": round(offset + min(max(end, start), duration), 2),
+                    "text": text
+                })
+
+        for token in tokens:
+            if token < timestamp_begin:
+                text_tokens.append(token)
+                continue
+
+            at = (token - timestamp_begin) * TIME_PRECISION
+            if text_tokens:
+                close(at)
+                text_tokens = []
+            start = at
+
+        if text_tokens:
+            close(duration)
+
+        return segments
+
+    def stats(self) -> dict:
+        with self._lock:
+            segments, batches, busy = self._segments, self._batches, self._busy_seconds
+
+        return {
+            "segments": segments,
+            "batches": batches,
+            "avg_batch_size": round(segments / batches, 2) if batches else 0.0,
+            "segments_per_sec": round(segments / busy, 2) if busy else 0.0,
+            "queued": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": int(self.max_wait * 1000)
+        }
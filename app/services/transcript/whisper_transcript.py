@@ -1,22 +1,296 @@
-import whisper
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import threading
 
-# Load the Whisper model once (global)
-# "tiny" is fastest, "base" is more accurate but larger
-model = whisper.load_model("tiny")
+import numpy as np
 
-def generate_whisper_transcript(audio_path: str) -> str:
+from app.services.input_handler.extract_audio import stream_audio, SAMPLE_RATE
+from app.services.utils.model_registry import registry
+from app.services.utils.constants import (
+    WHISPER_MODE,
+    WHISPER_MODEL,
+    WHISPER_LANGUAGE,
+    WHISPER_PROCESSES,
+    ASR_MAX_BATCH_SIZE,
+    ASR_MAX_WAIT_MS,
+    VAD_ENERGY_MARGIN_DB,
+    VAD_NOISE_FLOOR_CAP_DB,
+    VAD_MIN_SPEECH_SEC,
+    VAD_MAX_GAP_SEC,
+    VAD_PAD_SEC,
+    ASR_CHUNK_SEC
+)
+
+
+def _load_whisper():
+    # Imported here: whisper pulls in torch, which is slow to import
+    import whisper
+    return whisper.load_model(WHISPER_MODEL)
+
+
+# In pool mode the model lives in the worker processes (loaded by their
+# initializer), so the API process only warms it when it runs chunks itself
+registry.register(
+    "whisper",
+    _load_whisper,
+    warm=WHISPER_MODE == "batched" or WHISPER_PROCESSES <= 1
+)
+
+
+# =====================================================
+# VOICE ACTIVITY DETECTION (energy + speech band)
+# =====================================================
+
+def detect_speech(audio: np.ndarray, frame_sec: float = 0.03) -> list:
+    """
+    Returns [(start_sec, end_sec), ...] regions that likely contain speech.
+
+    Each 30 ms frame is speech when its energy is VAD_ENERGY_MARGIN_DB
+    above the noise floor (10th percentile, capped) AND most of that energy sits
+    in the 300–3400 Hz voice band, which rejects silence, hum and most
+    music beds. Regions are padded, short gaps merged, blips dropped.
+    """
+
+    frame_len = int(SAMPLE_RATE * frame_sec)
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return []
+
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    # Capped so a block that is all speech still has a sane floor
+    noise_floor = min(np.percentile(energy_db, 10), VAD_NOISE_FLOOR_CAP_DB)
+
+    window = np.hanning(frame_len).astype(np.float32)
+    freqs = np.fft.rfftfreq(frame_len, 1 / SAMPLE_RATE)
+    voice_band = (freqs >= 300) & (freqs <= 3400)
+
+    # FFT in blocks (~5 min each) to keep memory flat on hour-long audio
+    band_ratio = np.empty(n_frames, dtype=np.float32)
+    block = 10000
+    for i in range(0, n_frames, block):
+        spectrum = np.abs(np.fft.rfft(frames[i:i + block] * window, axis=1)) ** 2
+        band_ratio[i:i + block] = spectrum[:, voice_band].sum(axis=1) / (spectrum.sum(axis=1) + 1e-10)
+
+    is_speech = (energy_db > noise_floor + VAD_ENERGY_MARGIN_DB) & (band_ratio > 0.5)
+
+    # Frame flags → padded regions
+    regions = []
+    start = None
+    for i, speech in enumerate(is_speech):
+        if speech and start is None:
+            start = i
+        elif not speech and start is not None:
+            regions.append([start * frame_sec, i * frame_sec])
+            start = None
+    if start is not None:
+        regions.append([start * frame_sec, n_frames * frame_sec])
+
+    duration = len(audio) / SAMPLE_RATE
+    merged = []
+    for s, e in regions:
+        s, e = max(0.0, s - VAD_PAD_SEC), min(duration, e + VAD_PAD_SEC)
+        if merged and s - merged[-1][1] <= VAD_MAX_GAP_SEC:
+            merged[-1][1] = e
+        else:
+            merged.append([s, e])
+
+    return [(s, e) for s, e in merged if e - s >= VAD_MIN_SPEECH_SEC]
+
+
+def plan_chunks(regions: list, max_chunk_sec: float = ASR_CHUNK_SEC) -> list:
+    """
+    Pack speech regions into chunks of at most `max_chunk_sec` (Whisper's
+    30 s window). Whisper pads every input to a full window, so short gaps
+    inside a chunk cost nothing; only long silences between chunks are
+    actually skipped. Long regions are split.
+    """
+
+    chunks = []
+    for s, e in regions:
+        while e - s > max_chunk_sec:
+            chunks.append((s, s + max_chunk_sec))
+            s += max_chunk_sec
+
+        if chunks and e - chunks[-1][0] <= max_chunk_sec:
+            chunks[-1] = (chunks[-1][0], e)
+        else:
+            chunks.append((s, e))
+
+    return chunks
+
+
+# =====================================================
+# CHUNK TRANSCRIPTION (process pool)
+# =====================================================
+
+def _init_worker():
+    # One torch thread per worker process: parallelism comes from the pool
+    import torch
+    torch.set_num_threads(1)
+    registry.get("whisper")
+
+
+def _transcribe_chunk(audio_chunk: np.ndarray, offset: float) -> list:
+    model = registry.get("whisper")
+    result = model.transcribe(
+        audio_chunk,
+        language=WHISPER_LANGUAGE,
+        fp16=False,
+        condition_on_previous_text=False
+    )
+    return [
+        {
+            "start": round(offset + seg["start"], 2),
+            "end": round(offset + seg["end"], 2),
+            "text": seg["text"].strip()
+        }
+        for seg in result.get("segments", [])
+        if seg["text"].strip()
+    ]
+
+
+_pool = None
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        # spawn: never fork a process that already runs executor threads
+        _pool = ProcessPoolExecutor(
+            max_workers=WHISPER_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+    return _pool
+
+
+# =====================================================
+# CHUNK TRANSCRIPTION (batched scheduler, shared model)
+# =====================================================
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_asr_scheduler(create: bool = True):
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None and create and WHISPER_MODE == "batched":
+            from app.services.transcript.asr_scheduler import ASRScheduler
+            _scheduler = ASRScheduler(
+                registry.get("whisper"),
+                max_batch_size=ASR_MAX_BATCH_SIZE,
+                max_wait_ms=ASR_MAX_WAIT_MS,
+                language=WHISPER_LANGUAGE
+            )
+    return _scheduler
+
+
+def transcribe_stream(blocks) -> list:
+    """
+    VAD → chunk → transcribe chunks in parallel → stitch, over a stream of
+    audio blocks (see extract_audio.stream_audio).
+
+    Speech still running at the end of a block is carried over into the
+    next one so no utterance is cut in half. In-flight chunks are capped
+    at twice the pool / batch size, which bounds memory on hour-long inputs.
+
+    WHISPER_MODE picks where chunks run: "pool" (one model per worker
+    process) or "batched" (cross-request micro-batches on one shared model).
+    Returns [{"start", "end", "text"}, ...] in time order.
+    """
+
+    scheduler = get_asr_scheduler()
+    parallel = scheduler is not None or WHISPER_PROCESSES > 1
+    max_in_flight = 2 * (ASR_MAX_BATCH_SIZE if scheduler else WHISPER_PROCESSES)
+
+    pending = []     # futures (or finished results when not parallel)
+    results = []
+
+    total = 0.0
+    speech = 0.0
+    n_chunks = 0
+
+    carry = np.zeros(0, dtype=np.float32)
+    carry_offset = 0.0
+
+    def submit(chunk, offset):
+        if not parallel:
+            results.append(_transcribe_chunk(chunk, offset))
+            return
+        if scheduler is not None:
+            pending.append(scheduler.submit(chunk, offset))
+        else:
+            pending.append(_get_pool().submit(_transcribe_chunk, chunk, offset))
+        while len(pending) > max_in_flight:
+            results.append(pending.pop(0).result())
+
+    def process(audio, offset, final):
+        nonlocal speech, n_chunks
+        duration = len(audio) / SAMPLE_RATE
+        regions = detect_speech(audio)
+
+        # Hold back an utterance that touches the block end
+        keep_from = None
+        if not final and regions and duration - regions[-1][1] < VAD_MAX_GAP_SEC:
+            keep_from = regions[-1][0]
+            regions = regions[:-1]
+
+        for s, e in plan_chunks(regions):
+            submit(audio[int(s * SAMPLE_RATE):int(e * SAMPLE_RATE)], offset + s)
+            speech += e - s
+            n_chunks += 1
+
+        if keep_from is None:
+            return np.zeros(0, dtype=np.float32), offset + duration
+
+        # Never carry more than one window: flush full windows of a
+        # long-running utterance now
+        while duration - keep_from > ASR_CHUNK_SEC:
+            end = keep_from + ASR_CHUNK_SEC
+            submit(audio[int(keep_from * SAMPLE_RATE):int(end * SAMPLE_RATE)], offset + keep_from)
+            speech += ASR_CHUNK_SEC
+            n_chunks += 1
+            keep_from = end
+
+        start = int(keep_from * SAMPLE_RATE)
+        return audio[start:].copy(), offset + start / SAMPLE_RATE
+
+    block = None
+    for next_block in blocks:
+        total += len(next_block) / SAMPLE_RATE
+        if block is not None:
+            carry, carry_offset = process(np.concatenate([carry, block]), carry_offset, final=False)
+        block = next_block
+
+    if block is not None:
+        process(np.concatenate([carry, block]), carry_offset, final=True)
+
+    results.extend(f.result() for f in pending)
+
+    print(f"🎙️ Speech: {speech:.1f}s of {total:.1f}s in {n_chunks} chunks")
+
+    segments = [seg for chunk_segments in results for seg in chunk_segments]
+    return sorted(segments, key=lambda seg: seg["start"])
+
+
+def generate_whisper_transcript(media_path: str) -> dict:
     """
-    Convert extracted audio into text using OpenAI Whisper (tiny model).
+    Convert a video's audio into text using OpenAI Whisper (tiny model).
+    Audio is streamed from FFmpeg in memory (no WAV file).
+    Returns {"text": ..., "segments": [{"start", "end", "text"}, ...]}.
     """
 
     try:
-        result = model.transcribe(audio_path)
-        transcript = result.get("text", "")
+        segments = transcribe_stream(stream_audio(media_path))
 
         # Clean transcript
+        transcript = " ".join(seg["text"] for seg in segments)
         transcript = transcript.strip().replace("\n", " ")
 
-        return transcript
+        return {"text": transcript, "segments": segments}
 
     except Exception as e:
         raise Exception(f"Whisper transcription failed: {str(e)}")
@@ -1,21 +1,295 @@
-from youtube_transcript_api import YouTubeTranscriptApi
+from collections import OrderedDict
+from concurrent.futures import Future
+import threading
+import time
 
-def get_youtube_transcript(video_id: str) -> str:
+from app.services.utils.constants import (
+    TRANSCRIPT_LANGUAGES,
+    TRANSCRIPT_CACHE_ENABLED,
+    TRANSCRIPT_CACHE_PATH,
+    TRANSCRIPT_CACHE_MAX_ENTRIES,
+    TRANSCRIPT_MEMORY_ENTRIES,
+    TRANSCRIPT_CACHE_TTL,
+    TRANSCRIPT_NEGATIVE_TTL
+)
+from app.services.utils.logger import get_logger
+from app.services.utils.sqlite_cache import SqliteCache
+
+logger = get_logger(__name__)
+
+# =====================================================
+# YOUTUBE CAPTIONS PROVIDER
+# =====================================================
+# Input detection and the transcript stage both need the captions of the
+# same video. They are fetched once, with timestamps, and kept in an
+# in-process LRU in front of a SqliteCache shared across requests;
+# concurrent lookups of one video wait for a single fetch. Entries are
+# keyed by video and language preference. "No captions" is cached too,
+# with a short TTL (captions get added later); network / rate-limit
+# errors are never cached.
+
+
+class NoCaptionsError(Exception):
     """
-    Fetches YouTube transcript using YouTubeTranscriptApi.
-    Returns a clean text transcript.
+    The video has no usable captions (disabled, none listed, unavailable).
     """
 
-    try:
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=['en'])
 
-        # Merge all transcript chunks into single string
-        transcript_text = " ".join([entry["text"] for entry in transcript_list])
+class YouTubeCaptionsClient:
+    """
+    Thin adapter over youtube_transcript_api: list(video_id) returns the
+    library's TranscriptList and its "no captions" errors become
+    NoCaptionsError. Tests pass a fake with the same shape.
+    """
+
+    def __init__(self):
+        # Imported here so the provider (and its tests) load without it
+        from youtube_transcript_api import YouTubeTranscriptApi
+        self._api = YouTubeTranscriptApi()
+
+    def list(self, video_id: str):
+        from youtube_transcript_api import (
+            NoTranscriptFound,
+            TranscriptsDisabled,
+            VideoUnavailable
+        )
+
+        try:
+            return self._api.list(video_id)
+        except (NoTranscriptFound, TranscriptsDisabled, VideoUnavailable) as e:
+            raise NoCaptionsError(str(e)) from e
+
+
+def _matches(language_code: str, language: str) -> bool:
+    # "en" accepts "en-US" / "en-GB"
+    return language_code == language or language_code.startswith(language + "-")
+
+
+def choose_transcript(transcripts, languages=TRANSCRIPT_LANGUAGES):
+    """
+    Returns (transcript, kind) in order of preference:
+    manual captions in `languages`, auto-generated ones, then any
+    translatable track translated to languages[0]. None if nothing fits.
+    """
+    transcripts = list(transcripts)
+
+    for generated, kind in ((False, "manual"), (True, "generated")):
+        for language in languages:
+            for t in transcripts:
+                if t.is_generated == generated and _matches(t.language_code, language):
+                    return t, kind
+
+    for t in transcripts:
+        if not t.is_translatable:
+            continue
+        try:
+            return t.translate(languages[0]), "translated"
+        except Exception:
+            continue   # target language not offered for this track
+
+    return None
+
+
+def _to_transcript(snippets, language: str, kind: str) -> dict:
+    segments = []
+    for s in snippets:
+        text = s.text.replace("\n", " ").strip()
+        if text:
+            segments.append({
+                "start": round(s.start, 2),
+                "end": round(s.start + s.duration, 2),
+                "text": text
+            })
+
+    return {
+        "text": " ".join(seg["text"] for seg in segments),
+        "segments": segments,
+        "language": language,
+        "kind": kind
+    }
+
+
+class TranscriptProvider:
+    """
+    - client: object with list(video_id) (YouTubeCaptionsClient by default)
+    - store: SqliteCache holding {"stored_at", "transcript"} or None for memory only
+    - ttl / negative_ttl: seconds a transcript / a "no captions" answer is served
+    - memory_entries: size of the in-process LRU
+    """
+
+    def __init__(
+        self,
+        client=None,
+        store: SqliteCache = None,
+        languages=TRANSCRIPT_LANGUAGES,
+        ttl: int = TRANSCRIPT_CACHE_TTL,
+        negative_ttl: int = TRANSCRIPT_NEGATIVE_TTL,
+        memory_entries: int = TRANSCRIPT_MEMORY_ENTRIES
+    ):
+        self._client = client
+        self.store = store
+        self.languages = list(languages)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory_entries = memory_entries
+
+        self._memory = OrderedDict()   # key -> (stored_at, transcript)
+        self._inflight = {}            # key -> Future of the fetch in progress
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "negative_hits": 0, "coalesced": 0, "fetches": 0, "errors": 0}
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = YouTubeCaptionsClient()
+        return self._client
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
 
-        # Clean line breaks and extra spaces
-        transcript_text = transcript_text.replace("\n", " ").strip()
+    def _key(self, video_id):
+        # The chosen track depends on the language preference
+        return f"{video_id}:{','.join(self.languages)}"
 
-        return transcript_text
+    def _fresh(self, entry):
+        if entry is None:
+            return None
+        ttl = self.ttl if entry[1] is not None else self.negative_ttl
+        return entry if time.time() - entry[0] <= ttl else None
 
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _cached(self, key):
+        """
+        Fresh (stored_at, transcript), memory first; transcript is None
+        for a cached "no captions".
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+
+        if entry is None and self.store is not None:
+            stored = self.store.get(key)
+            if stored is not None:
+                entry = (stored["stored_at"], stored["transcript"])
+                self._remember(key, entry)
+
+        return self._fresh(entry)
+
+    def _store(self, key, transcript):
+        stored_at = time.time()
+        self._remember(key, (stored_at, transcript))
+        if self.store is not None:
+            self.store.put(key, {"stored_at": stored_at, "transcript": transcript})
+
+    def _download(self, video_id):
+        self._count("fetches")
+        try:
+            chosen = choose_transcript(self.client.list(video_id), self.languages)
+            if chosen is None:
+                return None
+            track, kind = chosen
+            transcript = _to_transcript(track.fetch(), track.language_code, kind)
+            return transcript if transcript["segments"] else None
+        except NoCaptionsError:
+            return None
+        except Exception:
+            self._count("errors")
+            raise
+
+    def fetch(self, video_id: str):
+        """
+        {"text", "segments": [{"start", "end", "text"}], "language", "kind"}
+        or None when the video has no usable captions. Network errors
+        propagate to every waiting caller (and are not cached).
+        """
+        key = self._key(video_id)
+
+        entry = self._cached(key)
+        if entry is None:
+            with self._lock:
+                # Re-checked under the lock: a fetch may have just finished
+                entry = self._fresh(self._memory.get(key))
+                future = self._inflight.get(key)
+                leader = entry is None and future is None
+                if leader:
+                    future = self._inflight[key] = Future()
+
+        if entry is not None:
+            self._count("hits" if entry[1] is not None else "negative_hits")
+            return entry[1]
+
+        if not leader:
+            self._count("coalesced")
+            return future.result()
+
+        try:
+            transcript = self._download(video_id)
+            self._store(key, transcript)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(transcript)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+        return transcript
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            **counts,
+            "entries": self.store.stats()["entries"] if self.store else len(self._memory),
+            "languages": self.languages
+        }
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_transcript_provider() -> TranscriptProvider:
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            store = SqliteCache(
+                TRANSCRIPT_CACHE_PATH, TRANSCRIPT_CACHE_MAX_ENTRIES, namespace="transcripts"
+            ) if TRANSCRIPT_CACHE_ENABLED else None
+            _provider = TranscriptProvider(store=store)
+    return _provider
+
+
+def has_youtube_transcript(video_id: str) -> bool:
+    """
+    Whether usable captions exist. The fetched transcript stays cached
+    for the transcript stage; errors count as "no" (Whisper fallback).
+    """
+    try:
+        return get_transcript_provider().fetch(video_id) is not None
+    except Exception as e:
+        logger.warning(f"Caption lookup failed for {video_id}: {e}")
+        return False
+
+
+def get_youtube_transcript(video_id: str) -> dict:
+    """
+    Returns {"text": ..., "segments": [{"start", "end", "text"}, ...]}
+    (plus "language" / "kind") from the provider, normally a cache hit.
+    """
+    try:
+        transcript = get_transcript_provider().fetch(video_id)
     except Exception as e:
         raise Exception(f"Failed to fetch YouTube transcript: {str(e)}")
+
+    if transcript is None:
+        raise Exception(f"Failed to fetch YouTube transcript: no captions for {video_id}")
+
+    return transcript
@@ -1,25 +1,151 @@
+import os
+
 # ------------------------------
 # Video / OCR
 # ------------------------------
 FRAME_EXTRACTION_RATE = 1  # frames per second
+FRAME_QUEUE_SIZE = 8       # decoded frames buffered between extractor and OCR
+FRAME_SAMPLER = os.getenv("FRAME_SAMPLER", "adaptive")  # adaptive / ffmpeg / sequential / keyframes
+ADAPTIVE_ANALYSIS_FPS = float(os.getenv("ADAPTIVE_ANALYSIS_FPS", "2"))     # frames/sec scored for change
+SCENE_CHANGE_THRESHOLD = float(os.getenv("SCENE_CHANGE_THRESHOLD", "0.005"))  # fraction of pixels changed
+ADAPTIVE_MAX_GAP = float(os.getenv("ADAPTIVE_MAX_GAP", "10"))               # seconds without a sample
+PHASH_ALGORITHM = os.getenv("PHASH_ALGORITHM", "phash")   # phash / dhash
+PHASH_HAMMING_THRESHOLD = int(os.getenv("PHASH_HAMMING_THRESHOLD", "4"))  # of 64 bits; compression noise is ~0-2
+TEXT_GATE_MIN_DENSITY = float(os.getenv("TEXT_GATE_MIN_DENSITY", "0.004"))  # edge density to attempt OCR
+OCR_BATCH_SIZE = int(os.getenv("OCR_BATCH_SIZE", "8"))                       # frames per PaddleOCR call
+REGION_CHANGE_THRESHOLD = float(os.getenv("REGION_CHANGE_THRESHOLD", "0.05"))  # text box pixels changed before re-OCR
+
+# ------------------------------
+# Media download (yt-dlp)
+# ------------------------------
+DOWNLOAD_MAX_HEIGHT = int(os.getenv("DOWNLOAD_MAX_HEIGHT", "480"))         # OCR never needs more
+DOWNLOAD_AUDIO_MAX_ABR = int(os.getenv("DOWNLOAD_AUDIO_MAX_ABR", "96"))    # kbps; Whisper resamples to 16 kHz
+
+# ------------------------------
+# Uploads
+# ------------------------------
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))            # bytes per read/write
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(2 * 1024 ** 3)))            # 413 above this
+UPLOAD_MAX_DURATION_SEC = float(os.getenv("UPLOAD_MAX_DURATION_SEC", "10800"))       # 413 above this
+
+# ------------------------------
+# Speech-to-text (Whisper)
+# ------------------------------
+WHISPER_MODE = os.getenv("WHISPER_MODE", "pool")   # pool (process per core) / batched (shared model)
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "tiny")   # "tiny" is fastest, "base" is more accurate but larger
+WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE") or None   # e.g. "en"; unset = detect per chunk
+ASR_MAX_BATCH_SIZE = int(os.getenv("ASR_MAX_BATCH_SIZE", "8"))   # batched mode: segments per decode
+ASR_MAX_WAIT_MS = int(os.getenv("ASR_MAX_WAIT_MS", "50"))        # batched mode: max wait to fill a batch
+WHISPER_PROCESSES = int(os.getenv("WHISPER_PROCESSES", str(max(1, (os.cpu_count() or 2) // 2))))
+ASR_CHUNK_SEC = 30.0          # Whisper window
+VAD_ENERGY_MARGIN_DB = 12.0   # above the noise floor
+VAD_NOISE_FLOOR_CAP_DB = -45.0  # dBFS; noise floor never assumed louder than this
+VAD_MIN_SPEECH_SEC = 0.3
+VAD_MAX_GAP_SEC = 0.6         # merge speech regions closer than this
+VAD_PAD_SEC = 0.2
+
+TRANSCRIPT_LANGUAGES = os.getenv("TRANSCRIPT_LANGUAGES", "en").split(",")   # caption preference order
 
 # ------------------------------
 # Paths
 # ------------------------------
 TEMP_DIR = "temp_files"
-FRAMES_DIR = "temp_files/frames"
+
+# ------------------------------
+# Persistent caches
+# ------------------------------
+CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+OCR_CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "1") == "1"
+OCR_CACHE_PATH = os.getenv("OCR_CACHE_PATH", os.path.join(CACHE_DIR, "ocr_cache.sqlite3"))
+OCR_CACHE_MAX_ENTRIES = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "50000"))
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "1") == "1"
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", os.path.join(CACHE_DIR, "results.sqlite3"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "5000"))
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", str(24 * 3600)))   # seconds a finished analysis is reused
+ARTIFACT_STORE_ENABLED = os.getenv("ARTIFACT_STORE_ENABLED", "1") == "1"
+ARTIFACT_STORE_PATH = os.getenv("ARTIFACT_STORE_PATH", os.path.join(CACHE_DIR, "artifacts.sqlite3"))
+ARTIFACT_STORE_MAX_ENTRIES = int(os.getenv("ARTIFACT_STORE_MAX_ENTRIES", "200000"))
+MANIFEST_PATH = os.getenv("MANIFEST_PATH", os.path.join(CACHE_DIR, "manifest.sqlite3"))   # analysed sources (re-score)
+TRANSCRIPT_CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE_ENABLED", "1") == "1"
+TRANSCRIPT_CACHE_PATH = os.getenv("TRANSCRIPT_CACHE_PATH", os.path.join(CACHE_DIR, "transcripts.sqlite3"))
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", "20000"))
+TRANSCRIPT_MEMORY_ENTRIES = int(os.getenv("TRANSCRIPT_MEMORY_ENTRIES", "256"))           # in-process LRU, also with the cache off
+TRANSCRIPT_CACHE_TTL = int(os.getenv("TRANSCRIPT_CACHE_TTL", str(7 * 24 * 3600)))   # seconds captions are reused
+TRANSCRIPT_NEGATIVE_TTL = int(os.getenv("TRANSCRIPT_NEGATIVE_TTL", "3600"))         # seconds "no captions" is reused
 
 # ------------------------------
 # NLP thresholds
 # ------------------------------
-EMOTION_CONFIDENCE_THRESHOLD = 0.75
+EMOTION_CONFIDENCE_THRESHOLD = 0.75   # anger / fear / disgust above this: manipulative
+EMOTIONAL_TONE_THRESHOLD = 0.85       # any emotion above this: emotional tone
 TOXICITY_THRESHOLD = 0.80
 POLITICAL_BIAS_THRESHOLD = 0.75
 SUBJECTIVITY_THRESHOLD = 0.75
 
+# ------------------------------
+# Sentence triage (which sentences reach the remote models)
+# ------------------------------
+TRIAGE_ENABLED = os.getenv("TRIAGE_ENABLED", "1") == "1"               # 0: old keyword rule
+TRIAGE_MODEL_PATH = os.getenv("TRIAGE_MODEL_PATH", os.path.join(CACHE_DIR, "triage_model.npz"))  # keyword seed model when missing
+TRIAGE_RECALL_TARGET = float(os.getenv("TRIAGE_RECALL_TARGET", "0.95"))  # threshold calibration (training)
+TRIAGE_BUDGET = int(os.getenv("TRIAGE_BUDGET", "200"))                  # sentences per video sent for inference
+TRIAGE_MIN_WORDS = int(os.getenv("TRIAGE_MIN_WORDS", "6"))              # shorter sentences are never sent
+
 # ------------------------------
 # Scoring weights
 # ------------------------------
 MISINFO_PENALTY = 20
 UNCERTAIN_PENALTY = 5
 BIAS_MAX_SCORE = 100
+
+# ------------------------------
+# Hugging Face inference client
+# ------------------------------
+HF_ROUTER_URL = os.getenv("HF_ROUTER_URL", "https://router.huggingface.co/hf-inference/models")
+HF_TIMEOUT = float(os.getenv("HF_TIMEOUT", "60"))                        # seconds per request
+HF_POOL_SIZE = int(os.getenv("HF_POOL_SIZE", "16"))                      # keep-alive connections
+HF_MAX_CONCURRENCY = int(os.getenv("HF_MAX_CONCURRENCY", "16"))          # requests in flight, all models
+HF_MODEL_CONCURRENCY = int(os.getenv("HF_MODEL_CONCURRENCY", "4"))       # requests in flight per model
+HF_BATCH_SIZE = int(os.getenv("HF_BATCH_SIZE", "16"))                    # sentences per batched request
+HF_MAX_RETRIES = int(os.getenv("HF_MAX_RETRIES", "4"))                   # on 429 / 5xx / connection errors
+HF_BACKOFF_BASE = float(os.getenv("HF_BACKOFF_BASE", "0.5"))             # seconds, doubled per retry
+HF_BACKOFF_MAX = float(os.getenv("HF_BACKOFF_MAX", "30"))                # cap, also for Retry-After
+HF_BREAKER_THRESHOLD = int(os.getenv("HF_BREAKER_THRESHOLD", "5"))       # failed calls before a model's circuit opens
+HF_BREAKER_COOLDOWN = float(os.getenv("HF_BREAKER_COOLDOWN", "30"))      # seconds before a trial call
+
+# ------------------------------
+# Sentence / claim inference backend
+# ------------------------------
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "remote")   # remote (HF router) / onnx (in-process) / stub
+INFERENCE_ONNX_DIR = os.getenv("INFERENCE_ONNX_DIR", "onnx_models")                # one exported model per dir
+INFERENCE_ONNX_QUANTIZE = os.getenv("INFERENCE_ONNX_QUANTIZE", "0") == "1"        # dynamic int8 weights
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", str(os.cpu_count() or 2)))  # onnx: batches run at once
+INFERENCE_CACHE_ENABLED = os.getenv("INFERENCE_CACHE_ENABLED", "1") == "1"
+INFERENCE_CACHE_PATH = os.getenv("INFERENCE_CACHE_PATH", os.path.join(CACHE_DIR, "inference.sqlite3"))
+INFERENCE_CACHE_MAX_ENTRIES = int(os.getenv("INFERENCE_CACHE_MAX_ENTRIES", "500000"))     # persistent tier
+INFERENCE_CACHE_MEMORY_ENTRIES = int(os.getenv("INFERENCE_CACHE_MEMORY_ENTRIES", "20000"))  # in-process LRU
+INFERENCE_CACHE_TTL = int(os.getenv("INFERENCE_CACHE_TTL", str(30 * 24 * 3600)))          # seconds an answer is reused
+
+# ------------------------------
+# Job queue (async /jobs API)
+# ------------------------------
+JOB_WORKER_COUNT = int(os.getenv("JOB_WORKER_COUNT", "2"))      # pipelines running at once
+JOB_QUEUE_MAX_SIZE = int(os.getenv("JOB_QUEUE_MAX_SIZE", "20"))  # pending jobs before 503
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "3600"))        # seconds to keep finished jobs
+
+# ------------------------------
+# Blocking-stage executors (max concurrent calls per process)
+# ------------------------------
+EXECUTOR_LIMITS = {
+    "download": int(os.getenv("DOWNLOAD_CONCURRENCY", "4")),   # yt-dlp
+    "whisper": int(os.getenv("WHISPER_CONCURRENCY", "2")),     # transcriptions feeding the Whisper pool
+    "ocr": int(os.getenv("OCR_CONCURRENCY", "1")),             # PaddleOCR is not thread-safe
+    "nlp": int(os.getenv("NLP_CONCURRENCY", "2")),             # spaCy
+    "http": int(os.getenv("HTTP_CONCURRENCY", "8")),           # HF / Wikipedia / YouTube calls
+    "io": int(os.getenv("IO_CONCURRENCY", "4")),               # local file writes
+}
+
+# ------------------------------
+# Model loading
+# ------------------------------
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "1") == "1"   # load models in the background at startup
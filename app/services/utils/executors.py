@@ -0,0 +1,51 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.utils.constants import EXECUTOR_LIMITS
+
+# =====================================================
+# DEDICATED EXECUTORS
+# =====================================================
+# One thread pool per kind of blocking work. The pool size is the stage's
+# concurrency limit for the whole process, so a burst of jobs queues up
+# behind e.g. the single Whisper slot instead of freezing the event loop.
+# Whisper / PaddleOCR / OpenCV / ffmpeg release the GIL in native code,
+# so the pools still use separate cores.
+
+_executors = {
+    name: ThreadPoolExecutor(max_workers=limit, thread_name_prefix=name)
+    for name, limit in EXECUTOR_LIMITS.items()
+}
+
+
+async def run_blocking(executor: str, fn, *args, **kwargs):
+    """
+    Run a blocking call on the named executor without blocking the loop.
+    """
+    if executor not in _executors:
+        raise ValueError(f"Unknown executor '{executor}'")
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executors[executor],
+        functools.partial(fn, *args, **kwargs)
+    )
+
+
+def executor_stats() -> dict:
+    """
+    Busy / queued work per executor (for monitoring).
+    """
+    return {
+        name: {
+            "limit": pool._max_workers,
+            "queued": pool._work_queue.qsize()
+        }
+        for name, pool in _executors.items()
+    }
+
+
+def shutdown_executors():
+    for pool in _executors.values():
+        pool.shutdown(wait=False, cancel_futures=True)
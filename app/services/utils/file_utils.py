@@ -1,7 +1,7 @@
 import os
 import shutil
 
-TEMP_DIR = "temp_files"
+from app.services.utils.constants import TEMP_DIR
 
 
 def ensure_temp_dirs():
@@ -9,14 +9,20 @@ def ensure_temp_dirs():
     Ensure required temp directories exist.
     """
     os.makedirs(TEMP_DIR, exist_ok=True)
-    os.makedirs(os.path.join(TEMP_DIR, "frames"), exist_ok=True)
 
 
-def cleanup_temp_files():
+def cleanup_temp_files(workspace=None):
     """
-    Delete all temporary files and folders inside temp_files/.
-    Called after pipeline execution.
+    Delete temporary files after pipeline execution.
+
+    - workspace: only that request's workspace is removed
+    - None: wipe everything inside temp_files/ (maintenance only —
+      never call this while pipelines are running)
     """
+    if workspace is not None:
+        workspace.cleanup()
+        return
+
     if not os.path.exists(TEMP_DIR):
         return
 
@@ -0,0 +1,106 @@
+import threading
+import time
+
+from app.services.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ModelRegistry:
+    """
+    Lazily loaded, shared models (Whisper, PaddleOCR, spaCy, ...).
+
+    Modules register a loader at import time — nothing heavy is loaded
+    then. The model is built on first get() (or by warm_up() in the
+    background at startup) and its state / load time is reported for the
+    readiness probe.
+    """
+
+    def __init__(self):
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader, warm: bool = True):
+        """
+        - loader: zero-arg callable returning the model
+        - warm: load during warm_up() and require it for readiness
+        """
+        with self._lock:
+            if name in self._models:
+                return
+            self._models[name] = {
+                "loader": loader,
+                "warm": warm,
+                "model": None,
+                "state": "not_loaded",   # not_loaded / loading / ready / failed
+                "load_seconds": None,
+                "error": None,
+                "lock": threading.Lock()
+            }
+
+    def get(self, name: str):
+        entry = self._models.get(name)
+        if entry is None:
+            raise KeyError(f"Model '{name}' is not registered")
+
+        if entry["state"] == "ready":
+            return entry["model"]
+
+        with entry["lock"]:
+            if entry["state"] != "ready":
+                self._load(name, entry)
+
+        return entry["model"]
+
+    def _load(self, name, entry):
+        entry["state"] = "loading"
+        start = time.perf_counter()
+
+        try:
+            entry["model"] = entry["loader"]()
+        except Exception as e:
+            entry["state"] = "failed"
+            entry["error"] = str(e)
+            logger.warning(f"Model '{name}' failed to load: {e}")
+            raise
+
+        entry["load_seconds"] = round(time.perf_counter() - start, 2)
+        entry["error"] = None
+        entry["state"] = "ready"
+        logger.info(f"Model '{name}' loaded in {entry['load_seconds']}s")
+
+    def warm_up(self) -> threading.Thread:
+        """
+        Load every warm model on a background thread; returns the thread.
+        """
+        def run():
+            for name, entry in list(self._models.items()):
+                if entry["warm"] and entry["state"] != "ready":
+                    try:
+                        self.get(name)
+                    except Exception:
+                        pass   # state + error are recorded for /health/ready
+
+        thread = threading.Thread(target=run, name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def status(self) -> dict:
+        return {
+            name: {
+                "state": entry["state"] if entry["warm"] or entry["state"] != "not_loaded" else "lazy",
+                "load_seconds": entry["load_seconds"],
+                "error": entry["error"]
+            }
+            for name, entry in self._models.items()
+        }
+
+    def ready(self) -> bool:
+        return all(
+            entry["state"] == "ready"
+            for entry in self._models.values()
+            if entry["warm"]
+        )
+
+
+registry = ModelRegistry()
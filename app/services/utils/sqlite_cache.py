@@ -0,0 +1,197 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# =====================================================
+# DISK-BACKED LRU CACHE (SQLite)
+# =====================================================
+# One file shared by every worker process on the node. WAL mode lets
+# readers and a writer work at the same time, and busy_timeout makes
+# concurrent writers wait instead of failing. Each thread gets its own
+# connection (sqlite3 connections must not be shared across threads), and
+# a forked child reopens instead of reusing its parent's connection.
+#
+# A lookup is a plain read, so readers never take the writer lock. Hit /
+# miss counts and access times are buffered per process and written in
+# one statement batch every `flush_every` lookups, with the next put, or
+# on stats() / flush(). Counts of lookups after the last flush of an
+# exiting process are lost (the counters are approximate).
+
+
+class SqliteCache:
+    """
+    Key → JSON value store with size-bounded LRU eviction and hit/miss
+    counters persisted next to the data.
+
+    - path: SQLite file (created on first use)
+    - max_entries: entries kept; the least recently used are evicted
+    - namespace: separates counters when several caches share a file
+    - flush_every: lookups buffered before counters / access times are written
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 50000,
+        namespace: str = "default",
+        flush_every: int = 256
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.flush_every = flush_every
+
+        # Rows are only counted every this many puts (the count is a scan)
+        self._evict_every = max(1, max_entries // 100)
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending = {"pid": None}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters ("
+                " namespace TEXT PRIMARY KEY,"
+                " hits INTEGER NOT NULL DEFAULT 0,"
+                " misses INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO counters (namespace) VALUES (?)",
+                (self.namespace,)
+            )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            # The parent's handle (and its locks) must not be used after fork
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _buffer(self) -> dict:
+        # Under self._lock. A forked child starts empty: what it inherited
+        # is its parent's to write
+        if self._pending["pid"] != os.getpid():
+            self._pending = {"pid": os.getpid(), "hits": 0, "misses": 0, "touched": {}, "puts": 0}
+        return self._pending
+
+    def get(self, key: str):
+        row = self._conn().execute(
+            "SELECT value FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+
+        with self._lock:
+            buffer = self._buffer()
+            if row is None:
+                buffer["misses"] += 1
+            else:
+                buffer["hits"] += 1
+                buffer["touched"][key] = time.time()
+            due = buffer["hits"] + buffer["misses"] >= self.flush_every
+
+        if due:
+            self.flush()
+
+        return None if row is None else json.loads(row[0])
+
+    def _write_buffer(self, conn):
+        with self._lock:
+            buffer = self._buffer()
+            hits, misses, touched = buffer["hits"], buffer["misses"], buffer["touched"]
+            buffer.update(hits=0, misses=0, touched={})
+
+        if hits or misses:
+            conn.execute(
+                "UPDATE counters SET hits = hits + ?, misses = misses + ? WHERE namespace = ?",
+                (hits, misses, self.namespace)
+            )
+        if touched:
+            conn.executemany(
+                "UPDATE entries SET last_access = ? WHERE key = ? AND last_access < ?",
+                [(at, key, at) for key, at in touched.items()]
+            )
+
+    def flush(self):
+        """
+        Writes the buffered hit / miss counts and access times.
+        """
+        conn = self._conn()
+        with conn:
+            self._write_buffer(conn)
+
+    def put(self, key: str, value):
+        conn = self._conn()
+        with conn:
+            # Access times first, so eviction sees recent reads
+            self._write_buffer(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, last_access) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+
+            with self._lock:
+                buffer = self._buffer()
+                check = buffer["puts"] % self._evict_every == 0
+                buffer["puts"] += 1
+            if check:
+                self._evict(conn)
+
+    def keys(self) -> list:
+        """
+        All stored keys, most recently used first (no counters touched).
+        """
+        rows = self._conn().execute(
+            "SELECT key FROM entries ORDER BY last_access DESC"
+        ).fetchall()
+        return [key for (key,) in rows]
+
+    def _evict(self, conn):
+        (count,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        # Evict a little extra: inserts keep arriving between checks
+        overflow += max(self._evict_every, self.max_entries // 20)
+        conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            " SELECT key FROM entries ORDER BY last_access ASC LIMIT ?)",
+            (overflow,)
+        )
+
+    def stats(self) -> dict:
+        self.flush()
+        conn = self._conn()
+        (entries,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        hits, misses = conn.execute(
+            "SELECT hits, misses FROM counters WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        lookups = hits + misses
+
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+        }
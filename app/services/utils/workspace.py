@@ -0,0 +1,48 @@
+import os
+import shutil
+import uuid
+
+from app.services.utils.constants import TEMP_DIR
+
+
+class Workspace:
+    """
+    Request-scoped temp directory: temp_files/<workspace_id>/
+
+    Every pipeline run gets its own workspace, so concurrent runs never
+    share video/audio/frame paths, and cleanup only touches this run.
+    """
+
+    def __init__(self, root: str = TEMP_DIR, workspace_id: str = None):
+        self.id = workspace_id or uuid.uuid4().hex
+        self.path = os.path.join(root, self.id)
+        os.makedirs(self.path, exist_ok=True)
+
+    def file(self, name: str) -> str:
+        """
+        Path for a file inside the workspace (not created).
+        """
+        return os.path.join(self.path, os.path.basename(name))
+
+    def subdir(self, name: str) -> str:
+        """
+        Create (if needed) and return a sub-directory of the workspace.
+        """
+        path = os.path.join(self.path, os.path.basename(name))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def cleanup(self):
+        """
+        Delete this workspace only.
+        """
+        try:
+            shutil.rmtree(self.path, ignore_errors=True)
+        except Exception as e:
+            print(f"[WARN] Workspace cleanup failed ({self.id}): {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
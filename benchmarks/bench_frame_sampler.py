@@ -0,0 +1,116 @@
+"""
+Frame sampler benchmark.
+
+Compares the decode-once samplers in app/services/ocr/frame_sampler.py
+against the old per-sample seeking loop on synthetic videos with
+different codecs and resolutions.
+
+Usage:
+    python -m benchmarks.bench_frame_sampler [--duration 60] [--interval 3]
+
+Requires the ffmpeg binary on PATH.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import ffmpeg
+
+from app.services.ocr.frame_sampler import sample_frames, SAMPLERS
+
+CODECS = {
+    "h264": {"vcodec": "libx264", "g": 250, "ext": "mp4"},
+    "mpeg4": {"vcodec": "mpeg4", "g": 250, "ext": "mp4"},
+    "vp9": {"vcodec": "libvpx-vp9", "g": 250, "ext": "webm", "deadline": "realtime"},
+    "mjpeg": {"vcodec": "mjpeg", "ext": "avi"},
+}
+
+RESOLUTIONS = ["640x360", "1280x720", "1920x1080"]
+
+
+def make_video(path, codec, size, duration, fps=30):
+    opts = {k: v for k, v in CODECS[codec].items() if k != "ext"}
+    (
+        ffmpeg
+        .input(f"testsrc2=size={size}:rate={fps}", f="lavfi", t=duration)
+        .output(path, pix_fmt="yuv420p" if codec != "mjpeg" else "yuvj420p", **opts)
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+
+def seek_sampler(video_path, interval, resize_width):
+    """
+    The previous extract_frames loop: seek to every sampled frame.
+    """
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25
+    frame_step = int(fps * interval)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    current_frame = 0
+
+    while current_frame < total_frames:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, current_frame)
+        success, frame = cap.read()
+        if not success:
+            break
+
+        h, w = frame.shape[:2]
+        if w > resize_width:
+            scale = resize_width / w
+            frame = cv2.resize(frame, (resize_width, int(h * scale)))
+
+        yield current_frame / fps, frame
+        current_frame += frame_step
+
+    cap.release()
+
+
+def time_sampler(frames):
+    start = time.perf_counter()
+    count = sum(1 for _ in frames)
+    return time.perf_counter() - start, count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=int, default=60)
+    parser.add_argument("--interval", type=float, default=3)
+    parser.add_argument("--resize-width", type=int, default=960)
+    parser.add_argument("--codecs", default=",".join(CODECS))
+    parser.add_argument("--resolutions", default=",".join(RESOLUTIONS))
+    args = parser.parse_args()
+
+    samplers = ("seek",) + SAMPLERS
+
+    print(f"{'codec':<7} {'size':<10} " + " ".join(f"{s:>16}" for s in samplers))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec in args.codecs.split(","):
+            for size in args.resolutions.split(","):
+                path = os.path.join(tmp, f"{codec}_{size}.{CODECS[codec]['ext']}")
+
+                try:
+                    make_video(path, codec, size, args.duration)
+                except ffmpeg.Error:
+                    print(f"{codec:<7} {size:<10} (encoder not available)")
+                    continue
+
+                cells = []
+                for sampler in samplers:
+                    if sampler == "seek":
+                        frames = seek_sampler(path, args.interval, args.resize_width)
+                    else:
+                        frames = sample_frames(path, args.interval, args.resize_width, sampler)
+
+                    seconds, count = time_sampler(frames)
+                    cells.append(f"{seconds:7.2f}s ({count:3d}f)")
+
+                print(f"{codec:<7} {size:<10} " + " ".join(f"{c:>16}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
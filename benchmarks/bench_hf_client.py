@@ -0,0 +1,73 @@
+"""
+Hugging Face client benchmark.
+
+Sends the same batch of sentence classifications to the local HF
+stand-in (benchmarks/hf_stub_server.py) twice: once the old way, one
+bare requests.post per call (new connection each time), and once
+through the shared pooled client. Reports wall time and connections
+opened.
+
+Usage:
+    python -m benchmarks.bench_hf_client [--calls 200] [--latency 0.05] [--threads 8]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from app.services.nlp.hf_client import HFInferenceClient
+from benchmarks.hf_stub_server import HFStub
+
+MODEL = "j-hartmann/emotion-english-distilroberta-base"
+
+
+def bare_requests(url, payloads, threads):
+    def call(payload):
+        response = requests.post(
+            f"{url}/{MODEL}",
+            headers={"Authorization": "Bearer bench"},
+            json=payload,
+            timeout=60
+        )
+        response.raise_for_status()
+        return response.json()
+
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(call, payloads))
+
+
+def pooled_client(url, payloads, threads):
+    client = HFInferenceClient(base_url=url, token="bench", max_concurrency=threads, pool_size=threads)
+    try:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(lambda p: client.infer_sync(MODEL, p), payloads))
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    payloads = [{"inputs": f"benchmark sentence number {i}"} for i in range(args.calls)]
+
+    print(f"{'client':<16}{'seconds':>10}{'calls/s':>10}{'connections':>13}")
+    for name, fn in (("requests.post", bare_requests), ("pooled client", pooled_client)):
+        stub = HFStub(latency=args.latency).start()
+        try:
+            start = time.perf_counter()
+            fn(stub.url, payloads, args.threads)
+            seconds = time.perf_counter() - start
+        finally:
+            stub.stop()
+
+        print(f"{name:<16}{seconds:>10.2f}{args.calls / seconds:>10.1f}{len(stub.connections):>13}")
+
+
+if __name__ == "__main__":
+    main()
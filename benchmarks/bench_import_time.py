@@ -0,0 +1,65 @@
+"""
+Import-time benchmark.
+
+Measures how long `import app.main` takes in a fresh interpreter (the
+cold-start cost before uvicorn can accept requests) and lists the
+slowest modules from `python -X importtime`.
+
+Usage:
+    python -m benchmarks.bench_import_time [--runs 5] [--top 15]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+def time_import(module):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+    return time.perf_counter() - start
+
+
+def slowest_modules(module, top):
+    """
+    Parse `-X importtime` (microseconds, cumulative incl. sub-imports).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # Baseline: interpreter start-up alone
+    base = [time_import("sys") for _ in range(args.runs)]
+    runs = [time_import(args.module) for _ in range(args.runs)]
+
+    print(f"interpreter start-up : {statistics.median(base):.3f}s (median of {args.runs})")
+    print(f"import {args.module:<14}: {statistics.median(runs):.3f}s "
+          f"(min {min(runs):.3f}s, max {max(runs):.3f}s)")
+
+    print(f"\n{'cumulative':>12} {'self':>10}  module")
+    for cumulative, self_us, name in slowest_modules(args.module, args.top):
+        print(f"{cumulative / 1e6:11.3f}s {self_us / 1e6:9.3f}s  {name}")
+
+
+if __name__ == "__main__":
+    main()
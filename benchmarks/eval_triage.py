@@ -0,0 +1,176 @@
+"""
+Offline harness for the sentence triage model (app/services/nlp/triage.py).
+
+Sentences are preprocessed sentences as analyze_bias receives them, one
+JSON object per line: {"text": ..., "video": optional id}. A labelled
+file adds "label": 1 when the sentence would change the bias report
+(any sentence_flags() flag), 0 otherwise.
+
+    # 1. Teacher labels from the configured inference backend (remote by default)
+    python -m benchmarks.eval_triage label --input sentences.jsonl --output labelled.jsonl
+
+    # 2. Train, calibrating the threshold on a held-out split; saved to
+    #    TRIAGE_MODEL_PATH (cache/triage_model.npz), where the API loads it
+    python -m benchmarks.eval_triage train --data labelled.jsonl --recall 0.95
+
+    # 3. Calls saved against recall lost (keyword rule vs model)
+    python -m benchmarks.eval_triage evaluate --data labelled.jsonl [--model cache/triage_model.npz]
+
+Each sentence sent costs two remote calls (emotion + MNLI).
+"""
+
+import argparse
+import json
+import random
+from collections import defaultdict
+
+import numpy as np
+
+from app.services.nlp.bias_detection import classify_sentences, is_candidate_sentence, sentence_flags
+from app.services.nlp.triage import TriageModel, select_sentences, threshold_for_recall, train
+from app.services.utils.constants import TRIAGE_BUDGET, TRIAGE_MODEL_PATH, TRIAGE_RECALL_TARGET
+
+CALLS_PER_SENTENCE = 2
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_jsonl(path, rows):
+    with open(path, "w") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+# =====================================================
+# LABEL
+# =====================================================
+
+def label(args):
+    rows = read_jsonl(args.input)
+    results = classify_sentences([row["text"] for row in rows])
+
+    labelled = [
+        dict(row, label=int(any(sentence_flags(result).values())))
+        for row, result in zip(rows, results)
+        if result is not None
+    ]
+    write_jsonl(args.output, labelled)
+
+    positives = sum(row["label"] for row in labelled)
+    print(f"{len(labelled)} labelled ({len(rows) - len(labelled)} failed), {positives} positive")
+
+
+# =====================================================
+# TRAIN
+# =====================================================
+
+def _split_by_video(rows, holdout, seed):
+    """
+    Held-out split by video (sentences of one video stay together).
+    """
+    videos = sorted({row.get("video", i) for i, row in enumerate(rows)}, key=str)
+    random.Random(seed).shuffle(videos)
+    held = set(videos[:max(1, int(len(videos) * holdout))])
+
+    train_rows, held_rows = [], []
+    for i, row in enumerate(rows):
+        (held_rows if row.get("video", i) in held else train_rows).append(row)
+    return train_rows, held_rows
+
+
+def train_model(args):
+    rows = read_jsonl(args.data)
+    train_rows, held_rows = _split_by_video(rows, args.holdout, args.seed)
+
+    model = train(
+        [r["text"] for r in train_rows],
+        [r["label"] for r in train_rows],
+        recall_target=args.recall,
+        calibration=([r["text"] for r in held_rows], [r["label"] for r in held_rows])
+    )
+    model.save(args.output)
+
+    print(f"trained on {len(train_rows)}, calibrated on {len(held_rows)}; threshold {model.threshold:.3f}")
+    print(f"saved to {args.output}")
+
+
+# =====================================================
+# EVALUATE
+# =====================================================
+
+def _report(name, selected, labels):
+    selected = np.asarray(selected, dtype=bool)
+    positives = labels.sum()
+    recall = (selected & (labels == 1)).sum() / positives if positives else 1.0
+    saved = 1 - selected.sum() / len(labels)
+
+    print(
+        f"{name:<28}{int(selected.sum()) * CALLS_PER_SENTENCE:>8}"
+        f"{saved:>10.1%}{recall:>9.1%}{1 - recall:>13.1%}"
+    )
+
+
+def evaluate(args):
+    rows = read_jsonl(args.data)
+    texts = [row["text"] for row in rows]
+    labels = np.array([row["label"] for row in rows])
+
+    model = TriageModel.load(args.model) if args.model else TriageModel.seed()
+    scores = model.scores(texts)
+
+    print(f"{len(rows)} sentences, {int(labels.sum())} positive; sending all = {len(rows) * CALLS_PER_SENTENCE} calls\n")
+    print(f"{'selector':<28}{'calls':>8}{'saved':>10}{'recall':>9}{'recall lost':>13}")
+
+    _report("keyword rule", [is_candidate_sentence(t) for t in texts], labels)
+    _report(f"model ({model.name})", scores >= model.threshold, labels)
+
+    # Per-video selection as in production (min words + budget)
+    by_video = defaultdict(list)
+    for i, row in enumerate(rows):
+        by_video[row.get("video", "all")].append(i)
+
+    chosen = np.zeros(len(rows), dtype=bool)
+    for indexes in by_video.values():
+        selected, _ = select_sentences([texts[i] for i in indexes], model, budget=args.budget)
+        chosen[[indexes[i] for i in selected]] = True
+    _report(f"model + budget {args.budget}/video", chosen, labels)
+
+    # Thresholds re-fitted on this data (optimistic: shows the trade-off curve)
+    print()
+    for target in (0.8, 0.9, 0.95, 0.99):
+        threshold = threshold_for_recall(scores, labels, target)
+        _report(f"recall target {target:.0%}", scores >= threshold, labels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("label", help="label sentences with the inference backend")
+    p.add_argument("--input", required=True)
+    p.add_argument("--output", required=True)
+    p.set_defaults(run=label)
+
+    p = commands.add_parser("train", help="train and calibrate a triage model")
+    p.add_argument("--data", required=True)
+    p.add_argument("--recall", type=float, default=TRIAGE_RECALL_TARGET)
+    p.add_argument("--holdout", type=float, default=0.2)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--output", default=TRIAGE_MODEL_PATH)
+    p.set_defaults(run=train_model)
+
+    p = commands.add_parser("evaluate", help="calls saved vs recall lost")
+    p.add_argument("--data", required=True)
+    p.add_argument("--model", help="triage model (.npz); default: keyword seed model")
+    p.add_argument("--budget", type=int, default=TRIAGE_BUDGET)
+    p.set_defaults(run=evaluate)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Local stand-in for the Hugging Face inference router.
+
+Answers POST /<org>/<model> in the shapes the pipeline parses, with
+deterministic scores derived from the input text:
+- text classification ("inputs": str)         -> [[{label, score}, ...]]
+- zero-shot ("parameters.candidate_labels")   -> {sequence, labels, scores}
+- NLI ("inputs": {premise, hypothesis})       -> [{label, score}, ...]
+A list of inputs gets one result per input (batched request).
+
+Latency, transient 429 / 503 answers (with Retry-After) and hard
+failures can be injected to exercise the client's backoff and circuit
+breaker. Used by the test suite and benchmarks/bench_hf_client.py.
+
+Usage:
+    python -m benchmarks.hf_stub_server [--port 8099] [--latency 0.05]
+    HF_ROUTER_URL=http://127.0.0.1:8099 HF_API_TOKEN=x uvicorn app.main:app
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+EMOTIONS = ["anger", "disgust", "fear", "joy", "neutral", "sadness", "surprise"]
+NLI_LABELS = ["ENTAILMENT", "NEUTRAL", "CONTRADICTION"]
+
+
+def _scores(text: str, n: int) -> list:
+    """
+    Deterministic pseudo-probabilities for `text` (sum to 1).
+    """
+    digest = hashlib.sha256(text.encode()).digest()
+    weights = [digest[i] + 1 for i in range(n)]
+    total = sum(weights)
+    return [w / total for w in weights]
+
+
+def _ranked(labels, text):
+    return sorted(
+        ({"label": l, "score": s} for l, s in zip(labels, _scores(text, len(labels)))),
+        key=lambda x: -x["score"]
+    )
+
+
+def classify(inputs, parameters=None):
+    if isinstance(inputs, list):
+        return [classify(item, parameters) for item in inputs]
+
+    if isinstance(inputs, dict):
+        return _ranked(NLI_LABELS, inputs["premise"] + "\x00" + inputs["hypothesis"])
+
+    labels = (parameters or {}).get("candidate_labels")
+    if labels:
+        ranked = _ranked(labels, inputs)
+        return {
+            "sequence": inputs,
+            "labels": [x["label"] for x in ranked],
+            "scores": [x["score"] for x in ranked]
+        }
+
+    return [_ranked(EMOTIONS, inputs)]
+
+
+class HFStub:
+    """
+    - latency: seconds added to every answer
+    - port: 0 picks a free one
+    - fail_next(n, status, retry_after): the next n requests fail
+    """
+
+    def __init__(self, latency: float = 0.0, port: int = 0):
+        self.latency = latency
+        self.requests = []          # (model, payload) per request received
+        self.connections = set()    # client ports seen (keep-alive reuse)
+        self._failures = []
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                stub._handle(self, self.path.lstrip("/"), body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def fail_next(self, n: int, status: int = 503, retry_after=None):
+        with self._lock:
+            self._failures.extend([(status, retry_after)] * n)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handle(self, handler, model, body):
+        payload = json.loads(body or b"{}")
+
+        with self._lock:
+            self.requests.append((model, payload))
+            self.connections.add(handler.client_address[1])
+            failure = self._failures.pop(0) if self._failures else None
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if not handler.headers.get("Authorization", "").startswith("Bearer "):
+            failure = (401, None)
+
+        if failure:
+            status, retry_after = failure
+            data = json.dumps({"error": "injected failure"}).encode()
+            handler.send_response(status)
+            if retry_after is not None:
+                handler.send_header("Retry-After", str(retry_after))
+        else:
+            data = json.dumps(classify(payload.get("inputs"), payload.get("parameters"))).encode()
+            handler.send_response(200)
+
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    stub = HFStub(latency=args.latency, port=args.port)
+
+    print(f"HF stand-in listening on {stub.url} (latency {args.latency}s)")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
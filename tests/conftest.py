@@ -0,0 +1,113 @@
+import functools
+import shutil
+import subprocess
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import pytest
+
+# =====================================================
+# LOCAL HTTP STAND-IN SERVER
+# =====================================================
+# Serves small generated media files (and a DASH manifest with separate
+# audio / video streams) from a temp dir, so download tests never touch
+# the network.
+
+MPD = """<?xml version="1.0" encoding="UTF-8"?>
+<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static"
+     mediaPresentationDuration="PT2S" minBufferTime="PT1S"
+     profiles="urn:mpeg:dash:profile:isoff-on-demand:2011">
+  <Period>
+    <AdaptationSet mimeType="video/mp4">
+      <Representation id="v720" codecs="avc1.64001f" width="1280" height="720" bandwidth="2000000">
+        <BaseURL>{base}/video_720.mp4</BaseURL>
+      </Representation>
+      <Representation id="v360" codecs="avc1.64001e" width="640" height="360" bandwidth="500000">
+        <BaseURL>{base}/video_360.mp4</BaseURL>
+      </Representation>
+    </AdaptationSet>
+    <AdaptationSet mimeType="audio/mp4">
+      <Representation id="a64" codecs="mp4a.40.2" audioSamplingRate="44100" bandwidth="64000">
+        <BaseURL>{base}/audio_64.m4a</BaseURL>
+      </Representation>
+    </AdaptationSet>
+  </Period>
+</MPD>
+"""
+
+
+def _ffmpeg(*args):
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", *args], check=True)
+
+
+def _make_fixtures(root):
+    src = ["-f", "lavfi", "-i", "testsrc2=rate=25:duration=2"]
+    tone = ["-f", "lavfi", "-i", "sine=frequency=440:duration=2"]
+
+    _ffmpeg(*src, *tone, "-s", "640x360", "-c:v", "libx264", "-c:a", "aac", "-shortest",
+            str(root / "clip.mp4"))
+    _ffmpeg(*src, "-s", "1280x720", "-c:v", "libx264", "-an", str(root / "video_720.mp4"))
+    _ffmpeg(*src, "-s", "640x360", "-c:v", "libx264", "-an", str(root / "video_360.mp4"))
+    _ffmpeg(*tone, "-c:a", "aac", "-b:a", "64k", str(root / "audio_64.m4a"))
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="session")
+def http_fixture_server(tmp_path_factory):
+    """
+    Base URL of a local server with clip.mp4 (muxed) and manifest.mpd
+    (720p / 360p video-only + audio-only streams).
+    """
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("ffmpeg binary not available")
+
+    root = tmp_path_factory.mktemp("http_fixtures")
+    _make_fixtures(root)
+
+    handler = functools.partial(_QuietHandler, directory=str(root))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    # Absolute BaseURLs: yt-dlp joins relative ones across representations
+    (root / "manifest.mpd").write_text(MPD.format(base=base))
+
+    yield base
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_clip(tmp_path):
+    """
+    make_clip(name, *lavfi_video_args) -> path of a short H.264 clip
+    generated with ffmpeg (e.g. "color=c=white:size=640x360:duration=4").
+    """
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("ffmpeg binary not available")
+
+    def make(name, source, *filters):
+        path = tmp_path / name
+        vf = ["-vf", ",".join(filters)] if filters else []
+        _ffmpeg("-f", "lavfi", "-i", source, *vf, "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", str(path))
+        return str(path)
+
+    return make
+
+
+@pytest.fixture
+def hf_stub():
+    """
+    Local stand-in for the Hugging Face router (benchmarks/hf_stub_server.py).
+    """
+    from benchmarks.hf_stub_server import HFStub
+
+    stub = HFStub().start()
+    yield stub
+    stub.stop()
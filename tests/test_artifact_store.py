@@ -0,0 +1,71 @@
+import importlib.util
+import re
+
+from app.pipeline.artifact_store import STAGE_CODE, STAGE_CONFIG, ArtifactStore, stage_version
+from app.services.utils import constants
+from app.services.utils.sqlite_cache import SqliteCache
+
+
+def _store(tmp_path):
+    return ArtifactStore(
+        SqliteCache(str(tmp_path / "artifacts.sqlite3")),
+        SqliteCache(str(tmp_path / "manifest.sqlite3"))
+    )
+
+
+def test_memoize_is_content_addressed(tmp_path):
+    store = _store(tmp_path)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ["clean text", ["sentence one"]]
+
+    key = store.key("preprocess", ["transcript", "ocr"])
+    report = {}
+
+    assert store.memoize("preprocess", key, compute, report) == ["clean text", ["sentence one"]]
+    assert report == {"preprocess": "miss"}
+    assert store.memoize("preprocess", key, compute, report) == ["clean text", ["sentence one"]]
+    assert report == {"preprocess": "hit"}
+    assert len(calls) == 1
+
+    assert store.key("preprocess", ["transcript", "other ocr"]) != key
+
+    store.record_source("youtube:abc", "https://youtu.be/abc", {"type": "youtube_no_transcript", "video_path": "x"})
+    assert store.sources() == ["youtube:abc"]
+    assert store.manifest.get("youtube:abc")["input_info"] == {"type": "youtube_no_transcript"}
+
+
+def test_stage_version_tracks_its_own_config(monkeypatch):
+    before = {stage: stage_version(stage) for stage in ("ocr", "transcript", "bias")}
+
+    monkeypatch.setattr(constants, "SCENE_CHANGE_THRESHOLD", 0.5)
+
+    assert stage_version("ocr") != before["ocr"]
+    assert stage_version("transcript") == before["transcript"]
+    assert stage_version("bias") == before["bias"]
+
+
+def test_stage_version_ignores_operational_settings(monkeypatch):
+    before = {stage: stage_version(stage) for stage in ("ocr", "transcript")}
+
+    monkeypatch.setattr(constants, "FRAME_QUEUE_SIZE", 64)
+    monkeypatch.setattr(constants, "ASR_MAX_BATCH_SIZE", 32)
+    assert {stage: stage_version(stage) for stage in before} == before
+
+    monkeypatch.setattr(constants, "WHISPER_MODEL", "base")
+    assert stage_version("transcript") != before["transcript"]
+
+
+def test_stage_config_names_are_read_by_stage_code():
+    # A listed constant no stage module reads only invalidates artifacts
+    for stage, names in STAGE_CONFIG.items():
+        sources = ""
+        for module in STAGE_CODE[stage]:
+            with open(importlib.util.find_spec(module).origin) as f:
+                sources += f.read()
+
+        for name in names:
+            assert hasattr(constants, name)
+            assert re.search(rf"\b{name}\b", sources), f"{stage}: {name} is never read"
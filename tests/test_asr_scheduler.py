@@ -0,0 +1,144 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+whisper = pytest.importorskip("whisper")
+
+from app.services.transcript import asr_scheduler   # noqa: E402
+from app.services.transcript.asr_scheduler import ASRScheduler   # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+class FakeDecoder:
+    """
+    Stands in for whisper.decode: records batches and options, and answers
+    every chunk with the same two timestamped sentences.
+    """
+
+    def __init__(self, monkeypatch, tokenizer, delay=0.0):
+        self.tokenizer = tokenizer
+        self.delay = delay
+        self.batches = []
+        self.options = []
+        self.lock = threading.Lock()
+        monkeypatch.setattr(asr_scheduler.whisper, "decode", self.decode)
+
+    def tokens(self, *parts):
+        """
+        parts: floats become timestamp tokens, strings text tokens.
+        """
+        tokens = []
+        for part in parts:
+            if isinstance(part, str):
+                tokens += self.tokenizer.encode(part)
+            else:
+                tokens.append(self.tokenizer.timestamp_begin + round(part / 0.02))
+        return tokens
+
+    def decode(self, model, mel_batch, options):
+        time.sleep(self.delay)
+        with self.lock:
+            self.batches.append(mel_batch.shape[0])
+            self.options.append(options)
+
+        results = []
+        for _ in mel_batch:
+            tokens = self.tokens(0.0, " Hello there.", 2.4, 2.4, " Hola amigo.", 5.0)
+            results.append(SimpleNamespace(
+                tokens=tokens,
+                text=self.tokenizer.decode(tokens),
+                language="es",
+                no_speech_prob=0.01
+            ))
+        return results
+
+
+def _model():
+    return SimpleNamespace(
+        device=torch.device("cpu"),
+        dims=SimpleNamespace(n_mels=80),
+        is_multilingual=True,
+        num_languages=99
+    )
+
+
+def _chunk(seconds=6.0):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+@pytest.fixture
+def tokenizer():
+    return whisper.tokenizer.get_tokenizer(True, num_languages=99)
+
+
+def test_segments_split_on_timestamps_with_detected_language(monkeypatch, tokenizer):
+    decoder = FakeDecoder(monkeypatch, tokenizer)
+    scheduler = ASRScheduler(_model(), max_batch_size=4, max_wait_ms=10)
+
+    segments = scheduler.submit(_chunk(6.0), offset=30.0).result(timeout=10)
+
+    assert segments == [
+        {"start": 30.0, "end": 32.4, "text": "Hello there."},
+        {"start": 32.4, "end": 35.0, "text": "Hola amigo."},
+    ]
+    assert decoder.options[0].language is None          # detect per segment
+    assert decoder.options[0].without_timestamps is False
+
+
+def test_pinned_language_and_unclosed_text(monkeypatch, tokenizer):
+    decoder = FakeDecoder(monkeypatch, tokenizer)
+    scheduler = ASRScheduler(_model(), max_wait_ms=10, language="en")
+
+    assert scheduler._segments_from_tokens(decoder.tokens(1.0, " cut off"), 10.0, 4.0) == [
+        {"start": 11.0, "end": 14.0, "text": "cut off"}
+    ]
+    assert scheduler._segments_from_tokens(decoder.tokens(" no timestamps"), 0.0, 3.0) == [
+        {"start": 0.0, "end": 3.0, "text": "no timestamps"}
+    ]
+    scheduler.submit(_chunk(), 0.0).result(timeout=10)
+    assert decoder.options[0].language == "en"
+
+
+def test_concurrent_submits_share_batches(monkeypatch, tokenizer):
+    decoder = FakeDecoder(monkeypatch, tokenizer, delay=0.05)
+    scheduler = ASRScheduler(_model(), max_batch_size=4, max_wait_ms=200)
+
+    futures = [scheduler.submit(_chunk(), float(i)) for i in range(9)]
+    for future in futures:
+        future.result(timeout=10)
+
+    assert sum(decoder.batches) == 9
+    assert max(decoder.batches) == 4
+    assert len(decoder.batches) <= 4                    # not one decode per chunk
+    stats = scheduler.stats()
+    assert (stats["segments"], stats["max_batch_size"]) == (9, 4)
+
+
+def test_lone_chunk_waits_at_most_max_wait(monkeypatch, tokenizer):
+    decoder = FakeDecoder(monkeypatch, tokenizer)
+    scheduler = ASRScheduler(_model(), max_batch_size=8, max_wait_ms=50)
+
+    start = time.monotonic()
+    scheduler.submit(_chunk(), 0.0).result(timeout=10)
+    waited = time.monotonic() - start
+
+    assert decoder.batches == [1]
+    assert waited < 0.5
+
+
+def test_decode_error_fails_the_whole_batch(monkeypatch, tokenizer):
+    FakeDecoder(monkeypatch, tokenizer)
+
+    def broken(model, mel_batch, options):
+        raise RuntimeError("CUDA out of memory")
+
+    monkeypatch.setattr(asr_scheduler.whisper, "decode", broken)
+    scheduler = ASRScheduler(_model(), max_wait_ms=10)
+
+    with pytest.raises(RuntimeError, match="out of memory"):
+        scheduler.submit(_chunk(), 0.0).result(timeout=10)
@@ -0,0 +1,46 @@
+import math
+
+import pytest
+
+from app.services.nlp import bias_detection, hf_client, inference_backend
+from app.services.nlp.bias_detection import analyze_bias, get_top_label
+
+
+def test_get_top_label_demultiplexes_batches():
+    emotions = [
+        [{"label": "joy", "score": 0.2}, {"label": "fear", "score": 0.8}],
+        [{"label": "anger", "score": 0.9}, {"label": "joy", "score": 0.1}]
+    ]
+    assert get_top_label(emotions, 2) == [("fear", 0.8), ("anger", 0.9)]
+
+    zero_shot = [
+        {"labels": ["subjective opinion", "neutral factual statement"], "scores": [0.7, 0.3]},
+        {"labels": ["neutral factual statement", "subjective opinion"], "scores": [0.6, 0.4]}
+    ]
+    assert get_top_label(zero_shot, 2) == [("subjective opinion", 0.7), ("neutral factual statement", 0.6)]
+
+    # Single-input batches may come back unwrapped
+    assert get_top_label(zero_shot[0], 1) == [("subjective opinion", 0.7)]
+    assert get_top_label(emotions[0], 1) == [("fear", 0.8)]
+
+    with pytest.raises(ValueError):
+        get_top_label(emotions, 3)
+
+
+def test_analyze_bias_batches_requests(hf_stub, monkeypatch):
+    client = hf_client.HFInferenceClient(base_url=hf_stub.url, token="test")
+    monkeypatch.setattr(inference_backend, "_backend", inference_backend.RemoteBackend(client))
+
+    sentences = [f"the media always lies to people about topic {i}" for i in range(40)]
+    sentences += ["short one", "a harmless sentence about cooking pasta tonight"]
+
+    try:
+        report = analyze_bias(sentences)
+    finally:
+        client.close()
+
+    batches = math.ceil(40 / bias_detection.HF_BATCH_SIZE)
+    models = [model for model, _ in hf_stub.requests]
+    assert models.count(bias_detection.EMOTION_MODEL) == batches
+    assert models.count(bias_detection.BIAS_MODEL) == batches
+    assert 0 <= report["bias_score"] <= 100
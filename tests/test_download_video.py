@@ -0,0 +1,40 @@
+import os
+
+from app.services.input_handler.download_video import download_video
+from app.services.utils.workspace import Workspace
+
+
+def test_combined_file_serves_audio_and_video(http_fixture_server, tmp_path):
+    workspace = Workspace(root=str(tmp_path))
+    url = f"{http_fixture_server}/clip.mp4"
+
+    result = download_video({"url": url}, workspace)
+
+    assert result["audio_path"] == result["video_path"]
+    assert os.path.dirname(result["video_path"]) == workspace.path
+    assert result["bytes_downloaded"] == os.path.getsize(result["video_path"])
+    assert list(result["streams"]) == ["video"]
+
+
+def test_separate_streams_fetch_capped_video_and_audio(http_fixture_server, tmp_path):
+    workspace = Workspace(root=str(tmp_path))
+    url = f"{http_fixture_server}/manifest.mpd"
+
+    result = download_video({"url": url}, workspace)
+
+    assert result["streams"]["video"]["height"] == 360
+    assert result["audio_path"] != result["video_path"]
+    assert result["bytes_downloaded"] == (
+        os.path.getsize(result["video_path"]) + os.path.getsize(result["audio_path"])
+    )
+
+
+def test_frames_only_skips_audio(http_fixture_server, tmp_path):
+    workspace = Workspace(root=str(tmp_path))
+    url = f"{http_fixture_server}/manifest.mpd"
+
+    result = download_video({"url": url}, workspace, need_audio=False)
+
+    assert result["audio_path"] is None
+    assert list(result["streams"]) == ["video"]
+    assert os.listdir(workspace.path) == [os.path.basename(result["video_path"])]
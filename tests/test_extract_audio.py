@@ -0,0 +1,56 @@
+import shutil
+import wave
+
+import numpy as np
+import pytest
+
+from app.services.input_handler.extract_audio import SAMPLE_RATE, stream_audio
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg binary not available")
+
+
+def _tone_wav(path, seconds, rate=44100, frequency=440):
+    t = np.arange(int(seconds * rate)) / rate
+    pcm = (0.5 * np.sin(2 * np.pi * frequency * t) * 32767).astype(np.int16)
+    stereo = np.repeat(pcm[:, None], 2, axis=1)
+
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(stereo.tobytes())
+    return str(path)
+
+
+def test_blocks_are_16k_mono_float32(tmp_path):
+    path = _tone_wav(tmp_path / "tone.wav", seconds=5.5)
+
+    blocks = list(stream_audio(path, block_sec=2.0))
+
+    assert [len(b) for b in blocks[:-1]] == [2 * SAMPLE_RATE] * 2
+    assert abs(sum(len(b) for b in blocks) / SAMPLE_RATE - 5.5) < 0.05
+    assert all(b.dtype == np.float32 for b in blocks)
+
+    audio = np.concatenate(blocks)
+    assert 0.45 < np.abs(audio).max() <= 0.51                    # resampled, not clipped
+    spectrum = np.abs(np.fft.rfft(audio[:SAMPLE_RATE]))
+    assert abs(np.argmax(spectrum) - 440) <= 1                   # 1 s window → 1 Hz bins
+
+
+def test_stopping_early_ends_ffmpeg(tmp_path):
+    path = _tone_wav(tmp_path / "long.wav", seconds=60)
+
+    stream = stream_audio(path, block_sec=1.0)
+    first = next(stream)
+    stream.close()                                               # kills ffmpeg, no error
+
+    assert len(first) == SAMPLE_RATE
+
+
+def test_errors_are_raised(tmp_path, make_clip):
+    with pytest.raises(Exception, match="Audio extraction failed"):
+        list(stream_audio(str(tmp_path / "missing.mp4")))
+
+    silent = make_clip("silent.mp4", "color=c=white:size=64x64:duration=1")
+    with pytest.raises(Exception, match="Audio extraction failed"):
+        list(stream_audio(silent))
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.ocr import frame_extractor
+from app.services.ocr.frame_extractor import stream_frames
+
+
+def _fake_iter_frames(count, produced, closed=None, fail_at=None):
+    def iter_frames(video_path, **kwargs):
+        try:
+            for i in range(count):
+                if i == fail_at:
+                    raise RuntimeError("decode error")
+                produced.append(i)
+                yield float(i), np.full((4, 4, 3), i, dtype=np.uint8)
+        finally:
+            if closed is not None:
+                closed.set()
+    return iter_frames
+
+
+def test_stream_frames_yields_all_frames_in_order(monkeypatch):
+    monkeypatch.setattr(frame_extractor, "iter_frames", _fake_iter_frames(20, []))
+
+    frames = list(stream_frames("video.mp4", queue_size=3))
+
+    assert [ts for ts, _ in frames] == [float(i) for i in range(20)]
+    assert frames[7][1][0, 0, 0] == 7
+
+
+def test_stream_frames_bounds_decoded_frames_in_memory(monkeypatch):
+    produced = []
+    monkeypatch.setattr(frame_extractor, "iter_frames", _fake_iter_frames(50, produced))
+
+    consumed = 0
+    ahead = []
+    for _ in stream_frames("video.mp4", queue_size=4):
+        consumed += 1
+        time.sleep(0.005)                       # slow consumer (OCR)
+        ahead.append(len(produced) - consumed)
+
+    assert consumed == 50
+    assert max(ahead) <= 4 + 1                  # queue + the frame being put
+
+
+def test_stream_frames_stops_producer_when_consumer_bails(monkeypatch):
+    closed = threading.Event()
+    produced = []
+    monkeypatch.setattr(frame_extractor, "iter_frames", _fake_iter_frames(10_000, produced, closed))
+
+    stream = stream_frames("video.mp4", queue_size=2)
+    for i, _ in enumerate(stream):
+        if i == 3:
+            break
+    stream.close()
+
+    assert closed.wait(2)                       # producer's generator was closed
+    assert len(produced) < 10
+
+
+def test_stream_frames_reraises_decoder_errors(monkeypatch):
+    monkeypatch.setattr(frame_extractor, "iter_frames", _fake_iter_frames(10, [], fail_at=5))
+
+    seen = []
+    with pytest.raises(RuntimeError, match="decode error"):
+        for ts, _ in stream_frames("video.mp4"):
+            seen.append(ts)
+
+    assert seen == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_stream_frames_decodes_a_real_clip(make_clip):
+    path = make_clip("clip.mp4", "testsrc2=rate=25:size=640x360:duration=6")
+
+    frames = list(stream_frames(path, frame_rate=1, max_frames=10, resize_width=320, sampler="sequential"))
+
+    assert 4 <= len(frames) <= 6
+    assert all(frame.shape == (180, 320, 3) for _, frame in frames)
+    assert [ts for ts, _ in frames] == sorted(ts for ts, _ in frames)
+
+
+def _studio_frame(caption=None, seed=0):
+    frame = np.full((360, 640, 3), 120, dtype=np.uint8)
+    cv2.circle(frame, (200, 150), 90, (200, 170, 150), -1)     # presenter
+    cv2.rectangle(frame, (400, 60), (600, 280), (60, 90, 140), -1)
+    frame = cv2.GaussianBlur(frame, (31, 31), 0)
+    noise = np.random.default_rng(seed).integers(-2, 3, frame.shape)
+    frame = np.clip(frame.astype(int) + noise, 0, 255).astype(np.uint8)
+    if caption:
+        cv2.rectangle(frame, (0, 300), (640, 360), (30, 30, 30), -1)
+        cv2.putText(frame, caption, (20, 340), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
+    return frame
+
+
+def test_iter_frames_keeps_frames_whose_only_change_is_text(monkeypatch):
+    frames = [
+        _studio_frame(seed=1),
+        _studio_frame(seed=2),                       # same shot, noise only → dropped
+        _studio_frame("Senator resigns", seed=3),
+        _studio_frame("Markets fall 3%", seed=4),    # only the lower-third changed
+        _studio_frame("Markets fall 3%", seed=5),
+    ]
+    monkeypatch.setattr(
+        frame_extractor, "sample_frames",
+        lambda *args: ((float(i), f) for i, f in enumerate(frames))
+    )
+
+    kept = [ts for ts, _ in frame_extractor.iter_frames("video.mp4", max_frames=10)]
+
+    assert kept == [0.0, 2.0, 3.0, 4.0]
@@ -0,0 +1,71 @@
+import numpy as np
+
+from app.services.ocr import frame_sampler
+from app.services.ocr.frame_sampler import change_score, sample_adaptive
+
+FPS = 2.0
+
+
+def _fake_video(monkeypatch, seconds, duration, changes=()):
+    """
+    Static 8x8 video decoded at FPS; the picture switches at each time in `changes`.
+    """
+    def sample_ffmpeg(video_path, interval, resize_width):
+        shade = 0
+        for i in range(int(seconds * FPS)):
+            timestamp = i / FPS
+            if timestamp in changes:
+                shade = (shade + 60) % 240
+            yield timestamp, np.full((8, 8, 3), shade, dtype=np.uint8)
+
+    monkeypatch.setattr(frame_sampler, "sample_ffmpeg", sample_ffmpeg)
+    monkeypatch.setattr(frame_sampler, "video_duration", lambda path: duration)
+
+
+def _sample(max_frames, max_gap=10.0):
+    return [
+        ts for ts, _ in
+        sample_adaptive("video.mp4", 960, max_frames, analysis_fps=FPS, change_threshold=0.005, max_gap=max_gap)
+    ]
+
+
+def test_change_score():
+    black, white = np.zeros((54, 96), np.uint8), np.full((54, 96), 255, np.uint8)
+    half = black.copy()
+    half[:, :48] = 255
+
+    assert change_score(None, black) == 1.0
+    assert change_score(black, black) == 0.0
+    assert change_score(black, half) == 0.5
+    assert change_score(black, white) == 1.0
+
+
+def test_emits_at_changes_and_fills_gaps(monkeypatch):
+    _fake_video(monkeypatch, seconds=60, duration=60, changes=(12.5, 13.0, 40.0))
+
+    samples = _sample(max_frames=30)
+
+    assert samples[0] == 0.0
+    assert 12.5 in samples and 40.0 in samples
+    assert 13.0 not in samples                    # same 2 s bucket as 12.5
+    gaps = np.diff(samples + [60.0])
+    assert gaps.max() <= 10.0 + 2.0               # max_gap plus one bucket
+
+
+def test_budget_spread_over_known_duration(monkeypatch):
+    _fake_video(monkeypatch, seconds=600, duration=600, changes=tuple(float(t) for t in range(1, 600)))
+
+    samples = _sample(max_frames=20)
+
+    assert len(samples) <= 20
+    assert samples[-1] >= 570                     # one sample per 30 s bucket
+
+
+def test_unknown_duration_still_reaches_the_end(monkeypatch):
+    _fake_video(monkeypatch, seconds=3600, duration=0.0)
+
+    samples = _sample(max_frames=60)
+
+    assert len(samples) <= 60                     # iter_frames stops at max_frames
+    assert samples[:30] == [10.0 * i for i in range(30)]   # dense at first
+    assert samples[-1] >= 3000                    # then spaced out to reach the end
@@ -0,0 +1,27 @@
+import random
+
+from app.services.ocr.hash_index import BKTree, hamming
+
+
+def test_find_matches_linear_scan():
+    rng = random.Random(7)
+    values = [rng.getrandbits(64) for _ in range(500)]
+
+    tree = BKTree()
+    for v in values:
+        tree.add(v)
+
+    query = values[42] ^ 0b1011   # 3 bits away from a stored hash
+    expected = sorted((hamming(query, v), v) for v in values if hamming(query, v) <= 4)
+
+    assert sorted(tree.find(query, 4)) == expected
+    assert tree.nearest(query, 4) == (3, values[42])
+
+
+def test_add_if_new_drops_near_duplicates():
+    tree = BKTree()
+
+    assert tree.add_if_new(0, radius=2)
+    assert not tree.add_if_new(0b11, radius=2)
+    assert tree.add_if_new(0b111, radius=2)
+    assert len(tree) == 2
@@ -1,5 +1,5 @@
 # test_hf.py
-from  app.services.nlp.bias_detection import hf_inference
+from app.services.nlp.hf_client import hf_inference
 
 result = hf_inference(
     "facebook/bart-large-mnli",
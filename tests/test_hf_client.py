@@ -0,0 +1,116 @@
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from app.services.nlp.hf_client import CircuitOpenError, HFError, HFInferenceClient, retry_after_seconds
+
+EMOTION = "j-hartmann/emotion-english-distilroberta-base"
+
+
+@pytest.fixture
+def client_for(hf_stub):
+    clients = []
+
+    def make(**kwargs):
+        kwargs.setdefault("backoff_base", 0.01)
+        client = HFInferenceClient(base_url=hf_stub.url, token="test", **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_concurrent_calls_reuse_pooled_connections(hf_stub, client_for):
+    hf_stub.latency = 0.02
+    client = client_for(max_concurrency=4, pool_size=4)
+
+    futures = [client.submit(EMOTION, {"inputs": f"sentence {i}"}) for i in range(40)]
+    wait(futures)
+
+    assert all(f.result()[0][0]["label"] for f in futures)
+    assert len(hf_stub.requests) == 40
+    assert len(hf_stub.connections) <= 4
+
+
+def test_retries_honor_retry_after(hf_stub, client_for):
+    client = client_for(max_retries=2)
+    hf_stub.fail_next(2, status=429, retry_after=0.2)
+
+    start = time.perf_counter()
+    result = client.infer_sync(EMOTION, {"inputs": "hello"})
+
+    assert result[0][0]["label"]
+    assert time.perf_counter() - start >= 0.4
+    assert client.stats()["retries"] == 2
+
+
+def test_circuit_opens_and_recovers(hf_stub, client_for):
+    client = client_for(max_retries=0, breaker_threshold=2, breaker_cooldown=0.2)
+    hf_stub.fail_next(2, status=503)
+
+    for _ in range(2):
+        with pytest.raises(HFError):
+            client.infer_sync(EMOTION, {"inputs": "x"})
+
+    with pytest.raises(CircuitOpenError):
+        client.infer_sync(EMOTION, {"inputs": "x"})
+    assert len(hf_stub.requests) == 2
+
+    time.sleep(0.25)
+    assert client.infer_sync(EMOTION, {"inputs": "x"})
+    assert client.stats()["models"][EMOTION]["circuit"] == "closed"
+
+
+def test_cancelled_trial_reopens_the_circuit(hf_stub, client_for):
+    client = client_for(max_retries=0, breaker_threshold=1, breaker_cooldown=0.2)
+    hf_stub.fail_next(1, status=503)
+    with pytest.raises(HFError):
+        client.infer_sync(EMOTION, {"inputs": "x"})
+
+    time.sleep(0.25)
+    hf_stub.latency = 1.0
+    trial = client.submit(EMOTION, {"inputs": "x"})
+    time.sleep(0.1)
+    trial.cancel()
+    time.sleep(0.05)
+    assert client.stats()["models"][EMOTION]["circuit"] == "open"
+
+    hf_stub.latency = 0
+    time.sleep(0.25)
+    assert client.infer_sync(EMOTION, {"inputs": "x"})
+    assert client.stats()["models"][EMOTION]["circuit"] == "closed"
+
+
+def test_client_errors_are_not_retried(hf_stub, client_for):
+    client = client_for()
+    hf_stub.fail_next(1, status=400)
+
+    with pytest.raises(HFError) as e:
+        client.infer_sync(EMOTION, {"inputs": "x"})
+
+    assert e.value.status == 400
+    assert len(hf_stub.requests) == 1
+
+
+def test_stats_are_read_on_the_client_loop(hf_stub, client_for):
+    hf_stub.latency = 0.01
+    client = client_for()
+
+    futures = [client.submit(EMOTION, {"inputs": f"s{i}"}) for i in range(20)]
+    while not all(f.done() for f in futures):
+        assert client.stats()["requests"] <= 20   # snapshots while calls run
+    wait(futures)
+
+    assert client.stats()["requests"] == 20
+    client.close()
+    assert client.stats()["models"][EMOTION]["circuit"] == "closed"
+
+
+def test_retry_after_formats():
+    assert retry_after_seconds("3") == 3.0
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert retry_after_seconds("soon") is None
+    assert retry_after_seconds(None) is None
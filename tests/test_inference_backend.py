@@ -0,0 +1,133 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.nlp import bias_detection, inference_backend, misinformation_detection
+from app.services.nlp.inference_backend import CachedBackend, MNLI_MODEL, OnnxBackend, OnnxModel, StubBackend
+from app.services.nlp.inference_cache import InferenceCache
+from app.services.utils.sqlite_cache import SqliteCache
+
+MNLI_ID2LABEL = {"0": "contradiction", "1": "neutral", "2": "entailment"}
+
+
+class KeywordTokenizer:
+    """
+    Encodes each (text, pair) as one row; the fake session reads it back.
+    """
+
+    def __call__(self, texts, text_pairs=None, **kwargs):
+        pairs = text_pairs or [""] * len(texts)
+        self.rows = list(zip(texts, pairs))
+        return {"input_ids": np.arange(len(texts))[:, None], "token_type_ids": None}
+
+
+class KeywordNLISession:
+    """
+    Tiny MNLI stand-in: entailment when every hypothesis word occurs in
+    the premise, contradiction when the hypothesis contains "not".
+    """
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids")]
+
+    def run(self, outputs, feed):
+        logits = []
+        for premise, hypothesis in self.tokenizer.rows:
+            words = hypothesis.lower().rstrip(".").split()
+            if "not" in words:
+                logits.append([4.0, 0.0, 0.0])
+            elif all(w in premise.lower() for w in words[3:]):   # after "This example is"
+                logits.append([0.0, 0.0, 4.0])
+            else:
+                logits.append([0.0, 2.0, 0.0])
+        return [np.array(logits)]
+
+
+def _onnx_backend():
+    tokenizer = KeywordTokenizer()
+    model = OnnxModel(KeywordNLISession(tokenizer), tokenizer, MNLI_ID2LABEL)
+    return OnnxBackend(models={MNLI_MODEL: model}, threads=2)
+
+
+def test_onnx_zero_shot_and_entailment():
+    backend = _onnx_backend()
+
+    labels = ["subjective opinion", "neutral factual statement"]
+    results = backend.zero_shot(MNLI_MODEL, ["just my subjective opinion", "a neutral factual statement"], labels).result()
+    assert [label for label, _ in results] == labels
+    assert all(0.5 < score <= 1.0 for _, score in results)
+
+    verdicts = backend.entailment(MNLI_MODEL, [("water is wet", "water is wet"), ("x", "water is not wet")]).result()
+    assert [label for label, _ in verdicts] == ["ENTAILMENT", "CONTRADICTION"]
+
+
+def test_pipeline_functions_use_selected_backend(monkeypatch):
+    monkeypatch.setattr(inference_backend, "_backend", StubBackend())
+
+    label, score = bias_detection.detect_emotion_and_manipulation("people should fear the media")
+    assert (label, score) == ("disgust", pytest.approx(0.2011, abs=1e-4))
+
+    label, score = bias_detection.detect_bias_and_subjectivity("people should fear the media")
+    assert (label, score) == ("right-leaning political opinion", pytest.approx(0.3726, abs=1e-4))
+
+    verdict, score = misinformation_detection.classify_claim("water is wet", "water is wet")
+    assert (verdict, score) == ("misinformation", pytest.approx(0.5191, abs=1e-4))
+
+
+class ScriptedBackend(StubBackend):
+    """
+    Fear + right-leaning for media sentences, a subjective opinion otherwise.
+    """
+
+    def classify(self, model, texts):
+        return self._done([("fear", 0.9) if "fear" in t else ("neutral", 0.6) for t in texts])
+
+    def zero_shot(self, model, texts, candidate_labels):
+        return self._done([
+            ("right-leaning political opinion", 0.8) if "media" in t else ("subjective opinion", 0.8)
+            for t in texts
+        ])
+
+
+def test_analyze_bias_aggregates_backend_labels(monkeypatch):
+    monkeypatch.setattr(inference_backend, "_backend", ScriptedBackend())
+    monkeypatch.setattr(bias_detection, "TRIAGE_ENABLED", False)   # keyword rule: no model file involved
+
+    report = bias_detection.analyze_bias([
+        "people should fear the media today",
+        "the government must never lie to people",
+        "the weather was lovely at the museum"
+    ])
+
+    assert report["emotional_tone"] == "emotional"
+    assert report["manipulative_language"] is True
+    assert report["political_bias"] == "right-leaning political opinion"
+    assert report["opinion_disguised_as_fact"] == ["the government must never lie to people"]
+    assert report["bias_score"] == 30   # emotional 5 + manipulative 10 + political 10 + opinion 5
+    assert report["triage"] == {"sentences": 3, "selected": 2, "over_budget": 0, "model": "keywords"}
+
+
+class CountingBackend(StubBackend):
+
+    def __init__(self):
+        self.batches = []
+
+    def classify(self, model, texts):
+        self.batches.append(list(texts))
+        return super().classify(model, texts)
+
+
+def test_cached_backend_only_sends_misses(tmp_path):
+    inner = CountingBackend()
+    backend = CachedBackend(inner, InferenceCache(SqliteCache(str(tmp_path / "inference.sqlite3"))))
+
+    first = backend.classify("emotion", ["same slogan", "same  slogan", "other"]).result()
+    second = backend.classify("emotion", ["other", "new", "same slogan"]).result()
+
+    assert inner.batches == [["same slogan", "other"], ["new"]]
+    assert first[0] == first[1] == second[2]
+    assert first[2] == second[0]
@@ -0,0 +1,58 @@
+from app.services.nlp.inference_cache import InferenceCache, normalize_text
+from app.services.utils.sqlite_cache import SqliteCache
+
+MODEL = "facebook/bart-large-mnli"
+
+
+def test_key_normalizes_text_and_separates_context():
+    key = InferenceCache.key("remote", MODEL, "zero_shot", "Fake  news again ", ["a", "b"])
+
+    assert normalize_text("Fake  news again ") == "Fake news again"
+    assert InferenceCache.key("remote", MODEL, "zero_shot", "Fake news again", ["a", "b"]) == key
+    assert InferenceCache.key("remote", MODEL, "zero_shot", "Fake news again", ["b", "a"]) != key
+    assert InferenceCache.key("onnx", MODEL, "zero_shot", "Fake news again", ["a", "b"]) != key
+    assert InferenceCache.key("remote", MODEL, "entailment", "claim", "premise one") != \
+        InferenceCache.key("remote", MODEL, "entailment", "claim", "premise two")
+
+
+def test_memory_then_disk_tier(tmp_path):
+    path = str(tmp_path / "inference.sqlite3")
+    cache = InferenceCache(SqliteCache(path), memory_entries=1)
+
+    cache.put(MODEL, "k1", ("fear", 0.9))
+    cache.put(MODEL, "k2", ("joy", 0.8))   # evicts k1 from memory
+    cache.flush()
+
+    assert cache.get(MODEL, "k2") == ("joy", 0.8)
+    assert cache.get(MODEL, "k1") == ("fear", 0.9)
+    assert cache.get(MODEL, "k3") is None
+
+    # A new process sees the shared tier
+    other = InferenceCache(SqliteCache(path))
+    assert other.get(MODEL, "k2") == ("joy", 0.8)
+
+    stats = cache.stats()["models"][MODEL]
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.667
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = InferenceCache(SqliteCache(str(tmp_path / "inference.sqlite3")), ttl=-1)
+
+    cache.put(MODEL, "k", ("anger", 0.7))
+    cache.flush()
+
+    assert cache.get(MODEL, "k") is None
+
+
+def test_close_drains_queued_writes(tmp_path):
+    path = str(tmp_path / "inference.sqlite3")
+    cache = InferenceCache(SqliteCache(path))
+
+    for i in range(200):
+        cache.put(MODEL, f"k{i}", ("joy", 0.5))
+    cache.close()
+
+    assert SqliteCache(path).stats()["entries"] == 200
+    cache.put(MODEL, "late", ("fear", 0.9))   # written inline once closed
+    assert SqliteCache(path).get("late") is not None
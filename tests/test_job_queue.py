@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from app.pipeline import job_queue
+from app.pipeline.job_queue import JobManager, QueueFullError
+
+
+def _fake_pipeline(started, release):
+    async def run_full_pipeline(video_url=None, input_info=None, on_stage=None, workspace=None):
+        started.append(video_url)
+        on_stage("transcript", "running")
+        await release.wait()
+        if video_url == "bad":
+            raise RuntimeError("download failed")
+        on_stage("transcript", "done")
+        return {"url": video_url}
+    return run_full_pipeline
+
+
+async def _wait_for(predicate):
+    for _ in range(200):
+        if predicate():
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("condition not reached")
+
+
+def test_workers_bound_concurrency_and_record_results(monkeypatch):
+    started = []
+
+    async def scenario():
+        release = asyncio.Event()
+        monkeypatch.setattr(job_queue, "run_full_pipeline", _fake_pipeline(started, release))
+
+        manager = JobManager(worker_count=2, max_queue_size=10, result_ttl=60)
+        await manager.start()
+        jobs = [manager.submit(video_url=url) for url in ("a", "bad", "c")]
+
+        await _wait_for(lambda: len(started) == 2)
+        await asyncio.sleep(0.02)
+        assert len(started) == 2                          # third job waits for a worker
+        assert [j["status"] for j in jobs] == ["running", "running", "queued"]
+        assert jobs[0]["stages"]["transcript"] == "running"
+
+        release.set()
+        await _wait_for(lambda: all(j["finished_at"] for j in jobs))
+        await manager.stop()
+        return jobs
+
+    a, bad, c = asyncio.run(scenario())
+
+    assert (a["status"], a["result"], a["stages"]["transcript"]) == ("completed", {"url": "a"}, "done")
+    assert (bad["status"], bad["error"]) == ("failed", "download failed")
+    assert c["status"] == "completed"
+
+
+def test_submit_rejects_when_queue_full(monkeypatch):
+
+    async def scenario():
+        release = asyncio.Event()
+        monkeypatch.setattr(job_queue, "run_full_pipeline", _fake_pipeline([], release))
+
+        manager = JobManager(worker_count=1, max_queue_size=1)
+        with pytest.raises(RuntimeError):
+            manager.submit(video_url="x")                 # not started
+
+        await manager.start()
+        manager.submit(video_url="a")
+        await asyncio.sleep(0.01)                         # worker takes "a", queue empty
+        manager.submit(video_url="b")
+        with pytest.raises(QueueFullError):
+            manager.submit(video_url="c")
+        assert manager.queue_depth() == 1
+
+        release.set()
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_finished_jobs_expire_after_ttl(monkeypatch):
+
+    async def scenario():
+        release = asyncio.Event()
+        release.set()
+        monkeypatch.setattr(job_queue, "run_full_pipeline", _fake_pipeline([], release))
+
+        manager = JobManager(worker_count=1, max_queue_size=5, result_ttl=0)
+        await manager.start()
+        old = manager.submit(video_url="a")
+        await _wait_for(lambda: old["finished_at"])
+        await asyncio.sleep(0.01)
+
+        new = manager.submit(video_url="b")               # submitting purges expired jobs
+        await manager.stop()
+        return manager, old, new
+
+    manager, old, new = asyncio.run(scenario())
+
+    assert manager.get(old["job_id"]) is None
+    assert manager.get(new["job_id"]) is new
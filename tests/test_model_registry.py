@@ -0,0 +1,44 @@
+import threading
+
+import pytest
+
+from app.services.utils.model_registry import ModelRegistry
+
+
+def test_loads_once_on_first_get():
+    calls = []
+    registry = ModelRegistry()
+    registry.register("m", lambda: calls.append(1) or object())
+
+    assert registry.status()["m"]["state"] == "not_loaded"
+
+    threads = [threading.Thread(target=registry.get, args=("m",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert registry.status()["m"]["state"] == "ready"
+    assert registry.ready()
+
+
+def test_warm_up_records_failures():
+    def broken():
+        raise RuntimeError("no weights")
+
+    registry = ModelRegistry()
+    registry.register("ok", object)
+    registry.register("broken", broken)
+    registry.register("lazy", object, warm=False)
+
+    registry.warm_up().join()
+
+    status = registry.status()
+    assert status["ok"]["state"] == "ready"
+    assert status["broken"] == {"state": "failed", "load_seconds": None, "error": "no weights"}
+    assert status["lazy"]["state"] == "lazy"
+    assert not registry.ready()
+
+    with pytest.raises(RuntimeError):
+        registry.get("broken")
@@ -0,0 +1,112 @@
+import cv2
+import numpy as np
+
+from app.services.ocr import ocr_reader
+from app.services.ocr.perceptual_hash import phash
+from app.services.ocr.text_gate import has_text
+from app.services.utils.constants import TEXT_GATE_MIN_DENSITY
+from app.services.utils.sqlite_cache import SqliteCache
+
+
+def _slide(title):
+    frame = np.full((360, 640, 3), 255, dtype=np.uint8)
+    cv2.rectangle(frame, (0, 0), (640, 60), (40, 40, 160), -1)
+    cv2.putText(frame, title, (40, 200), cv2.FONT_HERSHEY_SIMPLEX, 1.4, (0, 0, 0), 3)
+    return frame
+
+
+def test_cache_key_separates_same_layout_different_words():
+    first, second = _slide("Vote YES"), _slide("Vote NO!")
+
+    assert phash(first) == phash(second)   # the 64-bit hash alone collides
+    assert ocr_reader._cache_key(first) != ocr_reader._cache_key(second)
+    assert ocr_reader._cache_key(first) == ocr_reader._cache_key(_slide("Vote YES"))
+
+
+HEADLINES = ["Senator resigns", "Markets fall", "Storm warning", "Vote recount",
+             "Strike ends", "Rates on hold", "Fire spreads", "Talks collapse"]
+BOX = (20, 150, 620, 220)
+
+
+def _fake_ocr(monkeypatch, calls, fail_on=None):
+    """
+    OCR stand-in: a frame's headline is HEADLINES[pixel (0, 0)], found in
+    BOX unless the box was masked out.
+    """
+    def ocr_batch(frames):
+        calls.append(len(frames))
+        if fail_on is not None and any(frame[0, 0, 0] == fail_on for frame in frames):
+            raise RuntimeError("paddle crashed")
+
+        results = []
+        for frame in frames:
+            x1, y1, x2, y2 = BOX
+            found = has_text(frame[y1:y2, x1:x2], TEXT_GATE_MIN_DENSITY)
+            results.append([(BOX, HEADLINES[frame[0, 0, 0] % len(HEADLINES)])] if found else [])
+        return results
+
+    monkeypatch.setattr(ocr_reader, "_ocr_batch", ocr_batch)
+
+
+def _numbered(i, text=True):
+    frame = np.full((360, 640, 3), 255, np.uint8)
+    if text:
+        cv2.putText(frame, HEADLINES[i % len(HEADLINES)], (30, 200), cv2.FONT_HERSHEY_SIMPLEX, 1.4, (0, 0, 0), 3)
+    frame[0, 0] = i
+    return frame
+
+
+def test_frames_without_text_skip_ocr_and_rest_is_batched(monkeypatch):
+    calls, stats = [], {}
+    _fake_ocr(monkeypatch, calls)
+    monkeypatch.setattr(ocr_reader, "get_ocr_cache", lambda: None)
+
+    frames = [(float(i), _numbered(i, text=i % 4 != 0)) for i in range(24)]
+    text = ocr_reader.read_text_from_frames(frames, stats=stats, batch_size=8)
+
+    assert calls == [1, 7, 8, 2]              # lead frame only while no regions are tracked
+    assert text.splitlines() == [HEADLINES[i % 8] for i in range(24) if i % 4]
+    assert (stats["frames"], stats["skipped_no_text"], stats["ocr_frames"]) == (24, 6, 18)
+    assert stats["skip_rate"] == 0.25
+
+
+def test_static_overlay_is_read_once_per_batch(monkeypatch):
+    calls, stats = [], {}
+    _fake_ocr(monkeypatch, calls)
+    monkeypatch.setattr(ocr_reader, "get_ocr_cache", lambda: None)
+
+    frames = [(float(i), _numbered(3)) for i in range(8)]   # same lower-third for 8 frames
+    text = ocr_reader.read_text_from_frames(frames, stats=stats, batch_size=8)
+
+    assert text == "Vote recount"
+    assert calls == [1]
+    assert (stats["ocr_frames"], stats["skipped_static_text"]) == (1, 7)
+
+
+def test_cache_hits_skip_ocr(monkeypatch, tmp_path):
+    calls = []
+    _fake_ocr(monkeypatch, calls)
+    cache = SqliteCache(str(tmp_path / "ocr.sqlite3"), namespace="ocr")
+    monkeypatch.setattr(ocr_reader, "get_ocr_cache", lambda: cache)
+
+    frames = [(float(i), _numbered(i)) for i in range(1, 6)]
+    first = ocr_reader.read_text_from_frames(frames, batch_size=8)
+
+    stats = {}
+    second = ocr_reader.read_text_from_frames(frames, stats=stats, batch_size=8)
+
+    assert first == second == "\n".join(HEADLINES[1:6])
+    assert calls == [1, 4]
+    assert (stats["cache_hits"], stats["cache_misses"]) == (5, 0)
+
+
+def test_failed_batch_is_skipped(monkeypatch):
+    stats = {}
+    _fake_ocr(monkeypatch, [], fail_on=3)
+    monkeypatch.setattr(ocr_reader, "get_ocr_cache", lambda: None)
+
+    frames = [(float(i), _numbered(i)) for i in range(1, 6)]
+    text = ocr_reader.read_text_from_frames(frames, stats=stats, batch_size=4)
+
+    assert text.splitlines() == [HEADLINES[1], HEADLINES[5]]   # batch [2, 3, 4] lost
+    assert (stats["ocr_frames"], stats["ocr_failed"], stats["batches"]) == (2, 3, 2)
@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+
+from app.services.ocr.region_tracker import RegionTracker
+
+TICKER = (0, 300, 640, 360)
+
+
+def _frame(ticker, headline=None):
+    frame = np.full((360, 640, 3), 200, np.uint8)
+    cv2.rectangle(frame, TICKER[:2], TICKER[2:], (40, 40, 40), -1)
+    cv2.putText(frame, ticker, (10, 340), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
+    if headline:
+        cv2.putText(frame, headline, (30, 150), cv2.FONT_HERSHEY_SIMPLEX, 1.4, (0, 0, 0), 3)
+    return frame
+
+
+def test_unchanged_region_is_masked_and_not_emitted_again():
+    tracker = RegionTracker()
+    first = _frame("LIVE: election night")
+
+    assert tracker.mask_unchanged(first)[1] == 0                  # nothing tracked yet
+    assert tracker.update(first, [(TICKER, "LIVE: election night")]) == ["LIVE: election night"]
+
+    masked, unchanged = tracker.mask_unchanged(_frame("LIVE: election night", "Turnout record"))
+    assert unchanged == 1
+    assert len(np.unique(masked[TICKER[1]:, :].reshape(-1, 3), axis=0)) == 1   # ticker painted flat
+    assert masked[100:200].std() > 0                              # headline untouched
+    assert tracker.reused == 1
+
+
+def test_changed_region_is_read_again():
+    tracker = RegionTracker()
+    tracker.update(_frame("LIVE: election night"), [(TICKER, "LIVE: election night")])
+
+    changed = _frame("Polls close at 10pm")
+    assert tracker.mask_unchanged(changed)[1] == 0
+    assert tracker.update(changed, [(TICKER, "Polls close at 10pm")]) == ["Polls close at 10pm"]
+    assert tracker.update(changed, [(TICKER, "Polls close at 10pm")]) == []   # same box, same text
+
+
+def test_regions_dropped_after_max_misses():
+    tracker = RegionTracker(max_misses=2)
+    tracker.update(_frame("LIVE"), [(TICKER, "LIVE")])
+
+    blank = np.full((360, 640, 3), 200, np.uint8)
+    for _ in range(3):
+        tracker.mask_unchanged(blank)
+
+    assert tracker.regions == []
+
+
+def test_region_cap_keeps_most_reused():
+    tracker = RegionTracker(max_regions=2)
+    frame = _frame("LIVE")
+
+    tracker.update(frame, [(TICKER, "LIVE")])
+    tracker.mask_unchanged(frame)                                  # ticker pays off once
+    tracker.update(frame, [((0, 0, 100, 40), "logo"), ((500, 0, 640, 40), "clock")])
+
+    assert len(tracker.regions) == 2
+    assert tracker.regions[0]["text"] == "LIVE"
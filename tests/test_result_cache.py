@@ -0,0 +1,107 @@
+import asyncio
+
+from app.pipeline.result_cache import ResultCache, pipeline_fingerprint, source_key
+from app.services.nlp import bias_detection
+from app.services.utils import constants
+from app.services.utils.sqlite_cache import SqliteCache
+
+
+def test_source_key_canonicalises_inputs():
+    assert source_key("https://youtu.be/abc123?si=xyz") == "youtube:abc123"
+    assert source_key("https://www.youtube.com/watch?v=abc123&t=42") == "youtube:abc123"
+    assert source_key("HTTP://Example.com:80/v/clip.mp4/?utm_source=x&b=2&a=1#t=3") == \
+        "url:http://example.com/v/clip.mp4?a=1&b=2"
+    assert source_key(None, {"content_hash": "ff00"}) == "upload:ff00"
+    assert source_key(None, None) is None
+
+
+def test_concurrent_requests_share_one_run(tmp_path):
+    cache = ResultCache(SqliteCache(str(tmp_path / "results.sqlite3"), max_entries=10))
+    runs = []
+
+    async def compute():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return {"score": 42}
+
+    async def scenario():
+        first = await asyncio.gather(*[
+            cache.get_or_compute("youtube:abc", compute) for _ in range(5)
+        ])
+        again = await cache.get_or_compute("youtube:abc", compute)
+        return first, again
+
+    first, again = asyncio.run(scenario())
+
+    assert len(runs) == 1
+    assert sorted(status for _, status in first) == ["coalesced"] * 4 + ["computed"]
+    assert all(result == {"score": 42} for result, _ in first)
+    assert again == ({"score": 42}, "cache")
+
+
+def test_expired_results_are_recomputed(tmp_path):
+    cache = ResultCache(SqliteCache(str(tmp_path / "results.sqlite3")), ttl=0)
+
+    async def compute():
+        return {"score": 1}
+
+    async def scenario():
+        await cache.get_or_compute("url:x", compute)
+        await asyncio.sleep(0.01)
+        return await cache.get_or_compute("url:x", compute)
+
+    assert asyncio.run(scenario()) == ({"score": 1}, "computed")
+    assert cache.stats()["expired"] == 1
+
+
+def test_fingerprint_ignores_operational_settings(monkeypatch):
+    before = pipeline_fingerprint()
+
+    for name, value in [("HF_TIMEOUT", 1.0), ("JOB_WORKER_COUNT", 64), ("RESULT_CACHE_TTL", 1),
+                        ("EXECUTOR_LIMITS", {"ocr": 9}), ("INFERENCE_THREADS", 99)]:
+        monkeypatch.setattr(constants, name, value)
+    assert pipeline_fingerprint() == before
+
+
+
+def test_threshold_change_changes_fingerprint_and_flags(monkeypatch):
+    before = pipeline_fingerprint()
+    labels = (("fear", 0.7), ("subjective opinion", 0.7))
+    assert not any(bias_detection.sentence_flags(labels).values())
+
+    # constants.py is read by the fingerprint, the module copy by the stage
+    for module in (constants, bias_detection):
+        monkeypatch.setattr(module, "EMOTION_CONFIDENCE_THRESHOLD", 0.6)
+        monkeypatch.setattr(module, "SUBJECTIVITY_THRESHOLD", 0.6)
+
+    assert pipeline_fingerprint() != before
+    assert bias_detection.sentence_flags(labels) == {
+        "manipulative": True, "emotional": False, "political": False, "opinion": True
+    }
+
+
+def test_cancelled_leader_hands_over_to_a_waiter(tmp_path):
+    cache = ResultCache(SqliteCache(str(tmp_path / "results.sqlite3")))
+    runs = []
+
+    async def compute():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return {"score": 7}
+
+    async def scenario():
+        leader = asyncio.create_task(cache.get_or_compute("youtube:abc", compute))
+        while not runs:                                   # leader is computing (past its cache lookup)
+            await asyncio.sleep(0.001)
+        waiters = [asyncio.create_task(cache.get_or_compute("youtube:abc", compute)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+
+        leader.cancel()                                   # first client disconnects
+        return await asyncio.gather(*waiters)
+
+    results = asyncio.run(scenario())
+
+    assert len(runs) == 2                                 # leader's run + one takeover
+    assert sorted(status for _, status in results) == ["coalesced", "coalesced", "computed"]
+    assert all(result == {"score": 7} for result, _ in results)
+    assert cache.stats()["in_flight"] == 0
@@ -0,0 +1,104 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from app.services.utils.sqlite_cache import SqliteCache
+
+
+def test_get_put_and_counters(tmp_path):
+    cache = SqliteCache(str(tmp_path / "cache.sqlite3"), max_entries=10, namespace="ocr")
+
+    assert cache.get("a") is None
+    cache.put("a", [[[0, 0, 10, 10], "BREAKING NEWS"]])
+
+    assert cache.get("a") == [[[0, 0, 10, 10], "BREAKING NEWS"]]
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = SqliteCache(str(tmp_path / "cache.sqlite3"), max_entries=20)
+
+    for i in range(20):
+        cache.put(f"k{i}", i)
+    cache.get("k0")           # k0 becomes most recently used
+    cache.put("k20", 20)      # overflow → oldest entries evicted
+
+    assert cache.get("k0") == 0
+    assert cache.get("k1") is None
+    assert cache.stats()["entries"] <= 20
+
+
+def test_lookups_do_not_write_until_flushed(tmp_path):
+    cache = SqliteCache(str(tmp_path / "cache.sqlite3"), flush_every=5)
+    cache.put("a", 1)
+    conn = cache._conn()
+    written = conn.total_changes
+
+    for _ in range(2):
+        cache.get("a")
+        cache.get("missing")
+    assert conn.total_changes == written   # 4 lookups buffered, nothing written
+
+    cache.get("a")
+    assert conn.total_changes > written    # flushed at the 5th
+
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (3, 2)
+
+
+def test_rows_are_counted_every_few_puts(tmp_path):
+    cache = SqliteCache(str(tmp_path / "cache.sqlite3"), max_entries=1000)
+    counts = []
+    cache._conn().set_trace_callback(lambda sql: counts.append(sql) if "COUNT(*)" in sql else None)
+
+    for i in range(100):
+        cache.put(f"k{i}", i)
+
+    assert len(counts) == 10   # every max_entries // 100 puts
+
+
+def _writer(path, worker):
+    cache = SqliteCache(path, max_entries=1000)
+    for i in range(50):
+        cache.put(f"{worker}-{i}", i)
+        cache.get(f"{worker}-{i}")
+    cache.flush()
+    return worker
+
+
+def test_concurrent_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    SqliteCache(path)
+
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=4, mp_context=spawn) as pool:
+        list(pool.map(_writer, [path] * 4, range(4)))
+
+    stats = SqliteCache(path).stats()
+    assert stats["entries"] == 200
+    assert stats["hits"] == 200
+
+
+_inherited = None, None   # (cache, its connection) set before forking
+
+
+def _fork_writer(worker):
+    cache, parent_conn = _inherited
+    for i in range(50):
+        cache.put(f"{worker}-{i}", i)
+    return cache._conn() is not parent_conn
+
+
+def test_forked_child_reopens_connection(tmp_path):
+    global _inherited
+    cache = SqliteCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("parent", 1)
+    _inherited = cache, cache._conn()
+
+    fork = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=2, mp_context=fork) as pool:
+        reopened = list(pool.map(_fork_writer, range(2)))
+
+    assert reopened == [True, True]
+    assert cache.stats()["entries"] == 101
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+
+from app.pipeline.stage_graph import StageGraph
+
+
+def _sleeper(name, seconds, log):
+    async def stage(results):
+        log.append((name, "start", sorted(results)))
+        await asyncio.sleep(seconds)
+        return name
+    return stage
+
+
+def test_independent_branches_run_in_parallel():
+    log, events = [], []
+    graph = StageGraph(on_stage=lambda name, status: events.append((name, status)))
+
+    graph.add("download", _sleeper("download", 0.01, log))
+    graph.add("transcript", _sleeper("transcript", 0.1, log), deps=["download"])
+    graph.add("ocr", _sleeper("ocr", 0.1, log), deps=["download"])
+    graph.add("merge", lambda r: r["transcript"] + "+" + r["ocr"], deps=["transcript", "ocr"], executor="nlp")
+
+    start = time.perf_counter()
+    results = asyncio.run(graph.run())
+    elapsed = time.perf_counter() - start
+
+    assert results["merge"] == "transcript+ocr"
+    assert elapsed < 0.18                                  # branches overlapped, not 0.2s+
+    assert ("transcript", "start", ["download"]) in log    # deps finished before start
+    assert events.index(("merge", "running")) > events.index(("ocr", "done"))
+    assert events.index(("merge", "running")) > events.index(("transcript", "done"))
+
+
+def test_critical_path_follows_slowest_dependency():
+    graph = StageGraph()
+    graph.add("download", _sleeper("download", 0.01, []))
+    graph.add("transcript", _sleeper("transcript", 0.08, []), deps=["download"])
+    graph.add("ocr", _sleeper("ocr", 0.01, []), deps=["download"])
+    graph.add("merge", _sleeper("merge", 0.01, []), deps=["transcript", "ocr"])
+
+    assert graph.critical_path() == []
+    asyncio.run(graph.run())
+
+    assert graph.critical_path() == ["download", "transcript", "merge"]
+
+    report = graph.report(graph.timings["download"]["start"])
+    assert report["download"]["started_at"] == 0
+    assert report["transcript"]["seconds"] >= 0.07
+
+
+def test_failure_cancels_pending_stages():
+    ran = []
+
+    async def boom(results):
+        raise RuntimeError("ocr crashed")
+
+    async def slow(results):
+        await asyncio.sleep(1)
+        ran.append("slow")
+
+    graph = StageGraph()
+    graph.add("ocr", boom)
+    graph.add("transcript", slow)
+    graph.add("merge", _sleeper("merge", 0, []), deps=["ocr", "transcript"])
+
+    with pytest.raises(RuntimeError, match="ocr crashed"):
+        asyncio.run(graph.run())
+    assert ran == [] and "merge" not in graph.results
+
+
+def test_add_validates_stages():
+    graph = StageGraph()
+
+    with pytest.raises(ValueError, match="unknown stage"):
+        graph.add("merge", _sleeper("merge", 0, []), deps=["ocr"])
+    with pytest.raises(ValueError, match="needs an executor"):
+        graph.add("merge", lambda results: None)
@@ -0,0 +1,31 @@
+import cv2
+import numpy as np
+
+from app.services.ocr.text_gate import edge_density, has_text
+from app.services.utils.constants import TEXT_GATE_MIN_DENSITY
+
+
+def _frame(text=None, size=(720, 1280)):
+    h, w = size
+    frame = np.full((h, w, 3), 90, dtype=np.uint8)
+    cv2.circle(frame, (w // 3, h // 2), h // 4, (160, 140, 120), -1)   # soft-focus background
+    frame = cv2.GaussianBlur(frame, (81, 81), 0)
+    if text:
+        cv2.putText(frame, text, (w // 20, h * 9 // 10), cv2.FONT_HERSHEY_SIMPLEX, w / 1000, (255, 255, 255), 2)
+    return frame
+
+
+def test_blank_and_smooth_frames_have_no_text():
+    assert edge_density(np.zeros((360, 640, 3), np.uint8)) == 0.0
+    assert not has_text(_frame(), TEXT_GATE_MIN_DENSITY)
+
+
+def test_caption_passes_the_gate():
+    assert has_text(_frame("Officials confirm the report"), TEXT_GATE_MIN_DENSITY)
+
+
+def test_density_independent_of_resolution():
+    small = edge_density(_frame("Breaking news", size=(360, 640)))
+    large = edge_density(cv2.resize(_frame("Breaking news", size=(360, 640)), (1920, 1080)))
+
+    assert abs(small - large) < 0.5 * small
@@ -0,0 +1,68 @@
+import random
+
+import numpy as np
+
+from app.services.nlp.triage import TriageModel, select_sentences, threshold_for_recall, train
+
+LOADED = ["corrupt", "traitor", "outrage", "destroy", "rig", "enemy", "disgrace"]
+PLAIN = ["recipe", "weather", "garden", "football", "pasta", "holiday", "museum", "train"]
+
+
+def _corpus(n, seed):
+    rng = random.Random(seed)
+    sentences, labels = [], []
+    for _ in range(n):
+        words = rng.sample(PLAIN, 6)
+        positive = rng.random() < 0.3
+        if positive:
+            words[rng.randrange(6)] = rng.choice(LOADED)
+        sentences.append(" ".join(words))
+        labels.append(int(positive))
+    return sentences, np.array(labels)
+
+
+def test_seed_model_matches_keyword_rule():
+    model = TriageModel.seed()
+    scores = model.scores(["medium expose corrupt agenda", "weather lovely today"])
+
+    assert scores[0] >= model.threshold > scores[1]
+
+
+def test_trained_model_meets_recall_target(tmp_path):
+    sentences, labels = _corpus(600, seed=1)
+    held_sentences, held_labels = _corpus(300, seed=2)
+
+    model = train(sentences, labels, recall_target=0.95, calibration=(held_sentences, held_labels))
+
+    path = str(tmp_path / "models" / "triage.npz")   # save() creates the directory
+    model.save(path)
+    model = TriageModel.load(path)
+
+    selected = model.scores(held_sentences) >= model.threshold
+    recall = (selected & (held_labels == 1)).sum() / held_labels.sum()
+    assert recall >= 0.95
+    assert selected.mean() < 0.5   # most harmless sentences are never sent
+
+
+def test_threshold_for_recall():
+    scores = np.array([0.9, 0.8, 0.7, 0.2, 0.1])
+    labels = np.array([1, 0, 1, 1, 0])
+
+    assert threshold_for_recall(scores, labels, 0.6) == 0.7
+    assert threshold_for_recall(scores, labels, 1.0) == 0.2
+
+
+def test_select_sentences_keeps_order_within_budget():
+    model = TriageModel.seed()
+    sentences = [
+        "lie lie fake media truth propaganda",
+        "weather garden pasta museum holiday train",
+        "fake news spread people online today",
+        "corrupt government agenda expose hate danger",
+        "short fake"
+    ]
+
+    selected, stats = select_sentences(sentences, model, budget=2)
+
+    assert selected == [0, 3]   # highest scoring two, in input order
+    assert stats == {"sentences": 5, "selected": 2, "over_budget": 1, "model": "seed"}
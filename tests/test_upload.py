@@ -0,0 +1,56 @@
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.services.input_handler.detect_input_type import save_upload, UploadRejectedError
+from app.services.utils.workspace import Workspace
+
+
+def test_streams_to_workspace_with_hash(tmp_path, make_clip):
+    with open(make_clip("clip.mp4", "testsrc=size=320x240:duration=2"), "rb") as f:
+        data = f.read()
+    workspace = Workspace(root=str(tmp_path / "jobs"))
+    upload = UploadFile(file=io.BytesIO(data), filename="../../etc/clip.MOV")
+
+    info = asyncio.run(save_upload(upload, workspace))
+
+    assert info["video_path"] == workspace.file("upload.mov")
+    assert info["content_hash"] == hashlib.sha256(data).hexdigest()
+    assert info["size_bytes"] == len(data)
+    with open(info["video_path"], "rb") as f:
+        assert f.read() == data
+
+
+def test_rejects_oversized_upload(tmp_path):
+    workspace = Workspace(root=str(tmp_path))
+    upload = UploadFile(file=io.BytesIO(b"x" * 5000), filename="clip.mp4;rm -rf")
+
+    with pytest.raises(UploadRejectedError):
+        asyncio.run(save_upload(upload, workspace, max_bytes=4096))
+
+    assert os.listdir(workspace.path) == []
+
+
+def test_rejects_upload_over_duration_limit(tmp_path, make_clip):
+    workspace = Workspace(root=str(tmp_path / "jobs"))
+    with open(make_clip("long.mp4", "testsrc=size=320x240:duration=4"), "rb") as f:
+        upload = UploadFile(file=io.BytesIO(f.read()), filename="long.mp4")
+
+    with pytest.raises(UploadRejectedError, match="limit is 2s"):
+        asyncio.run(save_upload(upload, workspace, max_duration=2))
+
+    assert os.listdir(workspace.path) == []
+
+
+def test_rejects_upload_without_readable_duration(tmp_path):
+    workspace = Workspace(root=str(tmp_path))
+    upload = UploadFile(file=io.BytesIO(os.urandom(64 * 1024)), filename="clip.mp4")
+
+    with pytest.raises(UploadRejectedError, match="not a readable video"):
+        asyncio.run(save_upload(upload, workspace))
+
+    assert os.listdir(workspace.path) == []
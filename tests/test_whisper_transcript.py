@@ -0,0 +1,89 @@
+import numpy as np
+
+from app.services.input_handler.extract_audio import SAMPLE_RATE
+from app.services.transcript import whisper_transcript
+from app.services.transcript.whisper_transcript import detect_speech, plan_chunks, transcribe_stream
+
+
+def _audio(seconds, speech=(), hum=()):
+    """
+    Quiet noise with voice-band tones in `speech` and 50 Hz hum in `hum`
+    ([(start, end), ...] in seconds).
+    """
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 0.001, int(seconds * SAMPLE_RATE)).astype(np.float32)
+    t = np.arange(len(audio)) / SAMPLE_RATE
+
+    for s, e in speech:
+        i, j = int(s * SAMPLE_RATE), int(e * SAMPLE_RATE)
+        audio[i:j] += 0.2 * (np.sin(2 * np.pi * 440 * t[i:j]) + np.sin(2 * np.pi * 1200 * t[i:j]))
+    for s, e in hum:
+        i, j = int(s * SAMPLE_RATE), int(e * SAMPLE_RATE)
+        audio[i:j] += 0.3 * np.sin(2 * np.pi * 50 * t[i:j])
+    return audio
+
+
+def _close(regions, expected, tolerance=0.25):
+    return len(regions) == len(expected) and all(
+        abs(s - es) <= tolerance and abs(e - ee) <= tolerance
+        for (s, e), (es, ee) in zip(regions, expected)
+    )
+
+
+def test_detect_speech_finds_voice_and_ignores_hum_and_silence():
+    audio = _audio(20, speech=[(2, 5), (5.3, 7), (12, 15)], hum=[(8, 11)])
+
+    regions = detect_speech(audio)
+
+    assert _close(regions, [(2, 7), (12, 15)])     # 0.3 s gap merged, hum rejected
+
+
+def test_detect_speech_on_silence():
+    assert detect_speech(_audio(5)) == []
+    assert detect_speech(np.zeros(100, dtype=np.float32)) == []
+
+
+def test_plan_chunks_packs_and_splits():
+    assert plan_chunks([(0, 5), (8, 20), (25, 29)], max_chunk_sec=30) == [(0, 29)]
+    assert plan_chunks([(0, 10), (35, 40)], max_chunk_sec=30) == [(0, 10), (35, 40)]
+    assert plan_chunks([(10, 75)], max_chunk_sec=30) == [(10, 40), (40, 70), (70, 75)]
+    assert plan_chunks([]) == []
+
+
+def _inline_whisper(monkeypatch, chunks):
+    def transcribe_chunk(audio_chunk, offset):
+        duration = len(audio_chunk) / SAMPLE_RATE
+        chunks.append((round(offset, 2), round(offset + duration, 2)))
+        return [{"start": round(offset, 2), "end": round(offset + duration, 2), "text": f"chunk at {offset:.0f}"}]
+
+    monkeypatch.setattr(whisper_transcript, "_transcribe_chunk", transcribe_chunk)
+    monkeypatch.setattr(whisper_transcript, "get_asr_scheduler", lambda create=True: None)
+    monkeypatch.setattr(whisper_transcript, "WHISPER_PROCESSES", 1)
+
+
+def _blocks(audio, block_sec):
+    step = int(block_sec * SAMPLE_RATE)
+    return (audio[i:i + step] for i in range(0, len(audio), step))
+
+
+def test_transcribe_stream_carries_speech_across_blocks(monkeypatch):
+    chunks = []
+    _inline_whisper(monkeypatch, chunks)
+
+    audio = _audio(60, speech=[(3, 8), (18, 24), (45, 50)])
+    segments = transcribe_stream(_blocks(audio, 20))      # (18, 24) crosses the 20 s boundary
+
+    assert _close(chunks, [(3, 8), (18, 24), (45, 50)], tolerance=0.3)
+    assert [seg["text"] for seg in segments] == ["chunk at 3", "chunk at 18", "chunk at 45"]
+
+
+def test_transcribe_stream_flushes_long_carried_speech(monkeypatch):
+    chunks = []
+    _inline_whisper(monkeypatch, chunks)
+
+    audio = _audio(80, speech=[(5, 75)])                 # one 70 s utterance
+    transcribe_stream(_blocks(audio, 20))
+
+    assert all(e - s <= 30.0 + 1e-6 for s, e in chunks)
+    assert chunks[0][0] <= 5 and chunks[-1][1] >= 74.5
+    assert all(b[0] == a[1] for a, b in zip(chunks, chunks[1:]))   # contiguous, nothing lost
@@ -0,0 +1,138 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from types import SimpleNamespace
+
+from app.services.transcript.youtube_transcript import (
+    NoCaptionsError,
+    TranscriptProvider,
+    choose_transcript
+)
+from app.services.utils.sqlite_cache import SqliteCache
+
+
+class FakeTrack:
+    def __init__(self, language_code, is_generated=False, is_translatable=False, lines=("hello",)):
+        self.language_code = language_code
+        self.is_generated = is_generated
+        self.is_translatable = is_translatable
+        self.lines = lines
+
+    def fetch(self):
+        return [
+            SimpleNamespace(text=line, start=i * 2.0, duration=1.5)
+            for i, line in enumerate(self.lines)
+        ]
+
+    def translate(self, language_code):
+        return FakeTrack(language_code, self.is_generated, lines=[f"[{language_code}] {l}" for l in self.lines])
+
+
+class FakeClient:
+    """
+    Stands in for YouTubeCaptionsClient; counts list() calls per video.
+    """
+
+    def __init__(self, videos):
+        self.videos = videos
+        self.calls = {}
+
+    def list(self, video_id):
+        self.calls[video_id] = self.calls.get(video_id, 0) + 1
+        tracks = self.videos.get(video_id)
+        if tracks is None:
+            raise NoCaptionsError("Transcripts are disabled for this video")
+        return tracks
+
+
+def test_language_fallback_order():
+    manual_de = FakeTrack("de", is_translatable=True)
+    generated_en = FakeTrack("en", is_generated=True)
+    manual_gb = FakeTrack("en-GB")
+
+    assert choose_transcript([manual_de, generated_en, manual_gb], ["en"])[1] == "manual"
+    assert choose_transcript([manual_de, generated_en], ["en"]) == (generated_en, "generated")
+
+    track, kind = choose_transcript([manual_de], ["en"])
+    assert (track.language_code, kind) == ("en", "translated")
+    assert choose_transcript([FakeTrack("de")], ["en"]) is None
+
+
+def test_fetches_once_and_caches_negative_results(tmp_path):
+    client = FakeClient({"abc": [FakeTrack("en", lines=["first\nline", " ", "second"])]})
+    provider = TranscriptProvider(client, SqliteCache(str(tmp_path / "transcripts.sqlite3")), ["en"])
+
+    expected = {
+        "text": "first line second",
+        "segments": [
+            {"start": 0.0, "end": 1.5, "text": "first line"},
+            {"start": 4.0, "end": 5.5, "text": "second"}
+        ],
+        "language": "en",
+        "kind": "manual"
+    }
+    assert provider.fetch("abc") == expected
+    assert provider.fetch("abc") == expected
+
+    assert provider.fetch("nocaps") is None
+    assert provider.fetch("nocaps") is None
+
+    assert client.calls == {"abc": 1, "nocaps": 1}
+    assert provider.stats()["negative_hits"] == 1
+
+
+def test_negative_results_expire(tmp_path):
+    client = FakeClient({})
+    provider = TranscriptProvider(
+        client, SqliteCache(str(tmp_path / "transcripts.sqlite3")), ["en"], negative_ttl=-1
+    )
+
+    assert provider.fetch("later") is None
+    client.videos["later"] = [FakeTrack("en")]
+    assert provider.fetch("later")["text"] == "hello"
+    assert client.calls["later"] == 2
+
+
+def test_memory_only_provider_fetches_once():
+    client = FakeClient({"abc": [FakeTrack("en")]})
+    provider = TranscriptProvider(client, None, ["en"])
+
+    assert provider.fetch("abc")["text"] == "hello"
+    assert provider.fetch("abc")["text"] == "hello"
+    assert client.calls == {"abc": 1}
+
+
+class SlowClient(FakeClient):
+
+    def __init__(self, videos):
+        super().__init__(videos)
+        self.release = threading.Event()
+
+    def list(self, video_id):
+        self.release.wait(5)
+        return super().list(video_id)
+
+
+def test_concurrent_fetches_are_coalesced():
+    client = SlowClient({"abc": [FakeTrack("en")]})
+    provider = TranscriptProvider(client, None, ["en"])
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(provider.fetch, "abc") for _ in range(4)]
+        while provider.stats()["coalesced"] < 3:
+            time.sleep(0.01)
+        client.release.set()
+        results = [f.result() for f in futures]
+
+    assert all(r["text"] == "hello" for r in results)
+    assert client.calls == {"abc": 1}
+
+
+def test_language_preference_is_part_of_the_key(tmp_path):
+    store = SqliteCache(str(tmp_path / "transcripts.sqlite3"))
+    client = FakeClient({"abc": [FakeTrack("en"), FakeTrack("de", lines=["hallo"])]})
+
+    assert TranscriptProvider(client, store, ["en"]).fetch("abc")["text"] == "hello"
+    assert TranscriptProvider(client, store, ["de"]).fetch("abc")["text"] == "hallo"
+    assert TranscriptProvider(client, store, ["en"]).fetch("abc")["text"] == "hello"
+    assert client.calls == {"abc": 2}